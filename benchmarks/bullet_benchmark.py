@@ -0,0 +1,83 @@
+"""
+Compares the pooled sprite projectiles with the NumPy BulletEngine at bullet-hell projectile counts.
+
+Every frame moves all live projectiles, tests them against a formation-sized target rect and the bunkers the way
+GameSession.__check_collisions does, and draws them. Projectiles overlapping a bunker are killed as hits, and the ones
+that were hit or left the screen are fired again, so the count stays constant. Run it from the repository root:
+
+    python -m benchmarks.bullet_benchmark
+"""
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from engine.render.renderer import Renderer
+from engine.weapon.bullet_engine import BulletEngine
+from engine.weapon.projectile import Projectile
+from engine.weapon.projectile_pool import pooled_projectiles
+
+WIDTH = 1920
+HEIGHT = 1080
+
+
+def fire(group, count, frame):
+    """
+    Fires lasers until the group holds the given number of them.
+    """
+    for index in range(len(group), count):
+        group.spawn_laser(((index * 37 + frame) % WIDTH, HEIGHT - (index * 13) % HEIGHT), HEIGHT, (255, 0, 0),
+                          5 + index % 11)
+
+
+def run(projectiles, renderer, count, frames):
+    """
+    Runs the scenario with the given projectile backend.
+
+    Returns:
+    tuple: The elapsed time per frame of the update, the collision tests and the drawing, in milliseconds.
+    """
+    group = projectiles.create_group(Projectile.PLAYER)
+    bunker_rects = [pygame.Rect(x, 650, 169, 117) for x in range(76, WIDTH, 320)]
+    target_rects = [pygame.Rect(70, 60, 1600, 460)] + bunker_rects
+
+    def hit(rect):
+        return rect.collidelist(bunker_rects) != -1
+
+    timings = [0, 0, 0]
+    for frame in range(frames):
+        fire(group, count, frame)
+        start = time.perf_counter()
+        group.update()
+        timings[0] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        group.collide(target_rects, hit)
+        timings[1] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        renderer.begin_frame()
+        group.render(renderer)
+        timings[2] += time.perf_counter() - start
+    for shot in group.sprites():
+        shot.kill()
+    return tuple(timing / frames * 1000 for timing in timings)
+
+
+def main(frames=120):
+    """
+    Runs all scenarios and prints the time per frame of both backends.
+    """
+    pygame.init()
+    renderer = Renderer(pygame.display.set_mode((WIDTH, HEIGHT)))
+    print(f"{'shots':>6} {'backend':>8} {'update ms':>10} {'collide ms':>11} {'draw ms':>8} {'total ms':>9}")
+    for count in [100, 1000, 10000]:
+        for name, projectiles in [("sprite", pooled_projectiles), ("array", BulletEngine())]:
+            update, collide, draw = run(projectiles, renderer, count, frames)
+            print(f"{count:>6} {name:>8} {update:>10.3f} {collide:>11.3f} {draw:>8.3f} {update + collide + draw:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Compares the linear pygame.sprite.spritecollide scans with the SpatialGrid broadphase used by Level.
+
+Every scenario moves a formation of aliens sideways, re-indexes it and tests a set of projectiles against it,
+the same way GameManager.__check_collisions does every frame. Run it from the repository root:
+
+    python -m benchmarks.collision_benchmark
+"""
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from engine.collision.spatial_grid import SpatialGrid
+
+
+class BoxSprite(pygame.sprite.Sprite):
+    """
+    A sprite with a rect only, standing in for aliens and projectiles.
+    """
+    def __init__(self, x, y, width, height):
+        super().__init__()
+        self.rect = pygame.Rect(x, y, width, height)
+
+
+def create_formation(rows, columns):
+    """
+    Creates a formation laid out like Level.initialize_aliens, with a smaller spacing for large formations.
+
+    Returns:
+    pygame.sprite.Group: The aliens of the formation.
+    """
+    spacing = 100 if columns <= 16 else 70
+    return pygame.sprite.Group(BoxSprite(column * spacing + 70, row * 80 + 60, 64, 64)
+                               for row in range(rows) for column in range(columns))
+
+
+def create_projectiles(count, width, height):
+    """
+    Creates projectiles spread evenly over the screen.
+
+    Returns:
+    list: The projectiles.
+    """
+    return [BoxSprite((index * 97) % width, (index * 61) % height, 4, 20) for index in range(count)]
+
+
+def run_linear(aliens, projectiles, frames):
+    """
+    Moves the formation and tests every projectile against every alien with spritecollide.
+
+    Returns:
+    float: The elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    for frame in range(frames):
+        direction = 2 if (frame // 100) % 2 == 0 else -2
+        for alien in aliens:
+            alien.rect.x += direction
+        for projectile in projectiles:
+            pygame.sprite.spritecollide(projectile, aliens, False)
+    return time.perf_counter() - start
+
+
+def run_grid(aliens, projectiles, frames):
+    """
+    Moves the formation, updates its index incrementally and queries the index for every projectile.
+
+    Returns:
+    float: The elapsed time in seconds.
+    """
+    grid = SpatialGrid()
+    for alien in aliens:
+        grid.insert(alien, alien.rect)
+    start = time.perf_counter()
+    for frame in range(frames):
+        direction = 2 if (frame // 100) % 2 == 0 else -2
+        for alien in aliens:
+            alien.rect.x += direction
+            grid.insert(alien, alien.rect)
+        for projectile in projectiles:
+            grid.colliding(projectile.rect)
+    return time.perf_counter() - start
+
+
+def main(frames=300):
+    """
+    Runs all scenarios and prints the time per frame of both approaches.
+    """
+    pygame.init()
+    scenarios = [(6, 16, 10), (6, 16, 200), (20, 25, 200), (50, 50, 200), (50, 50, 1000)]
+    print(f"{'aliens':>8} {'shots':>6} {'linear ms':>10} {'grid ms':>8} {'speedup':>8}")
+    for rows, columns, shots in scenarios:
+        projectiles = create_projectiles(shots, 1920, 1080)
+        linear = run_linear(create_formation(rows, columns), projectiles, frames) / frames * 1000
+        grid = run_grid(create_formation(rows, columns), projectiles, frames) / frames * 1000
+        print(f"{rows * columns:>8} {shots:>6} {linear:>10.3f} {grid:>8.3f} {linear / grid:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,350 @@
+"""
+Plays fixed, seeded scenarios of the real game headless and reports the frame times of every phase, the memory
+allocated while playing and how both compare to a stored baseline.
+
+Every scenario plays the first level of config.json with some of its fields changed, fed by a policy, for a fixed
+number of frames of one simulation tick each. Frames are drawn on SDL's dummy display, so the draw and display
+phases are measured too, but nothing is shown and no sound is played. A game that ends is restarted with the next
+seed, so every run of a scenario plays the same frames. Every scenario runs twice: once timed by a FrameProfiler,
+then once under tracemalloc, which would distort the times. Run it from the repository root:
+
+    python -m benchmarks.scenario_benchmark --output results.json
+    python -m benchmarks.scenario_benchmark --save-baseline
+
+The results are compared to benchmarks/baseline.json, if present. A phase whose 95th percentile, or a scenario
+whose peak memory, grew by more than its threshold is reported as a regression and fails the run with exit code 1.
+Baselines only compare well on the machine they were recorded on; record a new one with --save-baseline.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from functools import partial
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from engine.hud.hud import Hud
+from engine.profiling.frame_profiler import FrameProfiler
+from engine.render.renderer import Renderer
+from engine.simulation.actions import CANNON, LEFT, RIGHT
+from engine.simulation.policies import IdlePolicy, ScriptedPolicy, SweepPolicy
+from engine.simulation.session import GameSession
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+PHASES = GameSession.PROFILER_PHASES + ("draw", "display")
+
+# Phases faster than this in the baseline are too noisy to compare
+MIN_COMPARED_MS = 0.05
+
+Scenario = namedtuple("Scenario", ["name", "description", "level", "create_policy"])
+Comparison = namedtuple("Comparison", ["scenario", "metric", "baseline", "current", "ratio", "is_regression"])
+
+SCENARIOS = [
+    Scenario("formation_idle", "the full 6x16 formation marching while the player idles",
+             {"alien_rows": 6, "alien_columns": 16, "alien_damage": 0}, IdlePolicy),
+    Scenario("max_formation", "the largest formation fitting the screen, 7x18, while the player idles",
+             {"alien_rows": 7, "alien_columns": 18, "alien_damage": 0}, IdlePolicy),
+    Scenario("cannon_barrage", "the cannon firing into twelve bunkers as soon as it is reloaded",
+             {"obstacle_amount": 12, "alien_damage": 0},
+             partial(ScriptedPolicy, [(45, RIGHT | CANNON), (45, LEFT | CANNON)], True)),
+    Scenario("alien_fire_storm", "an alien shooting every tick at a player sweeping under the bunkers",
+             {"alien_shooting_time": 16, "alien_shooting_policy": "random", "alien_damage": 0}, SweepPolicy),
+    Scenario("explosion_chain", "every weapon and a fast alien fire exploding on aliens, bunkers and the player",
+             {"alien_shooting_time": 50, "obstacle_amount": 10, "alien_damage": 0}, SweepPolicy),
+]
+
+
+class ScenarioRunner:
+    """
+    Plays a scenario frame by frame on a dummy display, the way GameManager plays a game in its window.
+
+    Attributes:
+        __session (GameSession): The session playing the scenario's level.
+        __renderer (Renderer): The renderer drawing on the dummy display.
+        __policy (callable): The policy feeding the actions of every tick.
+        __seed (int): The seed of the next game.
+        __hud (Hud): The HUD of the current game.
+        restarts (int): The number of games restarted because the previous one ended.
+    """
+    def __init__(self, config, scenario, renderer, seed):
+        """
+        Creates the session of a scenario and starts its first game.
+
+        Parameters:
+        config (dict): The game configuration, as found in config.json.
+        scenario (Scenario): The scenario to play.
+        renderer (Renderer): The renderer drawing on the dummy display.
+        seed (int): The seed of the first game; every restarted game uses the next seed.
+        """
+        level = dict(config["levels"][0], **scenario.level)
+        self.__session = GameSession(config["width"], config["height"], [level], renderer,
+                                     config.get("projectile_backend", "sprite"), config.get("tick_rate", 60))
+        self.__renderer = renderer
+        self.__policy = scenario.create_policy()
+        self.__seed = seed
+        self.__hud = None
+        self.restarts = -1
+        self.__start_game()
+
+    @property
+    def session(self):
+        """Get the session playing the scenario."""
+        return self.__session
+
+    def play_frame(self, profiler=None):
+        """
+        Simulates one tick and draws it, lapping the profiler after every phase if one is given.
+
+        Parameters:
+        profiler (FrameProfiler, optional): The profiler timing the frame. Defaults to None.
+        """
+        session = self.__session
+        renderer = self.__renderer
+        if profiler is not None:
+            profiler.begin_frame()
+        renderer.begin_frame()
+        if session.is_game_stopped:
+            self.__start_game()
+        if profiler is not None:
+            profiler.skip()
+        session.tick(self.__policy(session))
+        if profiler is not None:
+            profiler.skip()
+
+        if not session.is_game_stopped:
+            player = session.player
+            self.__hud.update()
+            self.__hud.draw(renderer)
+            renderer.blit(player.image, player.rect)
+            for weapon in player.weapons:
+                weapon.weapon_shots.render(renderer)
+            session.level.draw()
+            session.explosions.draw(renderer)
+        if profiler is not None:
+            profiler.lap("draw")
+        renderer.end_frame()
+        if profiler is not None:
+            profiler.lap("display")
+            profiler.end_frame()
+
+    def __start_game(self):
+        """
+        A helper method starting the next game of the scenario with the next seed.
+        """
+        self.__session.new_game(0, self.__seed)
+        self.__hud = Hud(self.__session.player, self.__session.width, self.__session.height)
+        self.__seed += 1
+        self.restarts += 1
+
+
+def time_scenario(config, scenario, renderer, frames, seed):
+    """
+    Plays a scenario and times every phase of its frames.
+
+    Returns:
+    dict: The percentiles of every phase in milliseconds, the number of restarts and the state hash of the last frame.
+    """
+    runner = ScenarioRunner(config, scenario, renderer, seed)
+    profiler = FrameProfiler(PHASES, frames)
+    runner.session.profiler = profiler
+    gc.collect()
+    for _ in range(frames):
+        runner.play_frame(profiler)
+    phases = {}
+    for phase in profiler.report_phases:
+        stats = profiler.stats(phase)
+        phases[phase] = {"p50": round(stats.p50, 4), "p95": round(stats.p95, 4), "p99": round(stats.p99, 4)}
+    return {"phases": phases, "restarts": runner.restarts, "state_hash": runner.session.state_hash().hex()}
+
+
+def measure_memory(config, scenario, renderer, frames, seed):
+    """
+    Plays a scenario under tracemalloc and measures the memory allocated while playing, after its first game started.
+
+    Returns:
+    dict: The peak of the memory allocated while playing and the memory and blocks still allocated afterwards.
+    """
+    gc.collect()
+    tracemalloc.start()
+    runner = ScenarioRunner(config, scenario, renderer, seed)
+    gc.collect()
+    before = tracemalloc.take_snapshot()
+    start_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    for _ in range(frames):
+        runner.play_frame()
+    peak = tracemalloc.get_traced_memory()[1]
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    differences = after.compare_to(before, "filename")
+    return {"peak_kib": round((peak - start_size) / 1024, 1),
+            "retained_kib": round(sum(difference.size_diff for difference in differences) / 1024, 1),
+            "retained_blocks": sum(difference.count_diff for difference in differences)}
+
+
+def run_benchmark(config, scenarios=SCENARIOS, frames=600, seed=1):
+    """
+    Runs scenarios on a dummy display and collects their results.
+
+    Parameters:
+    config (dict): The game configuration, as found in config.json.
+    scenarios (list of Scenario, optional): The scenarios to run. Defaults to all of them.
+    frames (int, optional): The number of frames every scenario runs for. Defaults to 600, ten seconds of play.
+    seed (int, optional): The seed of the first game of every scenario. Defaults to 1.
+
+    Returns:
+    dict: The results, ready to be written as JSON.
+    """
+    pygame.display.init()
+    pygame.font.init()
+    renderer = Renderer(pygame.display.set_mode((config["width"], config["height"])))
+    results = {"frames": frames, "seed": seed, "python": platform.python_version(), "pygame": pygame.version.ver,
+               "machine": platform.machine(), "scenarios": {}}
+    for scenario in scenarios:
+        result = time_scenario(config, scenario, renderer, frames, seed)
+        result["memory"] = measure_memory(config, scenario, renderer, frames, seed)
+        results["scenarios"][scenario.name] = result
+    return results
+
+
+def compare(results, baseline, time_threshold=0.25, memory_threshold=0.25):
+    """
+    Compares results with a baseline: the 95th percentile of every phase and of the whole frame not faster than
+    MIN_COMPARED_MS in the baseline, and the peak memory of every scenario found in both. The time left to "other"
+    is mostly restarts of games and too noisy to compare.
+
+    Parameters:
+    results (dict): The results of run_benchmark().
+    baseline (dict): The results the baseline was recorded with.
+    time_threshold (float, optional): The relative growth of a time reported as a regression. Defaults to 0.25.
+    memory_threshold (float, optional): The relative growth of the peak memory reported as a regression. Defaults
+    to 0.25.
+
+    Returns:
+    list of Comparison: Every compared metric.
+    """
+    comparisons = []
+    for name, result in results["scenarios"].items():
+        expected = baseline.get("scenarios", {}).get(name)
+        if expected is None:
+            continue
+        metrics = [(f"{phase} p95", stats["p95"], result["phases"][phase]["p95"], time_threshold)
+                   for phase, stats in expected["phases"].items()
+                   if phase in result["phases"] and phase != FrameProfiler.OTHER and stats["p95"] >= MIN_COMPARED_MS]
+        metrics.append(("peak memory", expected["memory"]["peak_kib"], result["memory"]["peak_kib"],
+                        memory_threshold))
+        for metric, expected_value, value, threshold in metrics:
+            ratio = value / expected_value if expected_value else 1.0
+            comparisons.append(Comparison(name, metric, expected_value, value, ratio, ratio > 1 + threshold))
+    return comparisons
+
+
+def format_results(results):
+    """
+    Formats the frame times and the memory of every scenario as a table.
+
+    Returns:
+    str: The formatted table.
+    """
+    lines = [f"{results['frames']} frames per scenario, seed {results['seed']}, times in ms"]
+    header = "".join(f"{phase:>12}" for phase in PHASES + (FrameProfiler.FRAME,))
+    lines.append(f"{'scenario':<18}{'':<4}{header}{'peak KiB':>10}")
+    for name, result in results["scenarios"].items():
+        for percentile in ("p50", "p95", "p99"):
+            times = "".join(f"{result['phases'][phase][percentile]:>12.3f}"
+                            for phase in PHASES + (FrameProfiler.FRAME,))
+            memory = f"{result['memory']['peak_kib']:>10.1f}" if percentile == "p50" else ""
+            lines.append(f"{name if percentile == 'p50' else '':<18}{percentile:<4}{times}{memory}")
+    return "\n".join(lines)
+
+
+def format_comparisons(comparisons, results, baseline):
+    """
+    Formats the regressions found by compare(), and warns about scenarios that no longer play the same game as the
+    baseline.
+
+    Returns:
+    str: The formatted report.
+    """
+    lines = []
+    for name, result in results["scenarios"].items():
+        expected = baseline.get("scenarios", {}).get(name)
+        if expected is not None and expected.get("state_hash") != result["state_hash"]:
+            lines.append(f"warning: {name} played differently than in the baseline, its times may not compare")
+    regressions = [comparison for comparison in comparisons if comparison.is_regression]
+    for comparison in regressions:
+        lines.append(f"REGRESSION {comparison.scenario} {comparison.metric}: {comparison.baseline} -> "
+                     f"{comparison.current} ({comparison.ratio - 1:+.0%})")
+    improvements = sum(1 for comparison in comparisons if comparison.ratio < 1)
+    lines.append(f"{len(comparisons)} metrics compared with the baseline, {len(regressions)} regressions, "
+                 f"{improvements} faster or smaller")
+    return "\n".join(lines)
+
+
+def parse_arguments():
+    """
+    Parses the command line of the benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Space Warriors scenario benchmark")
+    parser.add_argument("--frames", type=int, default=600, help="number of frames every scenario runs for")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the first game of every scenario")
+    parser.add_argument("--scenario", action="append", choices=[scenario.name for scenario in SCENARIOS],
+                        help="scenario to run, all by default; may be given several times")
+    parser.add_argument("--output", help="file the results are written to as JSON")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="results to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative growth of a phase's 95th percentile reported as a regression")
+    parser.add_argument("--memory-threshold", type=float, default=0.25,
+                        help="relative growth of a scenario's peak memory reported as a regression")
+    return parser.parse_args()
+
+
+def main():
+    """
+    Runs the benchmark, prints its results and compares them with the baseline.
+
+    Returns:
+    int: The exit code, 1 if a regression was found.
+    """
+    arguments = parse_arguments()
+    with open("config.json") as file:
+        config = json.load(file)
+    scenarios = [scenario for scenario in SCENARIOS if not arguments.scenario or scenario.name in arguments.scenario]
+    start = time.perf_counter()
+    results = run_benchmark(config, scenarios, arguments.frames, arguments.seed)
+    print(format_results(results))
+    print(f"ran in {time.perf_counter() - start:.1f} s")
+
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent=2)
+    if arguments.save_baseline:
+        with open(arguments.baseline, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"saved the baseline to {arguments.baseline}")
+        return 0
+    if not os.path.exists(arguments.baseline):
+        print(f"no baseline at {arguments.baseline}, record one with --save-baseline")
+        return 0
+    with open(arguments.baseline) as file:
+        baseline = json.load(file)
+    if baseline.get("frames") != results["frames"] or baseline.get("seed") != results["seed"]:
+        print("warning: the baseline was recorded with other frames or another seed")
+    comparisons = compare(results, baseline, arguments.threshold, arguments.memory_threshold)
+    print()
+    print(format_comparisons(comparisons, results, baseline))
+    return 1 if any(comparison.is_regression for comparison in comparisons) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
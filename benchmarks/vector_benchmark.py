@@ -0,0 +1,61 @@
+"""
+Measures the throughput of VectorEnv against the single-game SpaceWarriorsEnv, with random actions on the first
+level of config.json. Run it from the repository root:
+
+    python -m benchmarks.vector_benchmark
+"""
+import json
+import time
+
+import numpy as np
+
+from engine.simulation.actions import LEFT, RIGHT, CANNON, RED_LASER, BLUE_LASER
+from engine.simulation.env import SpaceWarriorsEnv
+from engine.simulation.vector_env import VectorEnv
+
+ACTIONS = LEFT | RIGHT | CANNON | RED_LASER | BLUE_LASER
+
+
+def measure_single(config, steps):
+    """
+    Returns the steps per second of SpaceWarriorsEnv.
+    """
+    env = SpaceWarriorsEnv(config)
+    env.reset()
+    actions = np.random.default_rng(0).integers(0, ACTIONS + 1, steps).tolist()
+    start = time.perf_counter()
+    for action in actions:
+        terminated, truncated = env.step(action)[2:4]
+        if terminated or truncated:
+            env.reset()
+    return steps / (time.perf_counter() - start)
+
+
+def measure_vector(config, count, steps):
+    """
+    Returns the steps per second of VectorEnv with the given number of games, counting one step per game.
+    """
+    env = VectorEnv(config, count, seed=0)
+    env.reset()
+    rng = np.random.default_rng(0)
+    actions = [rng.integers(0, ACTIONS + 1, count) for _ in range(steps)]
+    start = time.perf_counter()
+    for step_actions in actions:
+        env.step(step_actions)
+    return count * steps / (time.perf_counter() - start)
+
+
+def main(steps=300):
+    """
+    Prints the steps per second of the single-game environment and of VectorEnv with growing batches.
+    """
+    with open("config.json") as file:
+        config = json.load(file)
+    print(f"{'env':>12} {'games':>6} {'steps/s':>10}")
+    print(f"{'single':>12} {1:>6} {measure_single(config, steps * 10):>10.0f}")
+    for count in [16, 256, 1024, 4096]:
+        print(f"{'vector':>12} {count:>6} {measure_vector(config, count, steps):>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+import pygame
+
+from engine.assets.texture_atlas import TextureAtlas
+from engine.profiling.tracer import tracer
+
+
+class AssetCache:
+    """
+    A process-wide registry of decoded image surfaces.
+
+    Every image is decoded from disk, scaled and converted only once per key (path, scale, convert mode). All callers
+    asking for the same key receive the same shared surface, so the returned surfaces must be treated as read-only.
+    Images packed in the texture atlas (see engine/assets/atlas_builder.py) are handed out as subsurface views of the
+    atlas image instead of being decoded from their own files. Loads are traced while the tracer is enabled.
+
+    Attributes:
+        __atlas_index_path (str): The path to the texture atlas index, or None to always load the standalone files.
+        __atlas (TextureAtlas): The texture atlas, read on the first cache miss.
+        __is_atlas_checked (bool): Whether the atlas index has already been looked up.
+        __images (dict): Cached surfaces keyed by (path, scale, convert mode).
+        __frames (dict): Cached animation frame tuples keyed by (path prefix, frame count, scale, convert mode).
+        __hits (int): Number of requests served from the cache.
+        __misses (int): Number of requests that had to load an image from disk.
+
+    Methods:
+        load_image(path, scale, convert_mode): Returns the shared surface for the given image.
+        load_frames(path_prefix, frame_count, scale, convert_mode): Returns the shared frames of an animation.
+        evict(path): Removes cached surfaces, either for a single path or all of them (including the atlas).
+        reset_counters(): Resets the hit and miss counters.
+    """
+    CONVERT_ALPHA = "alpha"
+    CONVERT_OPAQUE = "opaque"
+    CONVERT_NONE = None
+
+    def __init__(self, atlas_index_path="resources/atlas.json"):
+        """
+        Initializes an empty asset cache.
+
+        Parameters:
+        atlas_index_path (str, optional): The path to the texture atlas index. Defaults to "resources/atlas.json".
+        Pass None to disable the atlas.
+        """
+        self.__atlas_index_path = atlas_index_path
+        self.__atlas = None
+        self.__is_atlas_checked = False
+        self.__images = {}
+        self.__frames = {}
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def hits(self):
+        """Get the number of requests served from the cache."""
+        return self.__hits
+
+    @property
+    def misses(self):
+        """Get the number of requests that had to load an image from disk."""
+        return self.__misses
+
+    @property
+    def atlas(self):
+        """Get the texture atlas, or None if no atlas is available."""
+        if not self.__is_atlas_checked:
+            self.__is_atlas_checked = True
+            if self.__atlas_index_path is not None:
+                self.__atlas = TextureAtlas.load(self.__atlas_index_path)
+        return self.__atlas
+
+    @property
+    def size(self):
+        """Get the number of cached surfaces."""
+        return len(self.__images)
+
+    def load_image(self, path, scale=None, convert_mode=CONVERT_ALPHA):
+        """
+        Returns the shared surface for the given image, loading it on the first request.
+
+        Parameters:
+        path (str): The path to the image file.
+        scale (tuple, optional): The size to scale the image to. Defaults to None, which keeps the original size.
+        convert_mode (str, optional): "alpha" for convert_alpha(), "opaque" for convert() or None to keep the
+        decoded surface as it is. Defaults to "alpha".
+
+        Returns:
+        pygame.Surface: The shared surface of the image.
+        """
+        if scale is not None:
+            scale = tuple(scale)
+        key = (path, scale, convert_mode)
+        image = self.__images.get(key)
+        if image is not None:
+            self.__hits += 1
+            return image
+
+        self.__misses += 1
+        tracer.begin("load image", "assets", {"path": path})
+        if self.atlas is not None and self.__atlas.contains(path):
+            # The atlas is already converted, so views and scaled copies of it only need converting to opaque
+            image = self.__atlas.get(path)
+            if scale is not None:
+                image = pygame.transform.scale(image, scale)
+            if convert_mode == AssetCache.CONVERT_OPAQUE:
+                image = self.__convert(image, convert_mode)
+        else:
+            image = pygame.image.load(path)
+            if scale is not None:
+                image = pygame.transform.scale(image, scale)
+            image = self.__convert(image, convert_mode)
+        self.__images[key] = image
+        tracer.end("load image", "assets")
+        return image
+
+    def load_frames(self, path_prefix, frame_count, scale=None, convert_mode=CONVERT_ALPHA):
+        """
+        Returns the shared frames of an animation stored as numbered images, e.g. "resources/exp1.png".
+
+        Parameters:
+        path_prefix (str): The path of the images without the frame number and the extension.
+        frame_count (int): The number of frames, numbered from 1.
+        scale (tuple, optional): The size to scale the frames to. Defaults to None.
+        convert_mode (str, optional): The convert mode used for every frame. Defaults to "alpha".
+
+        Returns:
+        tuple: The shared surfaces of the animation frames.
+        """
+        if scale is not None:
+            scale = tuple(scale)
+        key = (path_prefix, frame_count, scale, convert_mode)
+        frames = self.__frames.get(key)
+        if frames is not None:
+            self.__hits += 1
+            return frames
+
+        frames = tuple(self.load_image(f"{path_prefix}{frame_number}.png", scale, convert_mode)
+                       for frame_number in range(1, frame_count + 1))
+        self.__frames[key] = frames
+        return frames
+
+    def evict(self, path=None):
+        """
+        Removes cached surfaces so that they are loaded from disk again on the next request.
+
+        Parameters:
+        path (str, optional): The image path or animation path prefix to evict. Defaults to None, which evicts
+        everything.
+
+        Returns:
+        int: The number of evicted cache entries.
+        """
+        if path is None:
+            evicted = len(self.__images) + len(self.__frames)
+            self.__images.clear()
+            self.__frames.clear()
+            self.__atlas = None
+            self.__is_atlas_checked = False
+            return evicted
+
+        image_keys = [key for key in self.__images if key[0] == path]
+        frame_keys = [key for key in self.__frames if key[0] == path]
+        for key in image_keys:
+            del self.__images[key]
+        for key in frame_keys:
+            del self.__frames[key]
+        return len(image_keys) + len(frame_keys)
+
+    def reset_counters(self):
+        """
+        Resets the hit and miss counters.
+        """
+        self.__hits = 0
+        self.__misses = 0
+
+    @staticmethod
+    def __convert(image, convert_mode):
+        """
+        Converts the image to the pixel format of the display, if a display surface exists.
+
+        Parameters:
+        image (pygame.Surface): The decoded image.
+        convert_mode (str): The convert mode of the image.
+
+        Returns:
+        pygame.Surface: The converted image.
+        """
+        if convert_mode is None or pygame.display.get_surface() is None:
+            return image
+        if convert_mode == AssetCache.CONVERT_ALPHA:
+            return image.convert_alpha()
+        return image.convert()
+
+
+asset_cache = AssetCache()
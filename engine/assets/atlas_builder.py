@@ -0,0 +1,89 @@
+import json
+import os
+import sys
+
+import pygame
+
+from engine.assets.texture_atlas import sprite_key
+
+ATLAS_IMAGE_NAME = "atlas.png"
+ATLAS_INDEX_NAME = "atlas.json"
+
+# Images that have to stay as standalone files
+EXCLUDED_IMAGES = {"icon.png", ATLAS_IMAGE_NAME}
+
+
+def pack_rects(sizes, max_width, padding=1):
+    """
+    Packs rectangles into rows ("shelves") of a fixed width, placing the tallest rectangles first.
+
+    Parameters:
+    sizes (dict): The (width, height) of every rectangle, keyed by name.
+    max_width (int): The width of the atlas.
+    padding (int, optional): The empty space left around every rectangle. Defaults to 1.
+
+    Returns:
+    tuple: The packed rects keyed by name and the (width, height) of the atlas.
+    """
+    rects = {}
+    shelf_x = shelf_y = shelf_height = 0
+    atlas_width = 0
+    for name in sorted(sizes, key=lambda key: (-sizes[key][1], -sizes[key][0], key)):
+        width, height = sizes[name]
+        if shelf_x + width + 2 * padding > max_width and shelf_x > 0:
+            shelf_y += shelf_height + padding
+            shelf_x = shelf_height = 0
+        rects[name] = pygame.Rect(shelf_x + padding, shelf_y + padding, width, height)
+        shelf_x += width + padding
+        shelf_height = max(shelf_height, height)
+        atlas_width = max(atlas_width, shelf_x + padding)
+    return rects, (atlas_width, shelf_y + shelf_height + 2 * padding)
+
+
+def build_atlas(resources_dir="resources", max_width=1024):
+    """
+    Packs every PNG in the resources directory into one atlas image and writes the index of sub-rects next to it.
+    Images with identical pixels are stored once and share their sub-rect.
+
+    Parameters:
+    resources_dir (str, optional): The directory with the images. Defaults to "resources".
+    max_width (int, optional): The maximum width of the atlas. Defaults to 1024.
+
+    Returns:
+    dict: The written atlas index.
+    """
+    images = {}
+    unique_images = {}
+    for file_name in sorted(os.listdir(resources_dir)):
+        if not file_name.endswith(".png") or file_name in EXCLUDED_IMAGES:
+            continue
+        path = sprite_key(os.path.join(resources_dir, file_name))
+        image = pygame.image.load(path)
+        pixels = (image.get_size(), pygame.image.tostring(image, "RGBA"))
+        images[path] = unique_images.setdefault(pixels, path)
+
+    owners = sorted(set(images.values()))
+    surfaces = {path: pygame.image.load(path) for path in owners}
+    packed, size = pack_rects({path: surfaces[path].get_size() for path in owners},
+                              max(max_width, max(surface.get_width() for surface in surfaces.values()) + 2))
+
+    atlas = pygame.Surface(size, pygame.SRCALPHA)
+    atlas.fill((0, 0, 0, 0))
+    for path, rect in packed.items():
+        atlas.blit(surfaces[path], rect)
+    pygame.image.save(atlas, os.path.join(resources_dir, ATLAS_IMAGE_NAME))
+
+    index = {
+        "image": ATLAS_IMAGE_NAME,
+        "size": list(size),
+        "sprites": {path: list(packed[owner]) for path, owner in sorted(images.items())}
+    }
+    with open(os.path.join(resources_dir, ATLAS_INDEX_NAME), "w") as file:
+        json.dump(index, file, indent=2)
+    return index
+
+
+if __name__ == '__main__':
+    directory = sys.argv[1] if len(sys.argv) > 1 else "resources"
+    atlas_index = build_atlas(directory)
+    print(f"Packed {len(atlas_index['sprites'])} images into a {atlas_index['size'][0]}x{atlas_index['size'][1]} atlas")
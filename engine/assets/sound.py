@@ -0,0 +1,215 @@
+import os
+
+import pygame
+
+from engine.profiling.tracer import tracer
+
+
+class NullSound:
+    """
+    A silent stand-in for pygame.mixer.Sound, used when the mixer is not initialized, e.g. in headless simulations.
+
+    Methods:
+        play(loops): Does nothing.
+        stop(): Does nothing.
+        set_volume(volume): Does nothing.
+    """
+    def play(self, loops=0):
+        """
+        Does nothing.
+
+        Parameters:
+        loops (int, optional): Ignored. Defaults to 0.
+        """
+        pass
+
+    def stop(self):
+        """
+        Does nothing.
+        """
+        pass
+
+    def set_volume(self, volume):
+        """
+        Does nothing.
+
+        Parameters:
+        volume (float): Ignored.
+        """
+        pass
+
+
+class TracedSound:
+    """
+    Wraps a sound and records an instant event on the tracer every time it is played.
+
+    Attributes:
+        __sound (pygame.mixer.Sound or NullSound): The wrapped sound.
+        __name (str): The name of the events, the file name of the sound.
+
+    Methods:
+        play(loops): Records the event and plays the sound.
+        stop(): Stops the sound.
+        set_volume(volume): Sets the volume of the sound.
+    """
+    def __init__(self, sound, name):
+        """
+        Wraps a sound.
+
+        Parameters:
+        sound (pygame.mixer.Sound or NullSound): The sound to wrap.
+        name (str): The name of the events.
+        """
+        self.__sound = sound
+        self.__name = name
+
+    def play(self, loops=0):
+        """
+        Records an instant event and plays the sound.
+
+        Parameters:
+        loops (int, optional): The number of times the sound is repeated, -1 forever. Defaults to 0.
+        """
+        tracer.instant(self.__name, "sound")
+        return self.__sound.play(loops)
+
+    def stop(self):
+        """
+        Stops the sound.
+        """
+        self.__sound.stop()
+
+    def set_volume(self, volume):
+        """
+        Sets the volume of the sound.
+
+        Parameters:
+        volume (float): The volume, between 0 and 1.
+        """
+        self.__sound.set_volume(volume)
+
+
+class SoundCache:
+    """
+    A process-wide registry of decoded sounds.
+
+    Every sound file is decoded only once per volume, and all callers asking for it receive the same shared
+    pygame.mixer.Sound. Decoded sounds are large, e.g. the level music takes several megabytes, so levels and players
+    sharing a sound no longer hold a copy each. Because the volume belongs to the Sound object, it is part of the key;
+    the shared sounds must not have their volume changed.
+
+    Attributes:
+        __sounds (dict): Cached sounds keyed by (path, volume).
+        __hits (int): Number of requests served from the cache.
+        __misses (int): Number of requests that had to decode a sound file.
+
+    Methods:
+        load(path, volume): Returns the shared sound for the given file and volume.
+        byte_size(): Returns the memory taken by the decoded samples of all cached sounds.
+        clear(): Removes all cached sounds.
+    """
+    def __init__(self):
+        """
+        Initializes an empty sound cache.
+        """
+        self.__sounds = {}
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def hits(self):
+        """Get the number of requests served from the cache."""
+        return self.__hits
+
+    @property
+    def misses(self):
+        """Get the number of requests that had to decode a sound file."""
+        return self.__misses
+
+    @property
+    def size(self):
+        """Get the number of cached sounds."""
+        return len(self.__sounds)
+
+    def load(self, path, volume=1.0):
+        """
+        Returns the shared sound for the given file and volume, decoding it on the first request. The mixer must be
+        initialized.
+
+        Parameters:
+        path (str): The path to the sound file.
+        volume (float, optional): The volume of the sound, between 0 and 1. Defaults to 1.0.
+
+        Returns:
+        pygame.mixer.Sound: The shared sound.
+        """
+        key = (path, volume)
+        sound = self.__sounds.get(key)
+        if sound is not None:
+            self.__hits += 1
+            return sound
+
+        self.__misses += 1
+        tracer.begin("load sound", "assets", {"path": path})
+        sound = pygame.mixer.Sound(path)
+        sound.set_volume(volume)
+        tracer.end("load sound", "assets")
+        self.__sounds[key] = sound
+        return sound
+
+    def byte_size(self):
+        """
+        Returns the memory taken by the decoded samples of all cached sounds.
+
+        Returns:
+        int: The number of bytes.
+        """
+        return sum(sound_byte_size(sound) for sound in self.__sounds.values())
+
+    def clear(self):
+        """
+        Removes all cached sounds, e.g. before the mixer is closed.
+        """
+        self.__sounds.clear()
+
+
+def sound_byte_size(sound):
+    """
+    Estimates the memory taken by the decoded samples of a sound from its length and the format of the mixer,
+    without copying the samples.
+
+    Parameters:
+    sound (pygame.mixer.Sound): The sound.
+
+    Returns:
+    int: The number of bytes, 0 if the mixer is not initialized.
+    """
+    mixer = pygame.mixer.get_init()
+    if not mixer:
+        return 0
+    frequency, sample_format, channels = mixer
+    return round(sound.get_length() * frequency) * channels * (abs(sample_format) // 8)
+
+
+def load_sound(path, volume=1.0):
+    """
+    Loads a sound with its volume from the sound cache, so every file is decoded only once per volume. A NullSound
+    is returned if the mixer is not initialized, so the game logic can play sounds without checking for audio
+    support. While the tracer is enabled, the sound is wrapped in a TracedSound, so every sound played shows up in
+    the trace; otherwise playing it costs nothing extra.
+
+    Parameters:
+    path (str): The path to the sound file.
+    volume (float, optional): The volume of the sound, between 0 and 1. Defaults to 1.0.
+
+    Returns:
+    pygame.mixer.Sound, NullSound or TracedSound: The sound, shared with every other caller of the same file and
+    volume.
+    """
+    sound = sound_cache.load(path, volume) if pygame.mixer.get_init() else NullSound()
+    if tracer.is_enabled:
+        return TracedSound(sound, os.path.basename(path))
+    return sound
+
+
+sound_cache = SoundCache()
@@ -0,0 +1,119 @@
+from collections import OrderedDict, namedtuple
+
+import pygame
+
+FontSpec = namedtuple("FontSpec", ["name", "size", "is_system_font"])
+"""
+Describes a font: the font name (or file path, or None for the default pygame font), its size and whether it is
+a system font loaded with pygame.font.SysFont.
+"""
+
+# The default pygame font used by the in-game HUD
+HUD_FONT = FontSpec(None, 30, False)
+
+
+class TextCache:
+    """
+    A cache of fonts and rendered text surfaces.
+
+    Fonts are constructed once per font spec. Rendered texts are keyed by (font spec, text, color, antialias) and
+    kept in a bounded LRU cache, so labels that do not change between frames are rasterized only once.
+    The returned surfaces are shared and must be treated as read-only.
+
+    Attributes:
+        __max_entries (int): The maximum number of rendered texts kept in the cache.
+        __fonts (dict): The constructed fonts keyed by font spec.
+        __texts (OrderedDict): The rendered texts in least recently used order.
+        __hits (int): Number of texts served from the cache.
+        __misses (int): Number of texts that had to be rendered.
+
+    Methods:
+        get_font(font_spec): Returns the font for the given font spec.
+        render(font_spec, text, color, antialias): Returns the rendered text surface.
+        clear(): Removes all cached fonts and texts.
+    """
+    def __init__(self, max_entries=256):
+        """
+        Initializes an empty text cache.
+
+        Parameters:
+        max_entries (int, optional): The maximum number of rendered texts kept in the cache. Defaults to 256.
+        """
+        self.__max_entries = max_entries
+        self.__fonts = {}
+        self.__texts = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def hits(self):
+        """Get the number of texts served from the cache."""
+        return self.__hits
+
+    @property
+    def misses(self):
+        """Get the number of texts that had to be rendered."""
+        return self.__misses
+
+    @property
+    def size(self):
+        """Get the number of cached texts."""
+        return len(self.__texts)
+
+    def get_font(self, font_spec):
+        """
+        Returns the font for the given font spec, constructing it on the first request.
+
+        Parameters:
+        font_spec (FontSpec): The spec of the font.
+
+        Returns:
+        pygame.font.Font: The shared font.
+        """
+        font = self.__fonts.get(font_spec)
+        if font is None:
+            if font_spec.is_system_font:
+                font = pygame.font.SysFont(font_spec.name, font_spec.size)
+            else:
+                font = pygame.font.Font(font_spec.name, font_spec.size)
+            self.__fonts[font_spec] = font
+        return font
+
+    def render(self, font_spec, text, color, antialias=True):
+        """
+        Returns the rendered text, rasterizing it only if it is not in the cache.
+
+        Parameters:
+        font_spec (FontSpec): The spec of the font.
+        text (str): The text to render.
+        color (tuple or str): The color of the text.
+        antialias (bool, optional): Whether the text is antialiased. Defaults to True.
+
+        Returns:
+        pygame.Surface: The shared surface of the rendered text.
+        """
+        if isinstance(color, list):
+            color = tuple(color)
+        key = (font_spec, text, color, antialias)
+        surface = self.__texts.get(key)
+        if surface is not None:
+            self.__hits += 1
+            self.__texts.move_to_end(key)
+            return surface
+
+        self.__misses += 1
+        surface = self.get_font(font_spec).render(text, antialias, color)
+        self.__texts[key] = surface
+        if len(self.__texts) > self.__max_entries:
+            self.__texts.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """
+        Removes all cached fonts and texts.
+        """
+        self.__fonts.clear()
+        self.__texts.clear()
+
+
+text_cache = TextCache()
@@ -0,0 +1,110 @@
+import json
+import os
+
+import pygame
+
+
+def sprite_key(path):
+    """
+    Normalizes an image path into the key used by the atlas index, e.g. "resources/alien.png".
+
+    Parameters:
+    path (str): The path of the image.
+
+    Returns:
+    str: The normalized path with forward slashes.
+    """
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+class TextureAtlas:
+    """
+    A single packed image holding many sprites, together with the sub-rects of every sprite inside it.
+
+    The atlas image is decoded once; every sprite handed out is a subsurface view of it, so no pixels are copied.
+
+    Attributes:
+        __index_path (str): The path to the atlas index file.
+        __image_path (str): The path to the packed atlas image.
+        __rects (dict): The sub-rect of every packed sprite, keyed by the sprite's original path.
+        __surface (pygame.Surface): The decoded atlas image, loaded on first use.
+
+    Methods:
+        load(index_path): Reads an atlas index file and returns the atlas, or None if the index does not exist.
+        contains(path): Checks if a sprite is packed in the atlas.
+        get(path): Returns a subsurface view of a packed sprite.
+    """
+    def __init__(self, index_path, image_path, rects):
+        """
+        Initializes the atlas from its parsed index.
+
+        Parameters:
+        index_path (str): The path to the atlas index file.
+        image_path (str): The path to the packed atlas image.
+        rects (dict): The sub-rect of every packed sprite as [x, y, width, height], keyed by the sprite's path.
+        """
+        self.__index_path = index_path
+        self.__image_path = image_path
+        self.__rects = {sprite_key(path): pygame.Rect(rect) for path, rect in rects.items()}
+        self.__surface = None
+
+    @staticmethod
+    def load(index_path):
+        """
+        Reads an atlas index file.
+
+        Parameters:
+        index_path (str): The path to the atlas index file.
+
+        Returns:
+        TextureAtlas: The atlas described by the index, or None if the index file does not exist.
+        """
+        if not os.path.exists(index_path):
+            return None
+        with open(index_path) as file:
+            index = json.load(file)
+        image_path = os.path.join(os.path.dirname(index_path), index["image"])
+        return TextureAtlas(index_path, image_path, index["sprites"])
+
+    @property
+    def image_path(self):
+        """Get the path to the packed atlas image."""
+        return self.__image_path
+
+    @property
+    def sprite_paths(self):
+        """Get the paths of all sprites packed in the atlas."""
+        return list(self.__rects)
+
+    @property
+    def is_loaded(self):
+        """Check if the atlas image has been decoded."""
+        return self.__surface is not None
+
+    def contains(self, path):
+        """
+        Checks if a sprite is packed in the atlas.
+
+        Parameters:
+        path (str): The original path of the sprite.
+
+        Returns:
+        bool: True if the sprite is packed in the atlas, False otherwise.
+        """
+        return sprite_key(path) in self.__rects
+
+    def get(self, path):
+        """
+        Returns a subsurface view of a packed sprite, decoding the atlas image on the first call.
+
+        Parameters:
+        path (str): The original path of the sprite.
+
+        Returns:
+        pygame.Surface: A subsurface sharing its pixels with the atlas image.
+        """
+        if self.__surface is None:
+            self.__surface = pygame.image.load(self.__image_path)
+            if pygame.display.get_surface() is not None:
+                self.__surface = self.__surface.convert_alpha()
+        return self.__surface.subsurface(self.__rects[sprite_key(path)])
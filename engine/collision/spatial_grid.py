@@ -0,0 +1,153 @@
+class SpatialGrid:
+    """
+    A uniform grid broadphase for rect collisions.
+
+    Every object is stored in all grid cells its rect overlaps. Moving an object only touches the grid when the
+    range of cells it overlaps changes, so objects moving by a few pixels per frame are usually not re-bucketed at
+    all. Queries return the objects sharing at least one cell with the queried rect, and colliding() narrows them
+    down with the same overlap rule as pygame.sprite.spritecollide.
+
+    Attributes:
+        __cell_size (int): The width and height of a grid cell in pixels.
+        __cells (dict): The objects stored in every non-empty cell, keyed by (column, row).
+        __object_ranges (dict): The range of cells of every stored object, as (first column, first row, last column,
+        last row).
+
+    Methods:
+        insert(obj, rect): Stores an object, or moves it if it is already stored.
+        remove(obj): Removes an object.
+        query(rect): Returns the objects that may overlap the rect.
+        colliding(rect): Returns the objects whose rect overlaps the rect.
+        clear(): Removes all objects.
+    """
+    def __init__(self, cell_size=128):
+        """
+        Initializes an empty grid.
+
+        Parameters:
+        cell_size (int, optional): The width and height of a grid cell in pixels. Defaults to 128.
+        """
+        self.__cell_size = cell_size
+        self.__cells = {}
+        self.__object_ranges = {}
+
+    def __len__(self):
+        """Get the number of stored objects."""
+        return len(self.__object_ranges)
+
+    def __contains__(self, obj):
+        """Check if an object is stored in the grid."""
+        return obj in self.__object_ranges
+
+    @property
+    def cell_size(self):
+        """Get the width and height of a grid cell in pixels."""
+        return self.__cell_size
+
+    def insert(self, obj, rect):
+        """
+        Stores an object in the cells its rect overlaps. An object that is already stored is moved, and the grid
+        is only touched if the range of cells changed.
+
+        Parameters:
+        obj: The object to store. It has to be hashable.
+        rect (pygame.Rect): The rect of the object.
+        """
+        cell_range = self.__cell_range(rect)
+        previous_range = self.__object_ranges.get(obj)
+        if cell_range == previous_range:
+            return
+        if previous_range is not None:
+            self.__remove_from_cells(obj, previous_range)
+        self.__object_ranges[obj] = cell_range
+        first_column, first_row, last_column, last_row = cell_range
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                cell = self.__cells.get((column, row))
+                if cell is None:
+                    self.__cells[(column, row)] = cell = set()
+                cell.add(obj)
+
+    def remove(self, obj):
+        """
+        Removes an object from the grid. Removing an object that is not stored does nothing.
+
+        Parameters:
+        obj: The object to remove.
+        """
+        previous_range = self.__object_ranges.pop(obj, None)
+        if previous_range is not None:
+            self.__remove_from_cells(obj, previous_range)
+
+    def query(self, rect):
+        """
+        Returns the objects stored in any cell the rect overlaps. They are candidates only; their rects do not have
+        to overlap the queried rect.
+
+        Parameters:
+        rect (pygame.Rect): The rect to query.
+
+        Returns:
+        set: The candidate objects.
+        """
+        first_column, first_row, last_column, last_row = self.__cell_range(rect)
+        if first_column == last_column and first_row == last_row:
+            return set(self.__cells.get((first_column, first_row), ()))
+        candidates = set()
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                cell = self.__cells.get((column, row))
+                if cell:
+                    candidates.update(cell)
+        return candidates
+
+    def colliding(self, rect):
+        """
+        Returns the stored objects whose rect overlaps the rect. The objects must have a rect attribute.
+
+        Parameters:
+        rect (pygame.Rect): The rect to check.
+
+        Returns:
+        list: The objects overlapping the rect.
+        """
+        if rect.width <= 0 or rect.height <= 0:
+            return []
+        return [obj for obj in self.query(rect) if obj.rect.colliderect(rect)]
+
+    def clear(self):
+        """
+        Removes all objects from the grid.
+        """
+        self.__cells.clear()
+        self.__object_ranges.clear()
+
+    def __cell_range(self, rect):
+        """
+        Returns the range of cells overlapped by the rect.
+
+        Parameters:
+        rect (pygame.Rect): The rect to map.
+
+        Returns:
+        tuple: The first column, first row, last column and last row overlapped.
+        """
+        cell_size = self.__cell_size
+        return (rect.left // cell_size, rect.top // cell_size,
+                (rect.right - 1) // cell_size, (rect.bottom - 1) // cell_size)
+
+    def __remove_from_cells(self, obj, cell_range):
+        """
+        Removes an object from every cell of the given range, deleting cells that become empty.
+
+        Parameters:
+        obj: The object to remove.
+        cell_range (tuple): The range of cells holding the object.
+        """
+        first_column, first_row, last_column, last_row = cell_range
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                cell = self.__cells[(column, row)]
+                cell.discard(obj)
+                if not cell:
+                    del self.__cells[(column, row)]
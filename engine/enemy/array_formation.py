@@ -0,0 +1,181 @@
+import numpy as np
+import pygame
+
+from engine.assets.asset_cache import asset_cache
+from engine.enemy.formation import Formation
+
+
+class ArrayFormation(Formation):
+    """
+    A formation storing the aliens as a struct of NumPy arrays instead of sprites.
+
+    The aliens live on the formation's lattice, so the alien at (row, column) always sits at
+    start + (column * x_offset, row * y_offset) + offset. Positions are stored once, in formation coordinates, and
+    the whole formation moves by changing its offset. Hit tests map a rect straight to the range of lattice cells it
+    overlaps. Drawing hands a cached list of (image, rect) pairs to a single blits call; the list is rebuilt only
+    when aliens die and is otherwise shifted in place to wherever the formation is drawn. Apart from those rects no
+    per-alien Python object exists, which keeps large formations (e.g. 50x50) cheap.
+
+    Attributes:
+        __image (pygame.Surface): The image shared by all aliens.
+        __positions (numpy.ndarray): The top-left corner of every alien in formation coordinates, shape (n, 2).
+        __alive (numpy.ndarray): The alive flags of the aliens, shape (rows, columns). Its flat view is indexed
+        like __positions.
+        __blits (list): The cached (image, rect) pairs of the living aliens, or None once aliens died.
+        __blits_position (tuple): The screen offset the cached rects were last drawn at.
+    """
+    def __init__(self, screen_width, speed=2, descent=2, rng=None):
+        """
+        Initializes an empty formation.
+
+        Parameters:
+        screen_width (int): The width of the screen the formation bounces between.
+        speed (int, optional): The horizontal distance the formation moves every update. Defaults to 2.
+        descent (int, optional): The distance the formation moves down on every bounce. Defaults to 2.
+        rng (random.Random, optional): The generator picking the aliens that shoot. Defaults to an unseeded one.
+        """
+        super().__init__(screen_width, speed, descent, rng)
+        self.__image = None
+        self.__positions = np.zeros((0, 2), dtype=np.int32)
+        self.__alive = np.zeros((0, 0), dtype=bool)
+        self.__blits = None
+        self.__blits_position = (0, 0)
+
+    @property
+    def positions(self):
+        """Get the top-left corners of the living aliens in screen coordinates, shape (n, 2)."""
+        return self.__positions[self.__alive.ravel()] + np.asarray(self._offset, dtype=np.int32)
+
+    def draw(self, renderer, alpha=1):
+        """
+        Draws the living aliens with one blits call, rebuilding the cached blit list only if aliens died since the
+        last draw.
+
+        Parameters:
+        renderer (Renderer): The renderer used to draw the aliens.
+        alpha (float, optional): How far the drawing is between the previous update (0) and the last one (1).
+        Defaults to 1.
+        """
+        if not self._alien_count:
+            return
+        x, y = self._interpolation_offset(alpha)
+        position = (self._offset[0] + x, self._offset[1] + y)
+        if self.__blits is None:
+            image = self.__image
+            width, height = self._alien_size
+            positions = self.__positions[self.__alive.ravel()] + np.asarray(position, dtype=np.int32)
+            self.__blits = [(image, pygame.Rect(left, top, width, height)) for left, top in positions.tolist()]
+        elif position != self.__blits_position:
+            x = position[0] - self.__blits_position[0]
+            y = position[1] - self.__blits_position[1]
+            for _, rect in self.__blits:
+                rect.move_ip(x, y)
+        self.__blits_position = position
+        renderer.blits(self.__blits)
+
+    def hit(self, rect):
+        """
+        Kills all aliens overlapped by the rect.
+
+        Parameters:
+        rect (pygame.Rect): The rect hitting the aliens.
+
+        Returns:
+        list: The rects of the killed aliens.
+        """
+        rows, columns = self.__colliding_cells(rect)
+        if not len(rows):
+            return []
+        self.__alive[rows, columns] = False
+        self.__blits = None
+        for row, column in zip(rows.tolist(), columns.tolist()):
+            self._on_alien_killed(row, column)
+        return self.__rects(rows, columns)
+
+    def colliding(self, rect):
+        """
+        Returns the rects of all aliens overlapped by the rect.
+
+        Parameters:
+        rect (pygame.Rect): The rect to check.
+
+        Returns:
+        list: The rects of the aliens overlapping the rect.
+        """
+        return self.__rects(*self.__colliding_cells(rect))
+
+    def living_cells(self):
+        """
+        Returns the grid cells of the living aliens.
+
+        Returns:
+        tuple: The rows and the columns (numpy.ndarray) of the living aliens.
+        """
+        return np.nonzero(self.__alive)
+
+    def _create_aliens(self, rows, columns):
+        """
+        Fills the position and alive arrays for every cell of the formation's grid.
+
+        Parameters:
+        rows (int): The number of rows of aliens.
+        columns (int): The number of columns of aliens.
+        """
+        self.__image = asset_cache.load_image("resources/alien.png")
+        self._alien_size = self.__image.get_size()
+        row_indices, column_indices = np.divmod(np.arange(rows * columns, dtype=np.int32), columns)
+        self.__positions = np.column_stack((column_indices * self._spacing[0] + self._start[0],
+                                            row_indices * self._spacing[1] + self._start[1])).astype(np.int32)
+        self.__alive = np.ones((rows, columns), dtype=bool)
+        self.__blits = None
+
+    def __colliding_cells(self, rect):
+        """
+        Returns the cells of all living aliens overlapped by the rect, using the same overlap rule as
+        pygame.Rect.colliderect.
+
+        Parameters:
+        rect (pygame.Rect): The rect to check.
+
+        Returns:
+        tuple: The rows and columns (numpy.ndarray) of the overlapped aliens.
+        """
+        empty = np.zeros(0, dtype=np.intp)
+        if rect.width <= 0 or rect.height <= 0 or not self._alien_count or not self.bounding_rect.colliderect(rect):
+            return empty, empty
+        left = rect.left - self._offset[0] - self._start[0]
+        top = rect.top - self._offset[1] - self._start[1]
+        right = rect.right - self._offset[0] - self._start[0]
+        bottom = rect.bottom - self._offset[1] - self._start[1]
+        width, height = self._alien_size
+        x_spacing, y_spacing = self._spacing
+
+        # The alien in column c spans [c * x_spacing, c * x_spacing + width) and overlaps the rect if it starts
+        # before the rect's right edge and ends after its left edge
+        first_column = max((left - width) // x_spacing + 1, self._first_column)
+        last_column = min((right - 1) // x_spacing, self._last_column)
+        first_row = max((top - height) // y_spacing + 1, self._first_row)
+        last_row = min((bottom - 1) // y_spacing, self._last_row)
+        if first_column > last_column or first_row > last_row:
+            return empty, empty
+
+        rows, columns = np.nonzero(self.__alive[first_row:last_row + 1, first_column:last_column + 1])
+        return rows + first_row, columns + first_column
+
+    def __rects(self, rows, columns):
+        """
+        Returns the screen rects of the aliens in the given cells.
+
+        Parameters:
+        rows (numpy.ndarray): The rows of the aliens.
+        columns (numpy.ndarray): The columns of the aliens.
+
+        Returns:
+        list: The rects of the aliens.
+        """
+        width, height = self._alien_size
+        x_spacing, y_spacing = self._spacing
+        x_start = self._start[0] + self._offset[0]
+        y_start = self._start[1] + self._offset[1]
+        return [pygame.Rect(column * x_spacing + x_start, row * y_spacing + y_start, width, height)
+                for row, column in zip(rows.tolist(), columns.tolist())]
@@ -0,0 +1,173 @@
+import pygame
+
+obstacle_shape = [
+    '   xxxxxxx   ',
+    '  xxxxxxxxx  ',
+    ' xxxxxxxxxxx ',
+    'xxxxxxxxxxxxx',
+    'xxxxxxxxxxxxx',
+    'xxxxxx xxxxxx',
+    ' xxxxx xxxxx ',
+    ' xxx     xxx ',
+    ' xx       xx '
+]
+
+
+class Bunker(pygame.sprite.Sprite):
+    """
+    A class representing a bunker in the game.
+
+    The bunker is a grid of square blocks. Which blocks are still standing is stored in a compact occupancy grid,
+    and all blocks are drawn on a single cached image. Hit tests map a rect straight to the grid cells it overlaps,
+    and destroyed blocks are cleared from the image in place.
+
+    Attributes:
+    image (pygame.Surface): The cached surface with all standing blocks.
+    rect (pygame.Rect): The rect representing the position of the whole bunker.
+    is_changed (bool): Whether blocks were destroyed since the bunker was last drawn, see Renderer.draw_static().
+    __cells (bytearray): The occupancy grid, 1 for a standing block and 0 for an empty cell, stored row by row.
+    __rows (int): The number of rows of the grid.
+    __columns (int): The number of columns of the grid.
+    __block_size (int): The size of each block in pixels.
+    __block_count (int): The number of standing blocks.
+    """
+
+    def __init__(self, shape, block_size, color, x, y):
+        """
+        Initializes a bunker object.
+
+        Parameters:
+        shape (list of str): The shape of the bunker, where 'x' marks a block.
+        block_size (int): The size of each block in pixels.
+        color (tuple): The color of the blocks in RGB format.
+        x (int): The x-coordinate of the top-left corner of the bunker.
+        y (int): The y-coordinate of the top-left corner of the bunker.
+        """
+        super().__init__()
+        self.__rows = len(shape)
+        self.__columns = max(len(row) for row in shape)
+        self.__block_size = block_size
+        self.__cells = bytearray(self.__rows * self.__columns)
+
+        self.image = pygame.Surface((self.__columns * block_size, self.__rows * block_size), pygame.SRCALPHA)
+        self.rect = self.image.get_rect(topleft=(x, y))
+        self.image.fill((0, 0, 0, 0))
+        for row_index, row in enumerate(shape):
+            for column_index, column in enumerate(row):
+                if column == 'x':
+                    self.__cells[row_index * self.__columns + column_index] = 1
+                    self.image.fill(color, self.__cell_rect(row_index, column_index))
+        self.__block_count = sum(self.__cells)
+        self.is_changed = True
+
+    @property
+    def shape(self):
+        """Get the number of rows and columns of the grid."""
+        return self.__rows, self.__columns
+
+    @property
+    def cells(self):
+        """Get a copy of the occupancy grid, 1 for a standing block and 0 for an empty cell, stored row by row."""
+        return bytes(self.__cells)
+
+    @property
+    def block_size(self):
+        """Get the size of each block in pixels."""
+        return self.__block_size
+
+    @property
+    def block_count(self):
+        """Get the number of standing blocks."""
+        return self.__block_count
+
+    def is_block_standing(self, row, column):
+        """
+        Checks if the block in the given cell is still standing.
+
+        Parameters:
+        row (int): The row of the cell.
+        column (int): The column of the cell.
+
+        Returns:
+        bool: True if the block is standing, False otherwise.
+        """
+        return self.__cells[row * self.__columns + column] == 1
+
+    def collides(self, rect):
+        """
+        Checks if the rect overlaps any standing block.
+
+        Parameters:
+        rect (pygame.Rect): The rect to check.
+
+        Returns:
+        bool: True if the rect overlaps a standing block, False otherwise.
+        """
+        cell_range = self.__cell_range(rect)
+        if cell_range is None:
+            return False
+        first_row, last_row, first_column, last_column = cell_range
+        for row in range(first_row, last_row + 1):
+            offset = row * self.__columns
+            if any(self.__cells[offset + first_column:offset + last_column + 1]):
+                return True
+        return False
+
+    def destroy(self, rect):
+        """
+        Destroys every standing block overlapped by the rect and clears it from the cached image.
+
+        Parameters:
+        rect (pygame.Rect): The rect destroying the blocks.
+
+        Returns:
+        int: The number of destroyed blocks.
+        """
+        cell_range = self.__cell_range(rect)
+        if cell_range is None:
+            return 0
+        first_row, last_row, first_column, last_column = cell_range
+        destroyed = 0
+        for row in range(first_row, last_row + 1):
+            offset = row * self.__columns
+            for column in range(first_column, last_column + 1):
+                if self.__cells[offset + column]:
+                    self.__cells[offset + column] = 0
+                    self.image.fill((0, 0, 0, 0), self.__cell_rect(row, column))
+                    destroyed += 1
+        self.__block_count -= destroyed
+        if destroyed:
+            self.is_changed = True
+        return destroyed
+
+    def __cell_rect(self, row, column):
+        """
+        Returns the rect of a cell relative to the bunker's image.
+
+        Parameters:
+        row (int): The row of the cell.
+        column (int): The column of the cell.
+
+        Returns:
+        pygame.Rect: The rect of the cell.
+        """
+        return pygame.Rect(column * self.__block_size, row * self.__block_size, self.__block_size, self.__block_size)
+
+    def __cell_range(self, rect):
+        """
+        Maps a rect to the range of grid cells it overlaps, using the same overlap rule as pygame.Rect.colliderect.
+
+        Parameters:
+        rect (pygame.Rect): The rect to map.
+
+        Returns:
+        tuple: The first row, last row, first column and last column overlapped, or None if the rect does not
+        overlap the bunker.
+        """
+        if rect.width <= 0 or rect.height <= 0 or not self.rect.colliderect(rect):
+            return None
+        first_column = max((rect.left - self.rect.x) // self.__block_size, 0)
+        last_column = min((rect.right - 1 - self.rect.x) // self.__block_size, self.__columns - 1)
+        first_row = max((rect.top - self.rect.y) // self.__block_size, 0)
+        last_row = min((rect.bottom - 1 - self.rect.y) // self.__block_size, self.__rows - 1)
+        return first_row, last_row, first_column, last_column
@@ -0,0 +1,547 @@
+import pygame
+from abc import abstractmethod, ABC
+from random import Random
+
+from engine.collision.spatial_grid import SpatialGrid
+from engine.enemy.alien import Alien
+
+
+class Formation(ABC):
+    """
+    The Formation class is an abstract base class representing the formation of aliens in a level.
+
+    The aliens are laid out on a grid of rows and columns and move as one body. The formation keeps track of how many
+    aliens are alive in every row and column, so its bounding box is maintained incrementally as aliens die and the
+    edge checks cost O(1).
+
+    It also keeps a bitmask of the living rows of every column and a list of the columns with living aliens, so the
+    front line (the lowest living alien of every column) is known at all times. Picking the alien that shoots never
+    builds a list of the aliens; it follows one of the SHOOTING_POLICIES:
+
+        random      any living alien, all equally likely
+        front_line  the lowest alien of a random column, so lasers never pass through other aliens
+        aimed       the lowest alien of the column closest to the player
+        weighted    the lowest alien of a random column, columns closer to the player being more likely
+
+    Attributes:
+        _screen_width (int): The width of the screen the formation bounces between.
+        _speed (int): The horizontal distance the formation moves every update.
+        _descent (int): The distance the formation moves down on every bounce.
+        _direction (int): The current horizontal movement of the formation.
+        _offset (list): The distance [x, y] the formation moved from its starting position.
+        _previous_offset (tuple): The offset before the last update, used to interpolate drawing between updates.
+        _row_counts (list): The number of living aliens in every row.
+        _column_counts (list): The number of living aliens in every column.
+        _first_row, _last_row, _first_column, _last_column (int): The outermost rows and columns with living aliens.
+        _alien_count (int): The number of living aliens.
+        _alien_size (tuple): The width and height of an alien.
+        _start (tuple): The starting position of the top-left alien.
+        _spacing (tuple): The horizontal and vertical distance between neighbouring aliens.
+        _rng (random.Random): The generator picking the aliens that shoot.
+        _row_masks (list): The living columns of every row as a bitmask, bit c set for a living alien in column c.
+        _column_masks (list): The living rows of every column as a bitmask, bit r set for a living alien in row r.
+        _living_columns (list): The columns with living aliens, in no particular order.
+        _column_slots (list): The index of every column in _living_columns, or -1 if all its aliens are dead.
+
+    Methods:
+        initialize(rows, columns, x_offset, y_offset, x_start, y_start): Creates the aliens of the formation.
+        update(): Moves the formation and bounces it off the screen edges.
+        draw(renderer, alpha): Draws the living aliens between the last two updates. Must be implemented by
+        subclasses.
+        hit(rect): Kills the aliens overlapped by a rect. Must be implemented by subclasses.
+        colliding(rect): Returns the rects of the aliens overlapped by a rect. Must be implemented by subclasses.
+        shooter_cell(policy, target_x): Returns the cell of the alien that shoots next.
+        laser_origin(policy, target_x): Returns the center of the alien that shoots next.
+        living_cells(): Returns the rows and columns of the living aliens. Must be implemented by subclasses.
+    """
+    LASER_COLOR = (55, 128, 255)
+    LASER_SPEED = -10
+    SHOOTING_POLICIES = ("random", "front_line", "aimed", "weighted")
+
+    def __init__(self, screen_width, speed=2, descent=2, rng=None):
+        """
+        Initializes an empty formation.
+
+        Parameters:
+        screen_width (int): The width of the screen the formation bounces between.
+        speed (int, optional): The horizontal distance the formation moves every update. Defaults to 2.
+        descent (int, optional): The distance the formation moves down on every bounce. Defaults to 2.
+        rng (random.Random, optional): The generator picking the aliens that shoot. Defaults to an unseeded one.
+        """
+        self._screen_width = screen_width
+        self._speed = speed
+        self._descent = descent
+        self._direction = speed
+        self._offset = [0, 0]
+        self._previous_offset = (0, 0)
+        self._row_counts = []
+        self._column_counts = []
+        self._first_row = self._last_row = self._first_column = self._last_column = 0
+        self._alien_count = 0
+        self._alien_size = (0, 0)
+        self._start = (0, 0)
+        self._spacing = (0, 0)
+        self._rng = rng if rng is not None else Random()
+        self._row_masks = []
+        self._column_masks = []
+        self._living_columns = []
+        self._column_slots = []
+
+    def __len__(self):
+        """Get the number of living aliens."""
+        return self._alien_count
+
+    @property
+    def direction(self):
+        """Get the current horizontal movement of the formation."""
+        return self._direction
+
+    @property
+    def offset(self):
+        """Get the distance (x, y) the formation moved from its starting position."""
+        return tuple(self._offset)
+
+    @property
+    def speed(self):
+        """Get the horizontal distance the formation moves every update."""
+        return self._speed
+
+    @property
+    def descent(self):
+        """Get the distance the formation moves down on every bounce."""
+        return self._descent
+
+    @property
+    def start(self):
+        """Get the starting position (x, y) of the top-left alien."""
+        return self._start
+
+    @property
+    def spacing(self):
+        """Get the horizontal and vertical distance between neighbouring aliens."""
+        return self._spacing
+
+    @property
+    def alien_size(self):
+        """Get the width and height of an alien."""
+        return self._alien_size
+
+    @property
+    def shape(self):
+        """Get the number of rows and columns of the formation's grid."""
+        return len(self._row_counts), len(self._column_counts)
+
+    @property
+    def bounding_rect(self):
+        """
+        Get the smallest rect containing all living aliens, in screen coordinates, or None if all aliens are dead.
+        """
+        if not self._alien_count:
+            return None
+        left = self._start[0] + self._first_column * self._spacing[0] + self._offset[0]
+        top = self._start[1] + self._first_row * self._spacing[1] + self._offset[1]
+        right = self._start[0] + self._last_column * self._spacing[0] + self._alien_size[0] + self._offset[0]
+        bottom = self._start[1] + self._last_row * self._spacing[1] + self._alien_size[1] + self._offset[1]
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def initialize(self, rows, columns, x_offset=100, y_offset=80, x_start=70, y_start=60):
+        """
+        Creates the aliens of the formation, replacing any previous ones.
+
+        Parameters:
+        rows (int): The number of rows of aliens.
+        columns (int): The number of columns of aliens.
+        x_offset (int, optional): The horizontal offset between each alien in the grid. Default is 100.
+        y_offset (int, optional): The vertical offset between each row of aliens in the grid. Default is 80.
+        x_start (int, optional): The x-coordinate of the first alien in the grid. Default is 70.
+        y_start (int, optional): The y-coordinate of the first row of aliens in the grid. Default is 60.
+        """
+        self._direction = self._speed
+        self._offset = [0, 0]
+        self._previous_offset = (0, 0)
+        self._row_counts = [columns] * rows
+        self._column_counts = [rows] * columns
+        self._first_row, self._last_row = 0, rows - 1
+        self._first_column, self._last_column = 0, columns - 1
+        self._alien_count = rows * columns
+        self._start = (x_start, y_start)
+        self._spacing = (x_offset, y_offset)
+        self._row_masks = [(1 << columns) - 1] * rows
+        self._column_masks = [(1 << rows) - 1] * columns
+        self._living_columns = list(range(columns))
+        self._column_slots = list(range(columns))
+        self._create_aliens(rows, columns)
+
+    def update(self):
+        """
+        Moves the formation horizontally. When the formation touches a screen edge, it turns around and moves down
+        once.
+        """
+        self._previous_offset = tuple(self._offset)
+        if not self._alien_count:
+            return
+        self._move(self._direction, 0)
+
+        bounding_rect = self.bounding_rect
+        if bounding_rect.right >= self._screen_width:
+            self._direction = -self._speed
+            self._move(0, self._descent)
+        elif bounding_rect.left <= 0:
+            self._direction = self._speed
+            self._move(0, self._descent)
+
+    @abstractmethod
+    def draw(self, renderer, alpha=1):
+        """
+        Draws the living aliens. To be implemented by a subclass.
+
+        Parameters:
+        renderer (Renderer): The renderer used to draw the aliens.
+        alpha (float, optional): How far the drawing is between the previous update (0) and the last one (1).
+        Defaults to 1.
+        """
+        pass
+
+    @abstractmethod
+    def hit(self, rect):
+        """
+        Kills all aliens overlapped by the rect. To be implemented by a subclass.
+
+        Parameters:
+        rect (pygame.Rect): The rect hitting the aliens.
+
+        Returns:
+        list: The rects of the killed aliens.
+        """
+        pass
+
+    @abstractmethod
+    def colliding(self, rect):
+        """
+        Returns the rects of all aliens overlapped by the rect. To be implemented by a subclass.
+
+        Parameters:
+        rect (pygame.Rect): The rect to check.
+
+        Returns:
+        list: The rects of the aliens overlapping the rect.
+        """
+        pass
+
+    def shooter_cell(self, policy="random", target_x=None):
+        """
+        Picks the living alien that shoots next. All policies but "random" cost O(1) while the front line has no
+        gaps; "aimed" and "weighted" walk outwards from their column to the nearest living one.
+
+        Parameters:
+        policy (str, optional): One of SHOOTING_POLICIES. Defaults to "random".
+        target_x (int, optional): The x-coordinate aimed at by "aimed" and "weighted", usually the player's center.
+        Defaults to the center of the screen.
+
+        Returns:
+        tuple: The (row, column) of the alien, or None if all aliens are dead.
+        """
+        if not self._alien_count:
+            return None
+        if policy == "random":
+            return self.__random_cell()
+        if policy == "front_line":
+            column = self._living_columns[self._rng.randrange(len(self._living_columns))]
+        elif policy == "aimed":
+            column = self.__nearest_living_column(self.__column_at(target_x))
+        elif policy == "weighted":
+            aimed_column = self.__column_at(target_x)
+            column = round(self._rng.triangular(self._first_column - 0.5, self._last_column + 0.5, aimed_column))
+            column = self.__nearest_living_column(min(max(column, self._first_column), self._last_column))
+        else:
+            raise ValueError(f"Unknown shooting policy: {policy}")
+        return self._column_masks[column].bit_length() - 1, column
+
+    def laser_origin(self, policy="random", target_x=None):
+        """
+        Picks the living alien that shoots next, see shooter_cell().
+
+        Parameters:
+        policy (str, optional): One of SHOOTING_POLICIES. Defaults to "random".
+        target_x (int, optional): The x-coordinate aimed at by "aimed" and "weighted". Defaults to the center of the
+        screen.
+
+        Returns:
+        tuple: The center of the alien in screen coordinates, or None if all aliens are dead.
+        """
+        cell = self.shooter_cell(policy, target_x)
+        if cell is None:
+            return None
+        row, column = cell
+        return (self._start[0] + column * self._spacing[0] + self._alien_size[0] // 2 + self._offset[0],
+                self._start[1] + row * self._spacing[1] + self._alien_size[1] // 2 + self._offset[1])
+
+    @abstractmethod
+    def living_cells(self):
+        """
+        Returns the grid cells of the living aliens. To be implemented by a subclass.
+
+        Returns:
+        tuple: The rows and the columns of the living aliens, as two sequences of the same length.
+        """
+        pass
+
+    @abstractmethod
+    def _create_aliens(self, rows, columns):
+        """
+        Creates the aliens laid out on the formation's grid. To be implemented by a subclass.
+
+        Parameters:
+        rows (int): The number of rows of aliens.
+        columns (int): The number of columns of aliens.
+        """
+        pass
+
+    def _interpolation_offset(self, alpha):
+        """
+        Returns how far the aliens have to be drawn from their current position to appear between the last two
+        updates.
+
+        Parameters:
+        alpha (float): How far the drawing is between the previous update (0) and the last one (1).
+
+        Returns:
+        tuple: The (x, y) distance from the current position.
+        """
+        return (round((self._previous_offset[0] - self._offset[0]) * (1 - alpha)),
+                round((self._previous_offset[1] - self._offset[1]) * (1 - alpha)))
+
+    def _move(self, x, y):
+        """
+        Moves the whole formation. Subclasses moving their aliens explicitly extend this method.
+
+        Parameters:
+        x (int): The horizontal distance to move by.
+        y (int): The vertical distance to move by.
+        """
+        self._offset[0] += x
+        self._offset[1] += y
+
+    def _on_alien_killed(self, row, column):
+        """
+        Updates the row and column counts after an alien died, shrinking the bounding box if the alien was the last
+        one in an outer row or column.
+
+        Parameters:
+        row (int): The row of the killed alien.
+        column (int): The column of the killed alien.
+        """
+        self._alien_count -= 1
+        self._row_counts[row] -= 1
+        self._column_counts[column] -= 1
+        self._row_masks[row] &= ~(1 << column)
+        self._column_masks[column] &= ~(1 << row)
+        if not self._column_masks[column]:
+            # Swap the column with the last living one and drop it
+            slot = self._column_slots[column]
+            last_column = self._living_columns.pop()
+            if last_column != column:
+                self._living_columns[slot] = last_column
+                self._column_slots[last_column] = slot
+            self._column_slots[column] = -1
+        if not self._alien_count:
+            return
+        while not self._row_counts[self._first_row]:
+            self._first_row += 1
+        while not self._row_counts[self._last_row]:
+            self._last_row -= 1
+        while not self._column_counts[self._first_column]:
+            self._first_column += 1
+        while not self._column_counts[self._last_column]:
+            self._last_column -= 1
+
+    def __random_cell(self):
+        """
+        Picks any living alien, all equally likely. The aliens are counted in row-major order, the order in which they
+        were created, by skipping whole rows with the row counts and then the living columns of one row.
+
+        Returns:
+        tuple: The (row, column) of the alien.
+        """
+        index = self._rng.randrange(self._alien_count)
+        row = self._first_row
+        while index >= self._row_counts[row]:
+            index -= self._row_counts[row]
+            row += 1
+        mask = self._row_masks[row]
+        for _ in range(index):
+            mask &= mask - 1
+        return row, (mask & -mask).bit_length() - 1
+
+    def __column_at(self, x):
+        """
+        Returns the column of the formation whose aliens are centered closest to an x-coordinate, limited to the
+        outermost columns with living aliens.
+
+        Parameters:
+        x (int): The x-coordinate in screen coordinates, or None for the center of the screen.
+
+        Returns:
+        int: The column.
+        """
+        if x is None:
+            x = self._screen_width / 2
+        column = round((x - self._start[0] - self._offset[0] - self._alien_size[0] / 2) / self._spacing[0])
+        return min(max(column, self._first_column), self._last_column)
+
+    def __nearest_living_column(self, column):
+        """
+        Returns the column with living aliens closest to a column, preferring the left one on a tie.
+
+        Parameters:
+        column (int): A column between the outermost columns with living aliens.
+
+        Returns:
+        int: The closest column with living aliens.
+        """
+        masks = self._column_masks
+        distance = 0
+        while True:
+            if column - distance >= self._first_column and masks[column - distance]:
+                return column - distance
+            if column + distance <= self._last_column and masks[column + distance]:
+                return column + distance
+            distance += 1
+
+
+class SpriteFormation(Formation):
+    """
+    A formation storing every alien as an Alien sprite.
+
+    The spatial index of the aliens is kept in formation coordinates (relative to the formation's starting position),
+    so moving the formation never re-buckets the index.
+
+    Attributes:
+        __aliens (pygame.sprite.Group): The living aliens.
+        __cells (dict): The (row, column) of every living alien.
+        __index (SpatialGrid): The spatial index of the aliens in formation coordinates.
+    """
+    def __init__(self, screen_width, speed=2, descent=2, rng=None):
+        """
+        Initializes an empty formation.
+
+        Parameters:
+        screen_width (int): The width of the screen the formation bounces between.
+        speed (int, optional): The horizontal distance the formation moves every update. Defaults to 2.
+        descent (int, optional): The distance the formation moves down on every bounce. Defaults to 2.
+        rng (random.Random, optional): The generator picking the aliens that shoot. Defaults to an unseeded one.
+        """
+        super().__init__(screen_width, speed, descent, rng)
+        self.__aliens = pygame.sprite.Group()
+        self.__cells = {}
+        self.__index = SpatialGrid()
+
+    @property
+    def aliens(self):
+        """Get the group of living aliens."""
+        return self.__aliens
+
+    def draw(self, renderer, alpha=1):
+        """
+        Draws the living aliens.
+
+        Parameters:
+        renderer (Renderer): The renderer used to draw the aliens.
+        alpha (float, optional): How far the drawing is between the previous update (0) and the last one (1).
+        Defaults to 1.
+        """
+        x, y = self._interpolation_offset(alpha)
+        if not x and not y:
+            renderer.draw_group(self.__aliens)
+        else:
+            renderer.blits([(alien.image, alien.rect.move(x, y)) for alien in self.__aliens])
+
+    def hit(self, rect):
+        """
+        Kills all aliens overlapped by the rect.
+
+        Parameters:
+        rect (pygame.Rect): The rect hitting the aliens.
+
+        Returns:
+        list: The rects of the killed aliens.
+        """
+        aliens = self.__colliding_aliens(rect)
+        for alien in aliens:
+            alien.kill()
+            self.__index.remove(alien)
+            self._on_alien_killed(*self.__cells.pop(alien))
+        return [alien.rect for alien in aliens]
+
+    def colliding(self, rect):
+        """
+        Returns the rects of all aliens overlapped by the rect.
+
+        Parameters:
+        rect (pygame.Rect): The rect to check.
+
+        Returns:
+        list: The rects of the aliens overlapping the rect.
+        """
+        return [alien.rect for alien in self.__colliding_aliens(rect)]
+
+    def living_cells(self):
+        """
+        Returns the grid cells of the living aliens.
+
+        Returns:
+        tuple: The rows and the columns of the living aliens, as two tuples.
+        """
+        if not self.__cells:
+            return (), ()
+        return tuple(zip(*self.__cells.values()))
+
+    def _create_aliens(self, rows, columns):
+        """
+        Creates an Alien sprite for every cell of the formation's grid.
+
+        Parameters:
+        rows (int): The number of rows of aliens.
+        columns (int): The number of columns of aliens.
+        """
+        self.__aliens = pygame.sprite.Group()
+        self.__cells = {}
+        self.__index.clear()
+        for row_index in range(rows):
+            for column_index in range(columns):
+                alien = Alien(column_index * self._spacing[0] + self._start[0],
+                              row_index * self._spacing[1] + self._start[1])
+                self.__aliens.add(alien)
+                self.__cells[alien] = (row_index, column_index)
+                self.__index.insert(alien, alien.rect)
+                self._alien_size = alien.rect.size
+
+    def _move(self, x, y):
+        """
+        Moves the whole formation, including every alien sprite.
+
+        Parameters:
+        x (int): The horizontal distance to move by.
+        y (int): The vertical distance to move by.
+        """
+        super()._move(x, y)
+        if y:
+            for alien in self.__aliens:
+                alien.rect.y += y
+        if x:
+            self.__aliens.update(x)
+
+    def __colliding_aliens(self, rect):
+        """
+        Returns all alien sprites overlapped by the rect.
+
+        Parameters:
+        rect (pygame.Rect): The rect to check.
+
+        Returns:
+        list: The aliens overlapping the rect.
+        """
+        if rect.width <= 0 or rect.height <= 0 or not self._alien_count or not self.bounding_rect.colliderect(rect):
+            return []
+        local_rect = rect.move(-self._offset[0], -self._offset[1])
+        return [alien for alien in self.__index.query(local_rect) if alien.rect.colliderect(rect)]
@@ -1,50 +1,73 @@
 import pygame
+import random
 import sys
 
-from engine.level.level import Level
+from engine.assets.text_cache import FontSpec, text_cache
+from engine.hud.hud import Hud
+from engine.hud.profiler_overlay import ProfilerOverlay
 from engine.menu.menu import MainMenu
-from engine.player import Player
-from engine.weapon.cannon.cannon import Cannon
-from engine.weapon.explosion import Explosion
+from engine.profiling.frame_profiler import FrameProfiler
+from engine.profiling.tracer import tracer
+from engine.render.renderer import Renderer
+from engine.simulation.actions import actions_from_keys
+from engine.simulation.replay import ReplayRecorder
+from engine.simulation.session import GameSession
 
 
 class GameManager:
     """
-    The main class that manages the game.
+    The main class that manages the game window. The game itself is simulated by a GameSession; the manager feeds
+    it the keys pressed in the window, shows the menu and the HUD and draws the session's state.
 
     Attributes:
         __is_running (bool): flag indicating if the game is running.
         __width (int): width of the game screen.
         __height (int): height of the game screen.
         __screen (pygame.Surface): surface representing the game screen.
+        __renderer (Renderer): renderer drawing on the game screen, either in full or with dirty rects.
         __clock (pygame.time.Clock): clock used to control the game's fps.
-        __font (pygame.font.Font): font used for displaying text on the screen.
-        __is_game_stopped (bool): flag indicating if the game is currently stopped.
-        __player_won (bool): flag indicating if the player has won the game.
-        __player (Player): player object in the game.
-        __player_sprite (pygame.sprite.Sprite): sprite for the player object.
+        __tick_time (float): simulated time of one simulation tick in milliseconds.
+        __max_fps (int): maximum number of rendered frames per second, 0 for no limit.
+        __accumulator (float): real time in milliseconds that has not been simulated yet.
+        __font (FontSpec): font used for displaying text on the screen.
+        __small_font (FontSpec): font used for displaying hints on the screen.
+        __session (GameSession): simulation of the levels, the player and the collisions.
+        __hud (Hud): HUD displaying the player's score, health and weapons.
         __main_menu (MainMenu): object representing the main menu of the game.
-        __levels (list of Level): list of level objects in the game.
-        __previous_level_index (int): index of the previous level.
-        __level_index (int): index of the current level.
-        __alien_timer (int): timer event for the aliens' attack.
-        __cannon_explosions (pygame.sprite.Group): group of cannon explosions.
-        __laser_explosions (pygame.sprite.Group): group of laser explosions.
-        __pop_sound (pygame.mixer.Sound): sound for pop.
-        __explosions_sound (pygame.mixer.Sound): sound for explosions.
+        __config (dict): game configuration the window was created from.
+        __seed (int): seed of every new game, or None for a new random seed per game.
+        __record_path (str): file the last game is recorded to, or None to record nothing.
+        __recorder (ReplayRecorder): recorder of the current game, or None when not recording.
+        __profiler (FrameProfiler): profiler timing the phases of every frame, see PROFILER_PHASES.
+        __profiler_overlay (ProfilerOverlay): overlay showing the frame times, toggled with F3.
 
     Methods:
         run(): Main game loop, manages game states and events.
-        __initialize_player(): Initializes player object.
-        __player_handler(): Handles player actions.
-        __explosions_handler(): Handles explosions in the game.
-        __check_victory_condition(): Check if the player has won the game.
-        __check_player_health(): Check the health of the player and stop the game if health is zero.
+        __start_game(): Starts a new game, recording it if requested.
+        __save_recording(): Writes the recording of the current game.
+        __advance(elapsed): Runs as many simulation ticks as fit into the elapsed real time.
+        __draw(alpha): Draws the game between the last two simulation ticks.
+        __draw_end_screen(): Draws the victory or defeat message.
     """
+    MAX_FRAME_TIME = 250
+    PROFILER_PHASES = ("clear", "events") + GameSession.PROFILER_PHASES + ("draw", "display")
 
-    def __init__(self, width, height, levels):
+    def __init__(self, width, height, levels, render_mode=Renderer.FULL, projectile_backend="sprite", tick_rate=60,
+                 max_fps=60, seed=None, record_path=None, memory_tracker=None):
         """
         The constructor for the GameManager class. It initializes the game window and sets up all the game attributes.
+        The render mode ("full" or "dirty") can be switched while playing with F2, and F3 shows the time every phase
+        of a frame takes. While the tracer is enabled (see --trace), F4 writes the events traced so far to its file;
+        the rest is written when the window is closed. The projectile backend ("sprite"
+        or "array") decides how the shots of the player and the aliens are stored.
+
+        The game is simulated in fixed ticks, tick_rate times per simulated second, independently of how many frames
+        are rendered. Rendering is limited to max_fps frames per second (0 for no limit); when rendering cannot keep
+        up, several ticks are simulated before the next frame is drawn.
+
+        With a seed every game plays out the same for the same keys. With a record path every game is recorded and
+        written there as a replay when it ends or is left, so the last game can be played back with --replay. With a
+        memory tracker the memory of the process is recorded at every level start.
         """
         # Initialize pygame window
         pygame.init()
@@ -56,229 +79,199 @@ class GameManager:
         self.__width = width
         self.__height = height
         self.__screen = pygame.display.set_mode((width, height))
+        self.__renderer = Renderer(self.__screen, (30, 30, 30), render_mode)
         self.__clock = pygame.time.Clock()
-        self.__font = pygame.font.SysFont("arialblack", 48)
-        self.__is_game_stopped = True
-        self.__player_won = False
-
-        # Player handler variables
-        self.__player = 0
-        self.__player_sprite = 0
+        self.__tick_time = 1000 / tick_rate
+        self.__max_fps = max_fps
+        self.__accumulator = 0
+        self.__config = {"width": width, "height": height, "levels": levels, "tick_rate": tick_rate}
+        self.__seed = seed
+        self.__record_path = record_path
+        self.__recorder = None
+        self.__font = FontSpec("arialblack", 48, True)
+        self.__small_font = FontSpec("arialblack", 24, True)
+
+        # Create the simulation of the levels, the player and the collisions
+        self.__session = GameSession(width, height, levels, self.__renderer, projectile_backend, tick_rate)
+        self.__session.memory_tracker = memory_tracker
+        self.__hud = None
+
+        # Time the phases of every frame against the budget of one frame
+        self.__profiler = FrameProfiler(self.PROFILER_PHASES)
+        self.__session.profiler = self.__profiler
+        self.__profiler_overlay = ProfilerOverlay(self.__profiler, 1000 / (max_fps or 60))
 
         # Create a MainMenu object to handle game states
         self.__main_menu = MainMenu(self.__screen, width, height)
 
-        # Create levels
-        self.__levels = []
-        self.__previous_level_index = 0
-        self.__level_index = 0
-        for level in levels:
-            self.__levels.append(Level(self.__screen, width, height, level["level_name"],
-                                       level["obstacle_amount"], level["alien_rows"], level["alien_columns"],
-                                       level["alien_damage"], level["alien_shooting_time"], level["level_audio_path"]))
-
-        # Create timer for alien shooting
-        self.__alien_timer = pygame.USEREVENT + 1
-
-        # Create group for explosions
-        self.__cannon_explosions = pygame.sprite.Group()
-        self.__laser_explosions = pygame.sprite.Group()
+    @property
+    def session(self):
+        """
+        Get the simulation of the game.
+        """
+        return self.__session
 
-        # Import sound
-        self.__pop_sound = pygame.mixer.Sound("audio/pop.wav")
-        self.__pop_sound.set_volume(0.4)
-        self.__explosions_sound = pygame.mixer.Sound("audio/explosion.wav")
-        self.__explosions_sound.set_volume(0.7)
+    @property
+    def profiler(self):
+        """
+        Get the profiler timing the phases of every frame.
+        """
+        return self.__profiler
 
     def run(self):
         """
         The main game loop which handles the user interactions and updates the game state.
+        The game state is advanced in fixed simulation ticks and drawn once per frame. Every frame is timed by the
+        profiler from the end of the wait for the frame cap. Frames spent in the main menu are not recorded.
         """
+        profiler = self.__profiler
         # Main game loop
         while self.__is_running:
-            self.__screen.fill((30, 30, 30))
+            elapsed = self.__clock.tick(self.__max_fps)
+            profiler.begin_frame()
+            self.__renderer.begin_frame()
+            profiler.lap("clear")
 
             # Check current game state
             if self.__main_menu.is_play_clicked:
                 if self.__main_menu.new_game:
-                    self.__cannon_explosions = pygame.sprite.Group()
-                    self.__laser_explosions = pygame.sprite.Group()
                     self.__main_menu.new_game = False
-                    self.__initialize_player()
-                    self.__levels[self.__level_index].initialize_aliens()
-                    self.__levels[self.__level_index].game_music.play(loops=-1)
-                    self.__is_game_stopped = False
-                    self.__player_won = False
-                    pygame.time.set_timer(self.__alien_timer, self.__levels[self.__level_index].alien_shooting_time)
+                    self.__start_game()
+                    self.__hud = Hud(self.__session.player, self.__width, self.__height)
                     pygame.time.wait(10)
-                if not self.__is_game_stopped:
-                    self.__player_handler()
-                    self.__levels[self.__level_index].enemy_handler()
-                    self.__explosions_handler()
-                self.__check_victory_condition()
-                self.__check_player_health()
+                    self.__accumulator = self.__tick_time
+                self.__advance(elapsed)
+                profiler.skip()
+                self.__draw(self.__accumulator / self.__tick_time)
             else:
+                # The menu runs its own loop until play is clicked, which is no frame of the game
                 self.__main_menu.run()
+                self.__renderer.invalidate()
+                self.__accumulator = 0
+                profiler.discard_frame()
+            if self.__profiler_overlay.is_visible:
+                self.__profiler_overlay.draw(self.__renderer, self.__session.object_counts())
+            profiler.lap("draw")
 
             # Event handler
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
+                    self.__save_recording()
+                    tracer.flush()
                     self.__is_running = False
                     pygame.quit()
                     sys.exit()
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         self.__main_menu.is_play_clicked = False
-                        self.__levels[self.__level_index].game_music.stop()
-                if event.type == self.__alien_timer and not self.__is_game_stopped:
-                    self.__levels[self.__level_index].alien_attack()
+                        self.__session.pause()
+                        self.__session.level.game_music.stop()
+                        self.__save_recording()
+                    if event.key == pygame.K_F2:
+                        self.__renderer.toggle_mode()
+                    if event.key == pygame.K_F3:
+                        self.__profiler_overlay.toggle()
+                    if event.key == pygame.K_F4:
+                        tracer.flush()
+            profiler.lap("events")
 
             # Refresh screen
-            pygame.display.update()
-            self.__clock.tick(60)
+            self.__renderer.end_frame()
+            profiler.lap("display")
+            profiler.end_frame()
 
-    def __initialize_player(self):
+    def __start_game(self):
+        """
+        A helper method starting a new game with the configured seed, or a new random one. When recording, the game
+        is started by a new recorder.
+        """
+        seed = self.__seed if self.__seed is not None else random.getrandbits(32)
+        if self.__record_path is None:
+            self.__session.new_game(seed=seed)
+            return
+        self.__recorder = ReplayRecorder(self.__session, self.__config, seed, self.__session.level_index)
+        self.__recorder.start()
+
+    def __save_recording(self):
         """
-        A helper method to initialize the player's ship.
+        A helper method writing the recording of the current game, if any, to the record path.
         """
-        self.__player = Player((self.__width / 2, self.__height - 80), self.__width, self.__height, 10, self.__screen)
-        self.__player_sprite = pygame.sprite.GroupSingle(self.__player)
+        if self.__recorder is not None:
+            self.__recorder.finish().save(self.__record_path)
+            self.__recorder = None
 
-    def __player_handler(self):
+    def __advance(self, elapsed):
         """
-        A helper method to handle the player's ship.
+        A helper method running as many simulation ticks as fit into the real time elapsed since the last frame.
+        The time left over is kept for the next frame. Frames longer than MAX_FRAME_TIME are clamped, so a long
+        stall slows the game down instead of making it simulate a burst of ticks. Only the ticks themselves are
+        lapped to the simulation phases; starting a game and polling the keys are left to "other".
         """
-        self.__player_sprite.update()
-        self.__player_sprite.draw(self.__screen)
-        self.__check_collisions()
-        for weapon in self.__player.weapons:
-            weapon.weapon_shots.draw(self.__screen)
+        self.__accumulator += min(elapsed, self.MAX_FRAME_TIME)
+        while self.__accumulator >= self.__tick_time:
+            actions = actions_from_keys(pygame.key.get_pressed())
+            self.__profiler.skip()
+            if self.__recorder is not None:
+                self.__recorder.tick(actions)
+            else:
+                self.__session.tick(actions)
+            self.__accumulator -= self.__tick_time
+        if self.__recorder is not None and self.__session.is_game_stopped:
+            self.__save_recording()
 
-    def __check_player_health(self):
+    def __draw(self, alpha):
+        """
+        A helper method drawing the game. Moving objects are drawn between their positions after the last two
+        simulation ticks, alpha telling how far between them (0 to 1).
+        """
+        session = self.__session
+        if not session.is_game_stopped:
+            player = session.player
+            self.__hud.update()
+            self.__hud.draw(self.__renderer)
+            self.__renderer.blit(player.image, player.get_interpolated_rect(alpha))
+            for weapon in player.weapons:
+                weapon.weapon_shots.render(self.__renderer, alpha)
+            session.level.draw(alpha)
+            session.explosions.draw(self.__renderer)
+        self.__draw_end_screen()
+
+    def __draw_end_screen(self):
         """
-        Check if the player's health is less than or equal to zero, stop the game and set the appropriate flags.
+        Draw the defeat message if the player died and the victory message if the player finished the level.
         """
-        if self.__player.health <= 0:
-            self.__is_game_stopped = True
-            victory_text = self.__font.render(f"You died!", False, "white")
-            new_game_font = pygame.font.SysFont("arialblack", 24)
-            new_game_text = new_game_font.render(f"Please click escape to start a new game", False, "red")
+        if self.__session.player.health <= 0:
+            victory_text = text_cache.render(self.__font, "You died!", "white", False)
+            new_game_text = text_cache.render(self.__small_font, "Please click escape to start a new game", "red", False)
 
             victory_rect = victory_text.get_rect()
             victory_rect.centerx = self.__width / 2
             victory_rect.centery = self.__height / 2 - 100
-            self.__screen.blit(victory_text, victory_rect)
+            self.__renderer.blit(victory_text, victory_rect)
 
             new_game_rect = new_game_text.get_rect()
             new_game_rect.centerx = self.__width / 2
             new_game_rect.centery = self.__height / 2 - 25
-            self.__screen.blit(new_game_text, new_game_rect)
+            self.__renderer.blit(new_game_text, new_game_rect)
 
-    def __explosions_handler(self):
-        """
-        Handle and update the explosion animations and sounds of both laser and cannon explosions.
-        """
-        self.__cannon_explosions.draw(self.__screen)
-        self.__cannon_explosions.update()
-        self.__laser_explosions.draw(self.__screen)
-        self.__laser_explosions.update()
-
-    def __check_victory_condition(self):
-        """
-        Check if the player has won the current level by destroying all aliens.
-        If either of the conditions is met, stop the game and set the appropriate flags.
-        """
-        if not self.__levels[self.__level_index].aliens:
-            if not self.__player_won:
-                self.__levels[self.__level_index].game_music.stop()
-                self.__is_game_stopped = True
-                self.__previous_level_index = self.__level_index
-                self.__level_index += 1
-                self.__player_won = True
-                if self.__level_index >= len(self.__levels):
-                    self.__level_index = 0
-            victory_text = self.__font.render(
-                f"You finished level: {self.__levels[self.__previous_level_index].level_name}!", False, "white")
-            score_text = self.__font.render(f"Your score is {self.__player.score}", False, "white")
-            new_game_font = pygame.font.SysFont("arialblack", 24)
-            new_game_text = new_game_font.render(f"Please click escape to start a new game", False, "red")
+        if self.__session.player_won:
+            victory_text = text_cache.render(
+                self.__font, f"You finished level: {self.__session.previous_level.level_name}!", "white",
+                False)
+            score_text = text_cache.render(self.__font, f"Your score is {self.__session.player.score}", "white", False)
+            new_game_text = text_cache.render(self.__small_font, "Please click escape to start a new game", "red", False)
 
             victory_rect = victory_text.get_rect()
             victory_rect.centerx = self.__width / 2
             victory_rect.centery = self.__height / 2 - 100
-            self.__screen.blit(victory_text, victory_rect)
+            self.__renderer.blit(victory_text, victory_rect)
 
             score_rect = score_text.get_rect()
             score_rect.centerx = self.__width / 2
             score_rect.centery = self.__height / 2
-            self.__screen.blit(score_text, score_rect)
+            self.__renderer.blit(score_text, score_rect)
 
             new_game_rect = new_game_text.get_rect()
             new_game_rect.centerx = self.__width / 2
             new_game_rect.centery = self.__height / 2 + 50
-            self.__screen.blit(new_game_text, new_game_rect)
-
-    def __check_collisions(self):
-        """
-        This method checks for collisions between the player's weapons, cannon, alien's weapons and aliens.
-        It detects the type of weapon and based on that updates the score and sets explosions for different
-        weapons. If an alien laser collides with the player, the player's health decreases.
-        """
-        # Check player lasers and cannon
-        if self.__player.weapons:
-            for weapon in self.__player.weapons:
-                if isinstance(weapon, Cannon):
-                    for bullet in weapon.weapon_shots:
-                        alien_collisions = pygame.sprite.spritecollide(bullet, self.__levels[self.__level_index].aliens,
-                                                                       True)
-                        block_collisions = pygame.sprite.spritecollide(bullet, self.__levels[self.__level_index].blocks,
-                                                                       True)
-                        if alien_collisions:
-                            self.__player.score += 1
-                        if block_collisions or alien_collisions:
-                            explosion = Explosion(bullet.rect.x, bullet.rect.y, 7)
-                            self.__cannon_explosions.add(explosion)
-                            bullet.kill()
-                            self.__explosions_sound.play()
-                            pygame.sprite.spritecollide(explosion, self.__levels[self.__level_index].blocks, True)
-
-                            extra_alien_collisions = pygame.sprite.spritecollide(explosion, self.__levels[
-                                self.__level_index].aliens,
-                                                                                 True)
-                            for alien in extra_alien_collisions:
-                                self.__player.score += 1
-                else:
-                    for bullet in weapon.weapon_shots:
-                        if pygame.sprite.spritecollide(bullet, self.__levels[self.__level_index].blocks, True):
-                            bullet.kill()
-                            explosion = Explosion(bullet.rect.x, bullet.rect.y, 3, "resources/laserexp", (70, 70))
-                            self.__laser_explosions.add(explosion)
-                        if pygame.sprite.spritecollide(bullet, self.__levels[self.__level_index].aliens, True):
-                            self.__player.score += 1
-                            bullet.kill()
-                            self.__pop_sound.play()
-                            explosion = Explosion(bullet.rect.x, bullet.rect.y, 3, "resources/laserexp", (70, 70))
-                            self.__laser_explosions.add(explosion)
-
-        # Check alien lasers
-        if self.__levels[self.__level_index].alien_weapons:
-            for weapon in self.__levels[self.__level_index].alien_weapons:
-                if pygame.sprite.spritecollide(weapon, self.__levels[self.__level_index].blocks, True):
-                    weapon.kill()
-                    self.__pop_sound.play()
-                    explosion = Explosion(weapon.rect.x, weapon.rect.y, 3, "resources/laserexp", (70, 70))
-                    self.__laser_explosions.add(explosion)
-                if pygame.sprite.spritecollide(weapon, self.__player_sprite, False):
-                    self.__player.health -= self.__levels[self.__level_index].alien_damage
-                    weapon.kill()
-                    self.__pop_sound.play()
-                    explosion = Explosion(weapon.rect.x, weapon.rect.y, 3, "resources/laserexp", (70, 70))
-                    self.__laser_explosions.add(explosion)
-
-        # Check alien collisions
-        if self.__levels[self.__level_index].aliens:
-            for alien in self.__levels[self.__level_index].aliens:
-                pygame.sprite.spritecollide(alien, self.__levels[self.__level_index].blocks, True)
-
-                if pygame.sprite.spritecollide(alien, self.__player_sprite, False):
-                    self.__player.health = 0
+            self.__renderer.blit(new_game_text, new_game_rect)
@@ -0,0 +1,200 @@
+import pygame
+
+from engine.assets.text_cache import HUD_FONT, text_cache
+
+
+class BarWidget:
+    """
+    A HUD widget showing a labelled progress bar, e.g. the player's health or a weapon's reload progress.
+
+    The widget keeps its own offscreen surface and redraws it only when the filled width of the bar changes, so the
+    bar is quantized to one redraw per pixel of progress.
+
+    Attributes:
+        __label (str): The text displayed above the bar.
+        __bar_width (int): The width of the bar.
+        __bar_height (int): The height of the bar.
+        __bar_color (tuple): The color of the filled part of the bar.
+        __empty_bar_color (tuple): The color of the empty part of the bar.
+        __background_color (tuple): The color of the screen behind the widget.
+        __filled_width (int): The filled width the surface was last drawn with.
+        surface (pygame.Surface): The offscreen surface of the widget.
+        position (tuple): The top-left corner of the widget on the screen.
+        is_changed (bool): Whether the surface was redrawn since the widget was last drawn on the screen.
+    """
+    LABEL_HEIGHT = 25
+
+    def __init__(self, label, x, y, bar_color, empty_bar_color, background_color, bar_width=100, bar_height=20):
+        """
+        Initializes the widget.
+
+        Parameters:
+        label (str): The text displayed above the bar.
+        x (int): The x-coordinate of the bar on the screen.
+        y (int): The y-coordinate of the bar on the screen. The label is displayed above it.
+        bar_color (tuple): The color of the filled part of the bar.
+        empty_bar_color (tuple): The color of the empty part of the bar.
+        background_color (tuple): The color of the screen behind the widget.
+        bar_width (int, optional): The width of the bar. Defaults to 100.
+        bar_height (int, optional): The height of the bar. Defaults to 20.
+        """
+        self.__label = label
+        self.__bar_width = bar_width
+        self.__bar_height = bar_height
+        self.__bar_color = bar_color
+        self.__empty_bar_color = empty_bar_color
+        self.__background_color = background_color
+        self.__filled_width = None
+
+        label_width = text_cache.render(HUD_FONT, label, (255, 255, 255)).get_width()
+        self.surface = pygame.Surface((max(bar_width, label_width), self.LABEL_HEIGHT + bar_height))
+        self.position = (x, y - self.LABEL_HEIGHT)
+        self.is_changed = True
+
+    def update(self, percentage_complete):
+        """
+        Redraws the widget if the filled width of the bar changed.
+
+        Parameters:
+        percentage_complete (float): The filled part of the bar, between 0 and 1.
+
+        Returns:
+        bool: True if the widget was redrawn, False otherwise.
+        """
+        filled_width = int(self.__bar_width * min(max(percentage_complete, 0), 1))
+        if filled_width == self.__filled_width:
+            return False
+        self.__filled_width = filled_width
+
+        self.surface.fill(self.__background_color)
+        self.surface.blit(text_cache.render(HUD_FONT, self.__label, (255, 255, 255)), (0, 0))
+        pygame.draw.rect(self.surface, self.__bar_color,
+                         (0, self.LABEL_HEIGHT, filled_width, self.__bar_height))
+        pygame.draw.rect(self.surface, self.__empty_bar_color,
+                         (filled_width, self.LABEL_HEIGHT, self.__bar_width - filled_width, self.__bar_height))
+        self.is_changed = True
+        return True
+
+
+class TextWidget:
+    """
+    A HUD widget showing a single line of text, e.g. the player's score. The surface only grows, so a shorter text
+    is drawn over the whole area of a longer one.
+
+    Attributes:
+        __template (str): The format string of the text, filled with the widget's value.
+        __background_color (tuple): The color of the screen behind the widget.
+        __value: The value the surface was last drawn with.
+        surface (pygame.Surface): The offscreen surface of the widget.
+        position (tuple): The top-left corner of the widget on the screen.
+        is_changed (bool): Whether the surface was redrawn since the widget was last drawn on the screen.
+    """
+    def __init__(self, template, x, y, background_color):
+        """
+        Initializes the widget.
+
+        Parameters:
+        template (str): The format string of the text, e.g. "Score: {}".
+        x (int): The x-coordinate of the text on the screen.
+        y (int): The y-coordinate of the text on the screen.
+        background_color (tuple): The color of the screen behind the widget.
+        """
+        self.__template = template
+        self.__background_color = background_color
+        self.__value = None
+        self.surface = pygame.Surface((0, 0))
+        self.position = (x, y)
+        self.is_changed = True
+
+    def update(self, value):
+        """
+        Redraws the widget if its value changed.
+
+        Parameters:
+        value: The value displayed by the widget.
+
+        Returns:
+        bool: True if the widget was redrawn, False otherwise.
+        """
+        if value == self.__value:
+            return False
+        self.__value = value
+
+        text = text_cache.render(HUD_FONT, self.__template.format(value), (255, 255, 255))
+        size = (max(self.surface.get_width(), text.get_width()), max(self.surface.get_height(), text.get_height()))
+        if self.surface.get_size() != size:
+            self.surface = pygame.Surface(size)
+        self.surface.fill(self.__background_color)
+        self.surface.blit(text, (0, 0))
+        self.is_changed = True
+        return True
+
+
+class Hud:
+    """
+    The Hud class displays the player's score, health and weapon reload progress.
+
+    Every widget is pre-composited on its own offscreen surface and redrawn only when its value changes. The widgets
+    are drawn as static layers, so the dirty mode of the renderer only redraws the ones that changed. The HUD is drawn
+    before the sprites, so the widgets are painted on the background color of the screen.
+
+    Attributes:
+        __player (Player): The player whose status is displayed.
+        __score_widget (TextWidget): The widget showing the score.
+        __health_widget (BarWidget): The widget showing the health.
+        __weapon_widgets (list of BarWidget): The widgets showing the reload progress of every weapon.
+        __redraw_count (int): The number of widget redraws since the HUD was created.
+
+    Methods:
+        update(): Redraws the widgets whose values changed.
+        draw(renderer): Draws the HUD on the screen.
+    """
+    WEAPON_BAR_COLORS = [(169, 169, 169), (255, 0, 0), (0, 0, 255)]
+
+    def __init__(self, player, screen_width, screen_height, background_color=(30, 30, 30)):
+        """
+        Initializes the HUD of the given player.
+
+        Parameters:
+        player (Player): The player whose status is displayed.
+        screen_width (int): The width of the game screen.
+        screen_height (int): The height of the game screen.
+        background_color (tuple, optional): The color of the screen behind the HUD. Defaults to (30, 30, 30).
+        """
+        self.__player = player
+        self.__score_widget = TextWidget("Score: {}", 10, 10, background_color)
+        self.__health_widget = BarWidget("Health", 10, screen_height - 30, (255, 0, 100), (255, 255, 255),
+                                         background_color)
+
+        weapon_positions = [120, screen_width - 220, screen_width - 110]
+        self.__weapon_widgets = [BarWidget(weapon.weapon_name, x, screen_height - 30, bar_color, (255, 255, 255),
+                                           background_color)
+                                 for weapon, x, bar_color in zip(player.weapons, weapon_positions,
+                                                                 self.WEAPON_BAR_COLORS)]
+        self.__redraw_count = 0
+
+    @property
+    def redraw_count(self):
+        """Get the number of widget redraws since the HUD was created."""
+        return self.__redraw_count
+
+    def update(self):
+        """
+        Redraws the widgets whose values changed since the last update.
+        """
+        redrawn = [self.__score_widget.update(self.__player.score),
+                   self.__health_widget.update(self.__player.health / 100)]
+        for weapon, widget in zip(self.__player.weapons, self.__weapon_widgets):
+            redrawn.append(widget.update(weapon.reload_progress))
+        self.__redraw_count += sum(redrawn)
+
+    def draw(self, renderer):
+        """
+        Draws all widgets on the screen as static layers.
+
+        Parameters:
+        renderer (Renderer): The renderer used to draw the HUD.
+        """
+        for widget in [self.__score_widget, self.__health_widget, *self.__weapon_widgets]:
+            renderer.draw_static(widget.surface, widget.position, widget.is_changed)
+            widget.is_changed = False
@@ -0,0 +1,107 @@
+import pygame
+
+from engine.assets.text_cache import FontSpec, text_cache
+
+
+class ProfilerOverlay:
+    """
+    A toggleable overlay showing the frame times of a FrameProfiler: for every phase its time in the last frame and
+    its 50th, 95th and 99th percentile, followed by the number of live objects of every kind, e.g. aliens or shots.
+    Phases whose 95th percentile exceeds the frame budget are highlighted.
+
+    The numbers change every frame, so the overlay is pre-composited on its own surface and only redrawn every few
+    frames. Its texts are rendered with the font directly instead of through the text cache, which they would flood.
+
+    Attributes:
+        __profiler (FrameProfiler): The profiler whose times are shown.
+        __budget (float): The time one frame may take in milliseconds.
+        __refresh_frames (int): The number of frames between two redraws of the overlay.
+        __font (FontSpec): The font of the overlay.
+        __is_visible (bool): Whether the overlay is drawn.
+        __frames_until_refresh (int): The number of frames until the overlay is redrawn.
+        surface (pygame.Surface): The offscreen surface of the overlay, or None before the first redraw.
+        position (tuple): The top-left corner of the overlay on the screen.
+
+    Methods:
+        toggle(): Shows or hides the overlay.
+        draw(renderer, counts): Draws the overlay on the screen.
+    """
+    FONT = FontSpec("monospace", 16, True)
+    TEXT_COLOR = (255, 255, 255)
+    OVER_BUDGET_COLOR = (255, 80, 80)
+    BACKGROUND_COLOR = (0, 0, 0, 180)
+    PADDING = 6
+
+    def __init__(self, profiler, budget, position=(10, 50), refresh_frames=15, font=FONT):
+        """
+        Initializes a hidden overlay.
+
+        Parameters:
+        profiler (FrameProfiler): The profiler whose times are shown.
+        budget (float): The time one frame may take in milliseconds, e.g. 16.6 at 60 frames per second.
+        position (tuple, optional): The top-left corner of the overlay on the screen. Defaults to (10, 50).
+        refresh_frames (int, optional): The number of frames between two redraws of the overlay. Defaults to 15.
+        font (FontSpec, optional): The font of the overlay, best a monospace one. Defaults to FONT.
+        """
+        self.__profiler = profiler
+        self.__budget = budget
+        self.__refresh_frames = refresh_frames
+        self.__font = font
+        self.__is_visible = False
+        self.__frames_until_refresh = 0
+        self.surface = None
+        self.position = position
+
+    @property
+    def is_visible(self):
+        """Check whether the overlay is drawn."""
+        return self.__is_visible
+
+    def toggle(self):
+        """
+        Shows or hides the overlay. A shown overlay is redrawn on its first frame.
+        """
+        self.__is_visible = not self.__is_visible
+        self.__frames_until_refresh = 0
+
+    def draw(self, renderer, counts=None):
+        """
+        Draws the overlay on the screen if it is visible, redrawing it first every refresh_frames frames.
+
+        Parameters:
+        renderer (Renderer): The renderer used to draw the overlay.
+        counts (dict, optional): The number of live objects by kind, e.g. GameSession.object_counts(). Defaults to
+        none shown.
+        """
+        if not self.__is_visible:
+            return
+        if self.__frames_until_refresh <= 0 or self.surface is None:
+            self.__redraw(counts or {})
+            self.__frames_until_refresh = self.__refresh_frames
+        self.__frames_until_refresh -= 1
+        renderer.blit(self.surface, self.position)
+
+    def __redraw(self, counts):
+        """
+        A helper method composing the table of the phases and the counts on the overlay's surface.
+        """
+        font = text_cache.get_font(self.__font)
+        lines = [(f"{'phase':<11}{'now':>7}{'p50':>7}{'p95':>7}{'p99':>7}  ms", self.TEXT_COLOR)]
+        for phase in self.__profiler.report_phases:
+            stats = self.__profiler.stats(phase)
+            color = self.OVER_BUDGET_COLOR if stats.p95 > self.__budget else self.TEXT_COLOR
+            lines.append((f"{phase:<11}{stats.current:>7.2f}{stats.p50:>7.2f}{stats.p95:>7.2f}{stats.p99:>7.2f}",
+                          color))
+        lines.append((f"budget {self.__budget:.1f} ms, {min(self.__profiler.frame_count, self.__profiler.capacity)} "
+                      f"frames", self.TEXT_COLOR))
+        lines.extend((f"{kind:<16}{count:>6}", self.TEXT_COLOR) for kind, count in counts.items())
+
+        texts = [font.render(text, True, color) for text, color in lines]
+        line_height = font.get_linesize()
+        width = max(text.get_width() for text in texts) + 2 * self.PADDING
+        height = line_height * len(texts) + 2 * self.PADDING
+        if self.surface is None or self.surface.get_size() != (width, height):
+            self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.surface.fill(self.BACKGROUND_COLOR)
+        self.surface.blits([(text, (self.PADDING, self.PADDING + line_height * row))
+                            for row, text in enumerate(texts)])
@@ -1,8 +1,12 @@
 import pygame
-from random import choice
 
-from engine.enemy.alien import Alien
-from engine.enemy.block import obstacle_shape, Block
+from engine.assets.sound import load_sound
+from engine.collision.spatial_grid import SpatialGrid
+from engine.enemy.bunker import obstacle_shape, Bunker
+from engine.enemy.formation import Formation, SpriteFormation
+from engine.profiling.tracer import tracer
+from engine.weapon.projectile import Projectile
+from engine.weapon.projectile_pool import pooled_projectiles
 
 
 class Level:
@@ -10,7 +14,7 @@ class Level:
     This class represents a level in the game, including all elements in the level such as obstacles, aliens, and background music.
 
     Attributes:
-        __screen (pygame.Surface): The surface to be used for displaying the game.
+        __renderer (Renderer): The renderer used for displaying the game.
         __width (int): The width of the screen.
         __height (int): The height of the screen.
         __alien_rows (int): The number of rows of aliens in the level.
@@ -20,41 +24,52 @@ class Level:
         __level_name (str): The name of the level.
         __obstacle_shape (list): A list of strings representing the shape of the obstacles.
         __block_size (int): The size of each obstacle block.
-        __blocks (pygame.sprite.Group): A group containing all the obstacle blocks in the level.
+        __blocks (pygame.sprite.Group): A group containing all the bunkers in the level.
+        __block_index (SpatialGrid): The broadphase index of the bunkers.
         __obstacle_amount (int): The number of obstacles in the level.
-        __alien_direction (int): The direction the aliens are moving in the level.
-        __aliens (pygame.sprite.Group): A group containing all the aliens in the level.
-        __aliens_weapons (pygame.sprite.Group): A group containing all the weapons the aliens have fired.
+        __formation (Formation): The formation of aliens in the level, moving as one body. It is a SpriteFormation
+        or, with the "array" alien backend, an ArrayFormation.
+        __aliens_weapons (PooledShotGroup or BulletGroup): A group containing all the weapons the aliens have fired.
         __alien_damage (int): The damage the aliens deal.
         __alien_shooting_time (int): The time between the aliens' shots.
+        __alien_shooting_policy (str): How the alien that shoots is picked, one of Formation.SHOOTING_POLICIES.
         __level_music (pygame.mixer.Sound): The audio for the level.
         __laser_sound (pygame.mixer.Sound): The sound for the aliens' laser.
 
     Methods:
-        enemy_handler: Handles the display of the aliens and obstacles on the screen.
+        update: Moves the aliens and their weapons by one simulation tick.
+        draw: Draws the obstacles, aliens and their weapons on the screen.
         alien_attack: Initiates an attack from the aliens.
         __create_obstacles: Helper method for creating obstacles in the level.
+        destroy_blocks: Destroys the bunker blocks overlapped by a rect.
+        destroy_blocks_under_aliens: Destroys the bunker blocks overlapped by any alien.
+        hit_aliens: Kills the aliens overlapped by a rect.
+        colliding_aliens: Returns the aliens overlapped by a rect.
         initialize_aliens: Initializes the aliens in the level.
 
     Properties:
         is_level_locked: Whether the level is locked or not.
         is_level_finished: Whether the level is finished or not.
         alien_weapons: A group containing all the weapons the aliens have fired.
-        blocks: A group containing all the obstacle blocks in the level.
-        aliens: A group containing all the aliens in the level.
+        blocks: A group containing all the bunkers in the level.
+        target_rects: The rects of the bunkers and the aliens, which shots can hit.
+        alien_count: The number of living aliens in the level.
+        formation: The formation moving the aliens of the level.
         alien_damage: The damage the aliens deal.
         alien_shooting_time: The time between the aliens' shots.
+        alien_shooting_policy: How the alien that shoots is picked.
         game_music: The audio for the level.
         level_name: The name of the level.
     """
-    def __init__(self, screen, width, height, level_name, obstacle_amount=6, alien_rows=6, alien_columns=16,
+    def __init__(self, renderer, width, height, level_name, obstacle_amount=6, alien_rows=6, alien_columns=16,
                  alien_damage=15,
-                 alien_shooting_time=1200, level_audio_path="audio/game_music.wav"):
+                 alien_shooting_time=1200, level_audio_path="audio/game_music.wav", alien_backend="sprite",
+                 projectiles=None, rng=None, alien_shooting_policy="random"):
         """
         The constructor of the Level class initializes various attributes and creates obstacles and aliens.
 
         Attributes:
-        screen (pygame.Surface): The screen where the game is displayed.
+        renderer (Renderer): The renderer used for displaying the game, or None for a headless game.
         width (int): The width of the screen.
         height (int): The height of the screen.
         level_name (str): The name of the level.
@@ -64,9 +79,16 @@ class Level:
         alien_damage (int): The damage dealt by the aliens. Default is 15.
         alien_shooting_time (int): The time between alien shooting. Default is 1200.
         level_audio_path (str): The path to the audio file for the level. Default is "audio/game_music.wav".
+        alien_backend (str): How the aliens are stored, "sprite" for Alien sprites or "array" for NumPy arrays.
+        Default is "sprite".
+        projectiles (PooledProjectiles or BulletEngine): The projectile backend storing the aliens' lasers. Default is
+        the pooled sprite backend.
+        rng (random.Random): The generator picking the aliens that shoot. Default is an unseeded one.
+        alien_shooting_policy (str): How the alien that shoots is picked, one of Formation.SHOOTING_POLICIES. Default
+        is "random".
 
         Class Variables:
-        __screen (pygame.Surface): The screen where the game is displayed.
+        __renderer (Renderer): The renderer used for displaying the game.
         __width (int): The width of the screen.
         __height (int): The height of the screen.
         __alien_rows (int): The amount of rows of aliens.
@@ -76,18 +98,18 @@ class Level:
         __level_name (str): The name of the level.
         __obstacle_shape (str): The shape of the obstacles.
         __block_size (int): The size of the obstacles.
-        __blocks (pygame.sprite.Group): A group containing all the obstacles in the level.
+        __blocks (pygame.sprite.Group): A group containing all the bunkers in the level.
         __obstacle_amount (int): The amount of obstacles in the level.
-        __alien_direction (int): The direction of movement of the aliens.
-        __aliens (pygame.sprite.Group): A group containing all the aliens in the level.
-        __aliens_weapons (pygame.sprite.Group): A group containing all the weapons used by the aliens in the level.
+        __formation (Formation): The formation of aliens in the level.
+        __aliens_weapons (PooledShotGroup or BulletGroup): A group containing all the weapons used by the aliens in the level.
         __alien_damage (int): The damage dealt by the aliens.
         __alien_shooting_time (int): The time between alien shooting.
+        __alien_shooting_policy (str): How the alien that shoots is picked.
         __level_music (pygame.mixer.Sound): The audio for the level.
         __laser_sound (pygame.mixer.Sound): The audio for the laser shot by the aliens.
         """
         # Initialize level attributes
-        self.__screen = screen
+        self.__renderer = renderer
         self.__width = width
         self.__height = height
         self.__alien_rows = alien_rows
@@ -101,22 +123,25 @@ class Level:
         self.__obstacle_shape = obstacle_shape
         self.__block_size = 13
         self.__blocks = pygame.sprite.Group()
+        self.__block_index = SpatialGrid()
         self.__obstacle_amount = obstacle_amount
         obstacle_offsets = [num * (self.__width / obstacle_amount) for num in range(obstacle_amount)]
         self.__create_obstacles(self.__width / 25, 650, *obstacle_offsets)
 
         # Initialize aliens
-        self.__alien_direction = 2
-        self.__aliens = pygame.sprite.Group()
-        self.__aliens_weapons = pygame.sprite.Group()
+        self.__formation = self.__create_formation(alien_backend, rng)
+        if projectiles is None:
+            projectiles = pooled_projectiles
+        self.__aliens_weapons = projectiles.create_group(Projectile.ALIEN)
         self.__alien_damage = alien_damage
         self.__alien_shooting_time = alien_shooting_time
+        if alien_shooting_policy not in Formation.SHOOTING_POLICIES:
+            raise ValueError(f"Unknown alien shooting policy: {alien_shooting_policy}")
+        self.__alien_shooting_policy = alien_shooting_policy
 
         # Level audio
-        self.__level_music = pygame.mixer.Sound(level_audio_path)
-        self.__level_music.set_volume(0.2)
-        self.__laser_sound = pygame.mixer.Sound("audio/laser.wav")
-        self.__laser_sound.set_volume(0.4)
+        self.__level_music = load_sound(level_audio_path, 0.2)
+        self.__laser_sound = load_sound("audio/laser.wav", 0.4)
 
     @property
     def is_level_locked(self):
@@ -177,7 +202,7 @@ class Level:
     def blocks(self):
         """
         This property returns the value of the private attribute `__blocks`,
-        which contains information about the blocks in the level.
+        which contains the bunkers of the level. Every bunker holds a grid of blocks.
 
         Returns:
             any: The value of the `__blocks` attribute.
@@ -185,15 +210,39 @@ class Level:
         return self.__blocks
 
     @property
-    def aliens(self):
+    def target_rects(self):
         """
-        This property returns the value of the private attribute `__aliens`,
-        which contains information about the aliens in the level.
+        This property returns the rects a shot can hit in the level: the rect of every bunker and the bounding rect
+        of the aliens. Shots outside of all of them cannot hit anything in the level.
 
         Returns:
-            any: The value of the `__aliens` attribute.
+            list: The rects of the bunkers and the aliens.
         """
-        return self.__aliens
+        rects = [bunker.rect for bunker in self.__blocks]
+        if len(self.__formation):
+            rects.append(self.__formation.bounding_rect)
+        return rects
+
+    @property
+    def alien_count(self):
+        """
+        This property returns the number of living aliens of the private attribute `__formation`.
+
+        Returns:
+            int: The number of living aliens.
+        """
+        return len(self.__formation)
+
+    @property
+    def formation(self):
+        """
+        This property returns the value of the private attribute `__formation`,
+        which moves the aliens of the level as one body.
+
+        Returns:
+            Formation: The formation of aliens in the level.
+        """
+        return self.__formation
 
     @property
     def alien_damage(self):
@@ -217,6 +266,16 @@ class Level:
         """
         return self.__alien_shooting_time
 
+    @property
+    def alien_shooting_policy(self):
+        """
+        This property returns how the alien that shoots is picked, one of Formation.SHOOTING_POLICIES.
+
+        Returns:
+            str: The value of the `__alien_shooting_policy` attribute.
+        """
+        return self.__alien_shooting_policy
+
     @property
     def game_music(self):
         """
@@ -239,36 +298,53 @@ class Level:
         """
         return self.__level_name
 
-    def enemy_handler(self):
+    def update(self):
         """
-        This method is responsible for handling all the enemies in the game.
-        It updates and draws all the blocks, aliens and alien weapons on the screen.
+        This method moves all the enemies in the game by one simulation tick.
+        It updates the formation of aliens and the alien weapons.
 
         Returns:
             None
         """
-        self.__blocks.draw(self.__screen)
-        self.__aliens.draw(self.__screen)
-        self.__aliens.update(self.__alien_direction)
-        self.__adjust_alien_position()
-
+        self.__formation.update()
         self.__aliens_weapons.update()
-        self.__aliens_weapons.draw(self.__screen)
 
-    def alien_attack(self):
+    def draw(self, alpha=1):
+        """
+        This method draws all the blocks, aliens and alien weapons on the screen.
+        Moving objects are drawn between their positions after the last two updates. The bunkers are static layers,
+        so the dirty mode of the renderer only redraws the ones that changed.
+
+        Args:
+            alpha (float): How far the drawing is between the previous update (0) and the last one (1). Default is 1.
+
+        Returns:
+            None
+        """
+        for bunker in self.__blocks:
+            self.__renderer.draw_static(bunker.image, bunker.rect, bunker.is_changed)
+            bunker.is_changed = False
+        self.__formation.draw(self.__renderer, alpha)
+        self.__aliens_weapons.render(self.__renderer, alpha)
+
+    def alien_attack(self, target_x=None):
         """
         This method is responsible for the aliens attacking the player.
-        It shoots the laser beam from a random alien.
+        It shoots the laser beam from an alien picked by the level's shooting policy.
+
+        Args:
+            target_x (int, optional): The x-coordinate the aimed policies aim at, usually the player's center.
 
         Returns:
             None
         """
-        self.__alien_shoot()
+        self.__alien_shoot(target_x)
 
     def __create_obstacles(self, x_start, y_start, *offset):
         """
         This method is responsible for creating the obstacles in the game.
-        It takes in the starting x and y positions and the offset of each obstacle and adds them to the __blocks sprite group.
+        It takes in the starting x and y positions and the offset of each obstacle and adds a bunker for each of them
+        to the __blocks sprite group.
 
         Args:
             x_start (int): The starting x position of the first obstacle.
@@ -278,14 +354,69 @@ class Level:
         Returns:
             None
         """
+        tracer.begin("create obstacles", "level", {"obstacles": len(offset)})
         for x_offset in offset:
-            for row_index, row in enumerate(self.__obstacle_shape):
-                for column_index, column in enumerate(row):
-                    if column == 'x':
-                        x = ((column_index * self.__block_size) + x_start) + x_offset
-                        y = (row_index * self.__block_size) + y_start
-                        block = Block(self.__block_size, (255, 90, 90), x, y)
-                        self.__blocks.add(block)
+            bunker = Bunker(self.__obstacle_shape, self.__block_size, (255, 90, 90), x_start + x_offset, y_start)
+            self.__blocks.add(bunker)
+            self.__block_index.insert(bunker, bunker.rect)
+        tracer.end("create obstacles", "level")
+
+    def destroy_blocks(self, rect):
+        """
+        Destroys all bunker blocks overlapped by the rect. Bunkers without any blocks left are removed.
+
+        Args:
+            rect (pygame.Rect): The rect destroying the blocks, e.g. of a projectile or an explosion.
+
+        Returns:
+            bool: True if any block was destroyed, False otherwise.
+        """
+        destroyed = 0
+        for bunker in self.__block_index.colliding(rect):
+            destroyed += bunker.destroy(rect)
+            if not bunker.block_count:
+                bunker.kill()
+                self.__block_index.remove(bunker)
+        return destroyed > 0
+
+    def destroy_blocks_under_aliens(self):
+        """
+        Destroys all bunker blocks overlapped by any alien.
+
+        Returns:
+            None
+        """
+        alien_rects = []
+        for bunker in self.__blocks:
+            for alien_rect in self.__formation.colliding(bunker.rect):
+                if alien_rect not in alien_rects:
+                    alien_rects.append(alien_rect)
+        for alien_rect in alien_rects:
+            self.destroy_blocks(alien_rect)
+
+    def hit_aliens(self, rect):
+        """
+        Kills all aliens overlapped by the rect.
+
+        Args:
+            rect (pygame.Rect): The rect hitting the aliens, e.g. of a projectile or an explosion.
+
+        Returns:
+            list: The rects of the killed aliens.
+        """
+        return self.__formation.hit(rect)
+
+    def colliding_aliens(self, rect):
+        """
+        Returns all aliens overlapped by the rect, without killing them.
+
+        Args:
+            rect (pygame.Rect): The rect to check.
+
+        Returns:
+            list: The rects of the aliens overlapping the rect.
+        """
+        return self.__formation.colliding(rect)
 
     def initialize_aliens(self, x_offset=100, y_offset=80, x_start=70, y_start=60):
         """
@@ -300,61 +431,52 @@ class Level:
         Returns:
         None
         """
+        tracer.begin("initialize aliens", "level", {"level": self.__level_name})
+
         # Initialize obstacles
         self.__obstacle_shape = obstacle_shape
         self.__blocks = pygame.sprite.Group()
+        self.__block_index.clear()
         obstacle_offsets = [num * (self.__width / self.__obstacle_amount) for num in range(self.__obstacle_amount)]
         self.__create_obstacles(self.__width / 25, 650, *obstacle_offsets)
 
         # Initialize aliens
-        self.__aliens = pygame.sprite.Group()
-        self.__aliens_weapons = pygame.sprite.Group()
-
-        for row_index, row in enumerate(range(self.__alien_rows)):
-            for column_index, column in enumerate(range(self.__alien_columns)):
-                x = column_index * x_offset + x_start
-                y = row_index * y_offset + y_start
-                alien = Alien(x, y)
-                self.__aliens.add(alien)
-
-    def __adjust_alien_position(self):
-        """
-        Adjusts the position of the aliens in the game if they reach either the left or right edge of the screen.
-
-        Returns:
-        None
-        """
-        if self.__aliens.sprites():
-            for alien in self.__aliens.sprites():
-                if alien.rect.right >= self.__width:
-                    self.__alien_direction = -2
-                    self.__alien_move_down(2)
-                elif alien.rect.left <= 0:
-                    self.__alien_direction = 2
-                    self.__alien_move_down(2)
+        self.__formation.initialize(self.__alien_rows, self.__alien_columns, x_offset, y_offset, x_start, y_start)
+        for laser in self.__aliens_weapons.sprites():
+            laser.kill()
+        tracer.end("initialize aliens", "level")
 
-    def __alien_move_down(self, distance):
+    def __alien_shoot(self, target_x):
         """
-        Moves all the aliens down by a certain distance.
+        Allows the alien picked by the shooting policy to shoot a laser in the game.
 
-        Parameters:
-        distance (int): The distance to move the aliens down by.
+        Args:
+            target_x (int): The x-coordinate the aimed policies aim at, or None.
 
         Returns:
         None
         """
-        if self.__aliens.sprites():
-            for alien in self.__aliens.sprites():
-                alien.rect.y += distance
+        origin = self.__formation.laser_origin(self.__alien_shooting_policy, target_x)
+        if origin is not None:
+            self.__aliens_weapons.spawn_laser(origin, self.__height, self.__formation.LASER_COLOR,
+                                              self.__formation.LASER_SPEED, self.__alien_damage)
+            self.__laser_sound.play()
 
-    def __alien_shoot(self):
+    def __create_formation(self, alien_backend, rng):
         """
-        Allows random alien to shoot a laser in the game.
+        Creates the formation of aliens for the given backend. NumPy is only imported when the "array" backend is
+        used.
+
+        Args:
+            alien_backend (str): "sprite" or "array".
+            rng (random.Random): The generator picking the aliens that shoot, or None.
 
         Returns:
-        None
-        """
-        if self.__aliens.sprites():
-            alien = choice(self.__aliens.sprites())
-            self.__aliens_weapons.add(alien.prepare_laser(self.__height))
-            self.__laser_sound.play()
+            Formation: The empty formation.
+        """
+        if alien_backend == "sprite":
+            return SpriteFormation(self.__width, rng=rng)
+        if alien_backend == "array":
+            from engine.enemy.array_formation import ArrayFormation
+            return ArrayFormation(self.__width, rng=rng)
+        raise ValueError(f"Unknown alien backend: {alien_backend}")
@@ -1,3 +1,6 @@
+from engine.assets.text_cache import text_cache
+
+
 class Button:
     """
     The Button class provides the implementation for creating a button for a user interface.
@@ -6,7 +9,7 @@ class Button:
     - image (pygame.Surface): The surface object to display on the button
     - x_pos (int): The x coordinate of the button center
     - y_pos (int): The y coordinate of the button center
-    - font (pygame.font.Font): The font object to render the text of the button
+    - font (FontSpec): The spec of the font used to render the text of the button
     - base_color (tuple): The base color of the text in (R, G, B) format
     - hovering_color (tuple): The color of the text when hovering over the button in (R, G, B) format
     - text_input (str): The text to be displayed on the button
@@ -23,7 +26,7 @@ class Button:
         - image (pygame.Surface): The surface object to display on the button
         - pos (tuple): The position of the button center in (x, y) format
         - text_input (str): The text to be displayed on the button
-        - font (pygame.font.Font): The font object to render the text of the button
+        - font (FontSpec): The spec of the font used to render the text of the button
         - base_color (tuple): The base color of the text in (R, G, B) format
         - hovering_color (tuple): The color of the text when hovering over the button in (R, G, B) format
 
@@ -34,7 +37,7 @@ class Button:
         self.font = font
         self.base_color, self.hovering_color = base_color, hovering_color
         self.text_input = text_input
-        self.text = self.font.render(self.text_input, True, self.base_color)
+        self.text = text_cache.render(self.font, self.text_input, self.base_color)
         if self.image is None:
             self.image = self.text
         self.rect = self.image.get_rect(center=(self.x_pos, self.y_pos))
@@ -80,6 +83,6 @@ class Button:
         """
         if position[0] in range(self.rect.left, self.rect.right) and position[1] in range(self.rect.top,
                                                                                           self.rect.bottom):
-            self.text = self.font.render(self.text_input, True, self.hovering_color)
+            self.text = text_cache.render(self.font, self.text_input, self.hovering_color)
         else:
-            self.text = self.font.render(self.text_input, True, self.base_color)
+            self.text = text_cache.render(self.font, self.text_input, self.base_color)
@@ -1,5 +1,7 @@
 import pygame
 import sys
+from engine.assets.asset_cache import asset_cache
+from engine.assets.text_cache import FontSpec, text_cache
 from engine.menu.button import Button
 
 
@@ -9,7 +11,7 @@ class MainMenu:
 
     Attributes:
         __screen (pygame.Surface): The surface on which the main menu is displayed.
-        __font (pygame.font.Font): The font used to display text in the main menu.
+        __font (FontSpec): The font used to display text in the main menu.
         __play_button (Button): The play button displayed in the main menu.
         __quit_button (Button): The quit button displayed in the main menu.
         __how_to_play_button (Button): The How To Play button displayed in the main menu.
@@ -34,7 +36,7 @@ class MainMenu:
             height (int): The height of the main menu screen.
         """
         self.__screen = screen
-        self.__font = pygame.font.SysFont("arialblack", 100)
+        self.__font = FontSpec("arialblack", 100, True)
         self.__play_button = 0
         self.__quit_button = 0
         self.__how_to_play_button = 0
@@ -78,13 +80,13 @@ class MainMenu:
         """
         Initializes the play, how to play and quit buttons in the main menu.
         """
-        self.__play_button = Button(image=pygame.image.load("resources/play_btn.png"), pos=(self.__width / 2, self.__height / 2 - 100),
+        self.__play_button = Button(image=asset_cache.load_image("resources/play_btn.png"), pos=(self.__width / 2, self.__height / 2 - 100),
                              text_input="PLAY", font=self.__font, base_color="White", hovering_color="#d7fcd4")
-        self.__how_to_play_button = Button(image=pygame.image.load("resources/how_to_play_btn.png"), pos=(self.__width / 2, self.__height / 2 + 50),
+        self.__how_to_play_button = Button(image=asset_cache.load_image("resources/how_to_play_btn.png"), pos=(self.__width / 2, self.__height / 2 + 50),
                              text_input="CONTROLS", font=self.__font, base_color="White", hovering_color="#d7fcd4")
-        self.__quit_button = Button(image=pygame.image.load("resources/quit_btn.png"), pos=(self.__width / 2, self.__height / 2 + 200),
+        self.__quit_button = Button(image=asset_cache.load_image("resources/quit_btn.png"), pos=(self.__width / 2, self.__height / 2 + 200),
                              text_input="QUIT", font=self.__font, base_color="White", hovering_color="#d7fcd4")
-        self.__back_button = Button(image=pygame.image.load("resources/quit_btn.png"), pos=(self.__width / 2, self.__height / 2 + 350),
+        self.__back_button = Button(image=asset_cache.load_image("resources/quit_btn.png"), pos=(self.__width / 2, self.__height / 2 + 350),
                              text_input="BACK", font=self.__font, base_color="White", hovering_color="#d7fcd4")
 
     def run(self):
@@ -96,32 +98,32 @@ class MainMenu:
 
             menu_mouse_pos = pygame.mouse.get_pos()
             if self.__is_how_to_play_selected:
-                how_to_play_font = pygame.font.SysFont("arialblack", 80)
-                a_text = how_to_play_font.render("A - move left", True, "#d7ffa6")
+                how_to_play_font = FontSpec("arialblack", 80, True)
+                a_text = text_cache.render(how_to_play_font, "A - move left", "#d7ffa6", True)
                 a_rect = a_text.get_rect(center=(self.__width / 2, self.__height / 2 - 400))
                 self.__screen.blit(a_text, a_rect)
 
-                d_text = how_to_play_font.render("B - move right", True, "#d7ffa6")
+                d_text = text_cache.render(how_to_play_font, "B - move right", "#d7ffa6", True)
                 d_rect = d_text.get_rect(center=(self.__width / 2, self.__height / 2 - 300))
                 self.__screen.blit(d_text, d_rect)
 
-                q_text = how_to_play_font.render("Q - shoot red laser", True, "#d7ffa6")
+                q_text = text_cache.render(how_to_play_font, "Q - shoot red laser", "#d7ffa6", True)
                 q_rect = q_text.get_rect(center=(self.__width / 2, self.__height / 2 - 200))
                 self.__screen.blit(q_text, q_rect)
 
-                q_text = how_to_play_font.render("E - shoot blue laser", True, "#d7ffa6")
+                q_text = text_cache.render(how_to_play_font, "E - shoot blue laser", "#d7ffa6", True)
                 q_rect = q_text.get_rect(center=(self.__width / 2, self.__height / 2 - 100))
                 self.__screen.blit(q_text, q_rect)
 
-                q_text = how_to_play_font.render("Space - shoot cannon ball", True, "#d7ffa6")
+                q_text = text_cache.render(how_to_play_font, "Space - shoot cannon ball", "#d7ffa6", True)
                 q_rect = q_text.get_rect(center=(self.__width / 2, self.__height / 2))
                 self.__screen.blit(q_text, q_rect)
 
                 self.__back_button.change_color(menu_mouse_pos)
                 self.__back_button.update(self.__screen)
             else:
-                menu_font = pygame.font.SysFont("arialblack", 140)
-                menu_text = menu_font.render("SPACE WARRIORS", True, "#d7ffa6")
+                menu_font = FontSpec("arialblack", 140, True)
+                menu_text = text_cache.render(menu_font, "SPACE WARRIORS", "#d7ffa6", True)
                 menu_rect = menu_text.get_rect(center=(self.__width / 2, self.__height / 2 - 300))
                 self.__screen.blit(menu_text, menu_rect)
                 for button in [self.__play_button, self.__quit_button, self.__how_to_play_button]:
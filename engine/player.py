@@ -1,4 +1,7 @@
 import pygame
+from engine.assets.asset_cache import asset_cache
+from engine.assets.sound import load_sound
+from engine.simulation.actions import LEFT, RIGHT, CANNON, RED_LASER, BLUE_LASER
 from engine.weapon.cannon.cannon import Cannon
 from engine.weapon.laser.laser import Laser
 
@@ -10,7 +13,7 @@ class Player(pygame.sprite.Sprite):
     Attributes:
         image (pygame.Surface): Surface of the player's image.
         rect (pygame.Rect): Rectangle surrounding the player's image.
-        __screen (pygame.Surface): Surface of the game screen.
+        __previous_position (tuple): Top-left corner of the player before the last update.
         __health (int): Health of the player.
         __score (int): Score of the player.
         __screen_width (int): Width of the game screen.
@@ -25,17 +28,18 @@ class Player(pygame.sprite.Sprite):
         screen_width (int): Width of the game screen.
         screen_height (int): Height of the game screen.
         speed (int): Speed of the player.
-        screen (pygame.Surface): Surface of the game screen.
+        projectiles (PooledProjectiles or BulletEngine, optional): The projectile backend storing the shots.
+        scheduler (Scheduler, optional): Scheduler reloading the weapons. Defaults to polling pygame.time.get_ticks().
     """
-    def __init__(self, player_position, screen_width, screen_height, speed, screen):
+    def __init__(self, player_position, screen_width, screen_height, speed, projectiles=None, scheduler=None):
         """
         Initialize player's attributes, weapons and sounds.
         """
         # Initialization of player
         super().__init__()
-        self.image = pygame.image.load("resources/spaceship1.png").convert_alpha()
+        self.image = asset_cache.load_image("resources/spaceship1.png")
         self.rect = self.image.get_rect(midbottom=player_position)
-        self.__screen = screen
+        self.__previous_position = self.rect.topleft
         self.__health = 100
         self.__score = 0
 
@@ -45,16 +49,17 @@ class Player(pygame.sprite.Sprite):
         self.__speed = speed
 
         # Create weapons objects
-        self.__weapons = [Cannon(3000, screen_height, "Cannon"), Laser(600, screen_height, "Red Laser", (255, 0, 0)),
-                          Laser(600, screen_height, "Blue Laser", (0, 0, 255))]
+        self.__weapons = [Cannon(3000, screen_height, "Cannon", projectiles, scheduler),
+                          Laser(600, screen_height, "Red Laser", (255, 0, 0), projectiles=projectiles,
+                                scheduler=scheduler),
+                          Laser(600, screen_height, "Blue Laser", (0, 0, 255), projectiles=projectiles,
+                                scheduler=scheduler)]
 
         # Laser sound
-        self.__laser_sound = pygame.mixer.Sound("audio/laser.wav")
-        self.__laser_sound.set_volume(0.4)
+        self.__laser_sound = load_sound("audio/laser.wav", 0.4)
 
         # Cannon sound
-        self.__cannon_sound = pygame.mixer.Sound("audio/cannon_shoot.wav")
-        self.__cannon_sound.set_volume(0.6)
+        self.__cannon_sound = load_sound("audio/cannon_shoot.wav", 0.6)
 
     @property
     def health(self):
@@ -66,6 +71,11 @@ class Player(pygame.sprite.Sprite):
         """Set a new value for the player's health."""
         self.__health = new_value
 
+    @property
+    def speed(self):
+        """Get the distance the player moves every update."""
+        return self.__speed
+
     @property
     def weapons(self):
         """Get a list of all the weapons currently equipped by the player."""
@@ -81,31 +91,31 @@ class Player(pygame.sprite.Sprite):
         """Set a new value for the player's score."""
         self.__score = new_value
 
-    def __get_user_input(self):
-        """Handle all the user inputs for player's movement and weapon activation."""
-        keys = pygame.key.get_pressed()
+    def __apply_actions(self, actions):
+        """
+        Handle the actions for player's movement and weapon activation.
 
+        Args:
+            actions (int): The bitmask of actions for this tick, see engine.simulation.actions.
+        """
         # Movement event handler
-        if keys[pygame.K_a] or keys[pygame.K_LEFT]:
+        if actions & LEFT:
             self.rect.x -= self.__speed
-        elif keys[pygame.K_d] or keys[pygame.K_RIGHT]:
+        elif actions & RIGHT:
             self.rect.x += self.__speed
 
         # Cannon event handler
-        if (keys[pygame.K_SPACE]) and self.__weapons[0].is_weapon_available:
+        if actions & CANNON and self.__weapons[0].is_weapon_available:
             self.__cannon_sound.play()
             self.__weapons[0].shoot_weapon((self.rect.centerx, self.rect.centery - 64))
-            self.__weapons[0].is_weapon_available = False
-            self.__weapons[0].time = pygame.time.get_ticks()
-        if (keys[pygame.K_q]) and self.__weapons[1].is_weapon_available:
+            self.__weapons[0].start_cooldown()
+        if actions & RED_LASER and self.__weapons[1].is_weapon_available:
             self.__weapons[1].shoot_weapon((self.rect.centerx - 51.5, self.rect.centery - 32))
-            self.__weapons[1].is_weapon_available = False
-            self.__weapons[1].time = pygame.time.get_ticks()
+            self.__weapons[1].start_cooldown()
             self.__laser_sound.play()
-        if (keys[pygame.K_e]) and self.__weapons[2].is_weapon_available:
+        if actions & BLUE_LASER and self.__weapons[2].is_weapon_available:
             self.__weapons[2].shoot_weapon((self.rect.centerx + 51.5, self.rect.centery - 32))
-            self.__weapons[2].is_weapon_available = False
-            self.__weapons[2].time = pygame.time.get_ticks()
+            self.__weapons[2].start_cooldown()
             self.__laser_sound.play()
 
     def __adjust_player_position(self):
@@ -117,61 +127,32 @@ class Player(pygame.sprite.Sprite):
         if self.rect.right >= self.__screen_width:
             self.rect.right = self.__screen_width
 
-    def __render_health_bar(self, percentage_complete, x, y, width, height, bar_color, empty_bar_color):
-        """
-        Renders the health bar of the player.
-
-        :param percentage_complete: float representing the percentage of health remaining
-        :param x: int x-coordinate of the health bar on the screen
-        :param y: int y-coordinate of the health bar on the screen
-        :param width: int width of the health bar
-        :param height: int height of the health bar
-        :param bar_color: tuple representing RGB values of the filled part of the bar
-        :param empty_bar_color: tuple representing RGB values of the empty part of the bar
-        """
-        # Render health bar
-        filled_width = int(width * percentage_complete)
-        empty_width = width - filled_width
-        filled_bar = pygame.Rect(x, y, filled_width, height)
-        empty_bar = pygame.Rect(x + filled_width, y, empty_width, height)
-        pygame.draw.rect(self.__screen, bar_color, filled_bar)
-        pygame.draw.rect(self.__screen, empty_bar_color, empty_bar)
-
-        # Render health name text
-        font = pygame.font.Font(None, 30)
-        health_name_text = font.render("Health", True, (255, 255, 255))
-        text_rect = health_name_text.get_rect()
-        text_rect.x = x
-        text_rect.y = y - 25
-        self.__screen.blit(health_name_text, text_rect)
-
-    def __display_score(self):
-        """
-        Displays the current score of the player on the screen.
+    def update(self, actions=0):
         """
-        font = pygame.font.Font(None, 30)
-        health_name_text = font.render(f"Score: {self.__score}", True, (255, 255, 255))
-        text_rect = health_name_text.get_rect()
-        text_rect.x = 10
-        text_rect.y = 10
-        self.__screen.blit(health_name_text, text_rect)
-
-    def update(self):
-        """
-        Updates the player's status, including getting user input, adjusting player's position, rendering health bar,
-        displaying score, and refreshing weapons status.
+        Updates the player's status, including applying the actions of this tick, adjusting player's position and
+        refreshing weapons status. The player's status is displayed by the Hud, separately from the simulation.
+
+        Args:
+            actions (int, optional): The bitmask of actions for this tick. Defaults to no action.
         """
         # Refresh player status
-        self.__get_user_input()
+        self.__previous_position = self.rect.topleft
+        self.__apply_actions(actions)
         self.__adjust_player_position()
-        self.__render_health_bar(self.__health / 100, 10, self.__screen_height - 30, 100, 20, (255, 0, 100),
-                                 (255, 255, 255))
-        self.__display_score()
 
         # Refresh weapons status
-        self.__weapons[0].refresh_weapon(self.__screen, 120, self.__screen_height - 30, (169, 169, 169),
-                                         (255, 255, 255))
-        self.__weapons[1].refresh_weapon(self.__screen, self.__screen_width - 220, self.__screen_height - 30,
-                                         (255, 0, 0), (255, 255, 255))
-        self.__weapons[2].refresh_weapon(self.__screen, self.__screen_width - 110, self.__screen_height - 30,
-                                         (0, 0, 255), (255, 255, 255))
+        for weapon in self.__weapons:
+            weapon.refresh_weapon()
+
+    def get_interpolated_rect(self, alpha):
+        """
+        Get the rect of the player between the last two updates.
+
+        Args:
+            alpha (float): How far the rect is between the previous update (0) and the last one (1).
+
+        Returns:
+            pygame.Rect: The interpolated rect.
+        """
+        return self.rect.move(round((self.__previous_position[0] - self.rect.x) * (1 - alpha)),
+                              round((self.__previous_position[1] - self.rect.y) * (1 - alpha)))
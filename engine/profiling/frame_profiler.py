@@ -0,0 +1,191 @@
+import time
+from array import array
+from collections import namedtuple
+
+from engine.profiling.tracer import tracer
+
+PhaseStats = namedtuple("PhaseStats", ["phase", "current", "p50", "p95", "p99"])
+"""
+The frame times of one phase in milliseconds: its time in the last finished frame and the 50th, 95th and 99th
+percentile over the frames kept by the profiler.
+"""
+
+
+class FrameProfiler:
+    """
+    Records how long every phase of a frame takes, e.g. the event pump, the simulation of the player or the push of
+    the frame to the display, over the last frames.
+
+    A frame is timed by laps: lap(phase) adds the time since the previous lap, or since begin_frame(), to the phase.
+    A phase may be lapped several times a frame, e.g. once per simulation tick, and its laps add up. Time not lapped
+    to any phase is reported as "other", and "frame" is the whole frame. Every frame costs one clock read per lap and
+    writes its times into fixed-size ring buffers, one per phase, so recording allocates nothing; the percentiles are
+    only computed when asked for. While the tracer is enabled, every lap and frame is also traced as a span.
+
+    Attributes:
+        __phases (tuple of str): The names of the lapped phases.
+        __indices (dict): The index of every phase by name.
+        __capacity (int): The number of frames kept.
+        __samples (list of array): The times of every phase, then of "other" and "frame", in the last frames.
+        __current (list of float): The times of the phases in the current frame, in seconds.
+        __frame_start (float): The time the current frame began, or None outside of a frame.
+        __last_lap (float): The time of the last lap of the current frame.
+        __position (int): The index of the ring buffers the next frame is written to.
+        __frame_count (int): The number of frames recorded.
+
+    Methods:
+        begin_frame(): Starts timing a frame.
+        lap(phase): Adds the time since the last lap to a phase.
+        skip(): Leaves the time since the last lap to "other".
+        end_frame(): Finishes the frame and records its times.
+        discard_frame(): Drops the frame being timed without recording it.
+        stats(phase): Returns the current time and the percentiles of a phase.
+        reset(): Drops all recorded frames.
+    """
+    OTHER = "other"
+    FRAME = "frame"
+
+    def __init__(self, phases, capacity=600):
+        """
+        Initializes a profiler without recorded frames.
+
+        Parameters:
+        phases (iterable of str): The names of the phases, in the order they are reported.
+        capacity (int, optional): The number of frames kept for the percentiles. Defaults to 600, ten seconds at
+        60 frames per second.
+        """
+        self.__phases = tuple(phases)
+        if len(set(self.__phases)) != len(self.__phases) or {self.OTHER, self.FRAME} & set(self.__phases):
+            raise ValueError(f"Invalid phases: {self.__phases}")
+        if capacity < 1:
+            raise ValueError(f"Invalid capacity: {capacity}")
+        self.__indices = {phase: index for index, phase in enumerate(self.__phases)}
+        self.__capacity = capacity
+        self.__samples = [array("d", bytes(8 * capacity)) for _ in range(len(self.__phases) + 2)]
+        self.__current = [0.0] * len(self.__phases)
+        self.__frame_start = None
+        self.__last_lap = 0.0
+        self.__position = 0
+        self.__frame_count = 0
+
+    @property
+    def phases(self):
+        """Get the names of the lapped phases."""
+        return self.__phases
+
+    @property
+    def report_phases(self):
+        """Get the names of all reported phases: the lapped ones, "other" and "frame"."""
+        return self.__phases + (self.OTHER, self.FRAME)
+
+    @property
+    def capacity(self):
+        """Get the number of frames kept for the percentiles."""
+        return self.__capacity
+
+    @property
+    def frame_count(self):
+        """Get the number of frames recorded since the profiler was created or reset."""
+        return self.__frame_count
+
+    def begin_frame(self):
+        """
+        Starts timing a frame.
+        """
+        self.__frame_start = self.__last_lap = time.perf_counter()
+
+    def lap(self, phase):
+        """
+        Adds the time since the last lap, or since the frame began, to a phase. Laps outside of a frame are ignored.
+
+        Parameters:
+        phase (str): The name of the phase.
+        """
+        if self.__frame_start is None:
+            return
+        now = time.perf_counter()
+        self.__current[self.__indices[phase]] += now - self.__last_lap
+        if tracer.is_enabled:
+            tracer.complete(phase, "frame", self.__last_lap, now - self.__last_lap)
+        self.__last_lap = now
+
+    def skip(self):
+        """
+        Leaves the time since the last lap to "other", e.g. when the work before it belongs to no phase.
+        """
+        self.__last_lap = time.perf_counter()
+
+    def end_frame(self):
+        """
+        Finishes the frame and writes the times of its phases into the ring buffers, overwriting the oldest frame
+        once the buffers are full.
+        """
+        if self.__frame_start is None:
+            return
+        frame_time = time.perf_counter() - self.__frame_start
+        if tracer.is_enabled:
+            tracer.complete(self.FRAME, "frame", self.__frame_start, frame_time, {"frame": self.__frame_count})
+        position = self.__position
+        current = self.__current
+        lapped = 0.0
+        for index, seconds in enumerate(current):
+            self.__samples[index][position] = seconds * 1000
+            lapped += seconds
+            current[index] = 0.0
+        self.__samples[-2][position] = max(frame_time - lapped, 0.0) * 1000
+        self.__samples[-1][position] = frame_time * 1000
+        self.__position = (position + 1) % self.__capacity
+        self.__frame_count += 1
+        self.__frame_start = None
+
+    def discard_frame(self):
+        """
+        Drops the frame being timed without recording it, e.g. a frame spent waiting in a menu. Laps until the next
+        begin_frame() are ignored.
+        """
+        for index in range(len(self.__current)):
+            self.__current[index] = 0.0
+        self.__frame_start = None
+
+    def stats(self, phase):
+        """
+        Returns the time of a phase in the last finished frame and its percentiles over the recorded frames.
+
+        Parameters:
+        phase (str): The name of the phase, "other" or "frame".
+
+        Returns:
+        PhaseStats: The times in milliseconds, all 0 before the first frame.
+        """
+        if phase == self.OTHER:
+            samples = self.__samples[-2]
+        elif phase == self.FRAME:
+            samples = self.__samples[-1]
+        else:
+            samples = self.__samples[self.__indices[phase]]
+        count = min(self.__frame_count, self.__capacity)
+        if not count:
+            return PhaseStats(phase, 0.0, 0.0, 0.0, 0.0)
+        current = samples[self.__position - 1]
+        ordered = sorted(samples[:count]) if count < self.__capacity else sorted(samples)
+        return PhaseStats(phase, current, self.__percentile(ordered, 50), self.__percentile(ordered, 95),
+                          self.__percentile(ordered, 99))
+
+    def reset(self):
+        """
+        Drops all recorded frames and the frame being timed.
+        """
+        for samples in self.__samples:
+            samples[:] = array("d", bytes(8 * self.__capacity))
+        self.__current = [0.0] * len(self.__phases)
+        self.__frame_start = None
+        self.__position = 0
+        self.__frame_count = 0
+
+    @staticmethod
+    def __percentile(ordered, percent):
+        """
+        A helper method returning the nearest-rank percentile of sorted times.
+        """
+        rank = max(-(-len(ordered) * percent // 100), 1)
+        return ordered[rank - 1]
@@ -0,0 +1,299 @@
+"""
+Memory accounting: live counts and estimated sizes of the sprites, groups, surfaces and sounds of the process,
+recorded at every level start together with what tracemalloc saw allocated since the previous one.
+
+Playing many games back to back should leave the memory flat once the caches are warm. A kind of object, a line of
+code allocating memory, or the traced memory as a whole, that grows from every level start to the next is flagged as
+growing without bound:
+
+    python main.py --headless --games 30 --memory
+"""
+import gc
+import sys
+import tracemalloc
+from collections import namedtuple
+
+import pygame
+
+from engine.assets.sound import sound_byte_size
+
+ObjectStats = namedtuple("ObjectStats", ["count", "bytes"])
+MemoryRecord = namedtuple("MemoryRecord", ["label", "objects", "traced_bytes", "top_allocations"])
+"""
+The memory of the process at one level start: the ObjectStats of every kind of object, the bytes traced by
+tracemalloc outside of the tracker (None when not tracing) and the (line, bytes) pairs that allocated the most since
+the previous record.
+"""
+
+
+def object_kind(obj):
+    """
+    Returns the kind an object is counted as, or None for objects not accounted for.
+
+    Parameters:
+    obj (object): The object.
+
+    Returns:
+    str: "Surface", "Surface view", "Sound", "Sprite <class>" or "Group <class>", or None.
+    """
+    if isinstance(obj, pygame.Surface):
+        return "Surface" if obj.get_parent() is None else "Surface view"
+    if isinstance(obj, pygame.mixer.Sound):
+        return "Sound"
+    if isinstance(obj, pygame.sprite.Sprite):
+        return f"Sprite {type(obj).__name__}"
+    if isinstance(obj, pygame.sprite.AbstractGroup):
+        return f"Group {type(obj).__name__}"
+    return None
+
+
+def estimate_bytes(obj, kind):
+    """
+    Estimates the memory an accounted object takes: the pixels of a surface, the decoded samples of a sound, or the
+    object and its attributes for sprites and groups. Views share the pixels of their parent surface and count as 0.
+
+    Parameters:
+    obj (object): The object.
+    kind (str): The kind of the object, as returned by object_kind().
+
+    Returns:
+    int: The estimated number of bytes.
+    """
+    if kind == "Surface":
+        return obj.get_width() * obj.get_height() * obj.get_bytesize()
+    if kind == "Surface view":
+        return 0
+    if kind == "Sound":
+        return sound_byte_size(obj)
+    size = sys.getsizeof(obj) + sys.getsizeof(vars(obj))
+    if kind.startswith("Group"):
+        size += sys.getsizeof(obj.spritedict)
+    return size
+
+
+def count_live_objects():
+    """
+    Counts the live sprites, groups, surfaces and sounds of the process by kind. Surfaces and sounds are not tracked
+    by the garbage collector, so they are found through the objects and containers that refer to them. Walks every
+    object of the process, which takes a while; meant for instrumentation, not for every frame.
+
+    Returns:
+    dict: The ObjectStats of every kind, sorted by kind.
+    """
+    counts = {}
+    seen = set()
+
+    def account(obj):
+        kind = object_kind(obj)
+        if kind is None or id(obj) in seen:
+            return
+        seen.add(id(obj))
+        count, size = counts.get(kind, (0, 0))
+        counts[kind] = (count + 1, size + estimate_bytes(obj, kind))
+
+    for obj in gc.get_objects():
+        account(obj)
+        referents = gc.get_referents(obj)
+        while referents:
+            referent = referents.pop()
+            if isinstance(referent, (pygame.Surface, pygame.mixer.Sound)):
+                account(referent)
+            elif isinstance(referent, (dict, list, tuple)) and not gc.is_tracked(referent):
+                # Containers holding only untracked objects, e.g. a dict of sounds, are untracked themselves
+                referents.extend(gc.get_referents(referent))
+    return {kind: ObjectStats(*counts[kind]) for kind in sorted(counts)}
+
+
+class MemoryTracker:
+    """
+    Records the memory of the process at every level start and flags what grows without bound.
+
+    A kind of object whose count or bytes grew at every one of the last growth_records records, a line of code whose
+    traced allocations grew by at least min_line_growth bytes at every one of them, or a total of traced bytes that
+    rose by at least min_traced_growth bytes at every one of them, is growing without bound: a game started after it
+    leaves more behind than the one before. The total catches slow leaks spread over lines growing by less than
+    min_line_growth bytes each. Caches filling up during the first games are not flagged once they stop growing, and
+    neither are small, expected accumulations such as the results of the games.
+
+    Allocations made while the tracker runs, e.g. its records and labels, are left out of the traced bytes and the
+    lines, so the tracker does not report its own bookkeeping.
+
+    Attributes:
+        __growth_records (int): The number of consecutive growing records that flag a kind, a line or the total.
+        __min_line_growth (int): The number of bytes a line has to grow by per record to count as growing.
+        __min_traced_growth (int): The number of bytes the total has to rise by per record to count as growing.
+        __top_count (int): The number of lines kept per record as its top allocations.
+        __records (list of MemoryRecord): The records, oldest first.
+        __snapshot (tracemalloc.Snapshot): The allocations traced at the previous record, or None.
+        __object_streaks (dict): The number of consecutive records every kind of object grew in.
+        __line_streaks (dict): The number of consecutive records the allocations of every line grew in.
+        __traced_streak (int): The number of consecutive records the total of traced bytes rose in.
+        __is_tracing (bool): Whether the tracker started tracemalloc.
+
+    Methods:
+        record(label): Records the memory of the process.
+        record_level_start(level_name): Records the memory of the process at the start of a level.
+        growing(): Returns what grew at every one of the last growth_records records.
+        stop(): Stops tracemalloc if the tracker started it.
+    """
+    TRACEBACK_FRAMES = 4
+
+    def __init__(self, trace_allocations=True, growth_records=3, min_line_growth=256, min_traced_growth=512,
+                 top_count=5):
+        """
+        Initializes a tracker without records.
+
+        Parameters:
+        trace_allocations (bool, optional): Whether allocations are traced with tracemalloc, which slows the game
+        down. Defaults to True.
+        growth_records (int, optional): The number of consecutive growing records that flag a kind, a line or the
+        total. Defaults to 3.
+        min_line_growth (int, optional): The number of bytes a line has to grow by per record to count as growing.
+        Defaults to 256.
+        min_traced_growth (int, optional): The number of bytes the total of traced bytes has to rise by per record to
+        count as growing. Defaults to 512.
+        top_count (int, optional): The number of lines kept per record as its top allocations. Defaults to 5.
+        """
+        self.__growth_records = growth_records
+        self.__min_line_growth = min_line_growth
+        self.__min_traced_growth = min_traced_growth
+        self.__top_count = top_count
+        self.__records = []
+        self.__snapshot = None
+        self.__object_streaks = {}
+        self.__line_streaks = {}
+        self.__traced_streak = 0
+        self.__is_tracing = trace_allocations and not tracemalloc.is_tracing()
+        if self.__is_tracing:
+            # Enough frames to tell the tracker's own allocations, e.g. its namedtuples built in "<string>", apart
+            tracemalloc.start(self.TRACEBACK_FRAMES)
+
+    @property
+    def records(self):
+        """Get the records, oldest first."""
+        return self.__records
+
+    def record(self, label):
+        """
+        Records the memory of the process: the live objects by kind and, when tracing, the allocations since the
+        previous record.
+
+        Parameters:
+        label (str): The name of the record, e.g. the level that started.
+
+        Returns:
+        MemoryRecord: The record.
+        """
+        gc.collect()
+        objects = count_live_objects()
+        previous = self.__records[-1].objects if self.__records else None
+        if previous is not None:
+            for kind in set(objects) | set(previous):
+                stats = objects.get(kind, ObjectStats(0, 0))
+                previous_stats = previous.get(kind, ObjectStats(0, 0))
+                is_growing = stats.count > previous_stats.count or stats.bytes > previous_stats.bytes
+                self.__object_streaks[kind] = self.__object_streaks.get(kind, 0) + 1 if is_growing else 0
+
+        traced_bytes = None
+        top_allocations = []
+        if tracemalloc.is_tracing():
+            # Leave out the snapshots and everything allocated from within the tracker, e.g. its records
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__, all_frames=True),
+                tracemalloc.Filter(False, __file__, all_frames=True)])
+            traced_bytes = sum(trace.size for trace in snapshot.traces)
+            if self.__records and self.__records[-1].traced_bytes is not None:
+                is_growing = traced_bytes - self.__records[-1].traced_bytes >= self.__min_traced_growth
+                self.__traced_streak = self.__traced_streak + 1 if is_growing else 0
+            if self.__snapshot is not None:
+                differences = snapshot.compare_to(self.__snapshot, "lineno")
+                grown = set()
+                for difference in differences:
+                    if difference.size_diff >= self.__min_line_growth:
+                        line = str(difference.traceback[0])
+                        grown.add(line)
+                        self.__line_streaks[line] = self.__line_streaks.get(line, 0) + 1
+                for line in set(self.__line_streaks) - grown:
+                    del self.__line_streaks[line]
+                top_allocations = [(str(difference.traceback[0]), difference.size_diff)
+                                   for difference in differences[:self.__top_count] if difference.size_diff > 0]
+            self.__snapshot = snapshot
+
+        memory_record = MemoryRecord(label, objects, traced_bytes, top_allocations)
+        self.__records.append(memory_record)
+        return memory_record
+
+    def record_level_start(self, level_name):
+        """
+        Records the memory of the process at the start of a level, labelled with the number of the record and the
+        name of the level. The label is built by the tracker, so it is left out of the traced allocations.
+
+        Parameters:
+        level_name (str): The name of the level that started.
+
+        Returns:
+        MemoryRecord: The record.
+        """
+        return self.record(f"start {len(self.__records) + 1}: {level_name}")
+
+    def growing(self):
+        """
+        Returns what grew at every one of the last growth_records records.
+
+        Returns:
+        tuple: The kinds of objects and the lines of code growing without bound, each as a sorted list, and whether
+        the total of traced bytes grew without bound.
+        """
+        kinds = sorted(kind for kind, streak in self.__object_streaks.items() if streak >= self.__growth_records)
+        lines = sorted(line for line, streak in self.__line_streaks.items() if streak >= self.__growth_records)
+        return kinds, lines, self.__traced_streak >= self.__growth_records
+
+    def stop(self):
+        """
+        Stops tracemalloc if the tracker started it. The records are kept.
+        """
+        if self.__is_tracing:
+            tracemalloc.stop()
+            self.__is_tracing = False
+        self.__snapshot = None
+
+
+def format_memory_report(tracker):
+    """
+    Formats the records of a tracker: the objects of the last record by kind, the totals of every record with the
+    lines that allocated the most since the previous one, and what grows without bound.
+
+    Parameters:
+    tracker (MemoryTracker): The tracker.
+
+    Returns:
+    str: The formatted report.
+    """
+    records = tracker.records
+    if not records:
+        return "no memory records"
+    last = records[-1]
+    lines = [f"live objects at {last.label}:", f"  {'kind':<32}{'count':>8}{'KiB':>12}"]
+    for kind, stats in last.objects.items():
+        lines.append(f"  {kind:<32}{stats.count:>8}{stats.bytes / 1024:>12.1f}")
+
+    lines.append("")
+    lines.append(f"  {'record':<40}{'objects':>8}{'object KiB':>12}{'traced KiB':>12}")
+    for record in records:
+        count = sum(stats.count for stats in record.objects.values())
+        size = sum(stats.bytes for stats in record.objects.values())
+        traced = f"{record.traced_bytes / 1024:.1f}" if record.traced_bytes is not None else "-"
+        lines.append(f"  {record.label:<40}{count:>8}{size / 1024:>12.1f}{traced:>12}")
+        lines.extend(f"      +{size_diff / 1024:.1f} KiB {line}" for line, size_diff in record.top_allocations)
+
+    kinds, growing_lines, is_traced_growing = tracker.growing()
+    lines.append("")
+    if not kinds and not growing_lines and not is_traced_growing:
+        lines.append(f"nothing grew without bound over {len(records)} records")
+    if is_traced_growing:
+        traced = [record.traced_bytes for record in records if record.traced_bytes is not None]
+        lines.append(f"GROWING traced memory: {traced[0] / 1024:.1f} KiB to {traced[-1] / 1024:.1f} KiB over "
+                     f"{len(traced)} records")
+    lines.extend(f"GROWING {kind}" for kind in kinds)
+    lines.extend(f"GROWING allocations at {line}" for line in growing_lines)
+    return "\n".join(lines)
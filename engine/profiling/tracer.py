@@ -0,0 +1,211 @@
+"""
+An opt-in tracer writing timelines in the Chrome trace event format, which chrome://tracing, Perfetto
+(https://ui.perfetto.dev) and other trace viewers open.
+
+The game records spans of the phases of every frame, the sub-passes of the collision checks, asset loads and level
+initialization, and instant events for every sound played. The events are buffered in memory and written in bulk by
+flush(), e.g. when the game quits or F4 is pressed:
+
+    python main.py --trace trace.json
+
+A disabled tracer records nothing, and every call returns after checking a single flag.
+"""
+import json
+import os
+import time
+from collections import deque
+
+
+class Tracer:
+    """
+    Buffers trace events and appends them to a file in the JSON array format of Chrome traces.
+
+    Every flush() appends the events buffered since the previous one, so a trace file grows over the whole run
+    instead of being rewritten. The array is never closed, which the format allows, so the file can be opened at any
+    time, even while the game still runs. The buffer holds at most max_events events; when more are recorded
+    between two flushes, the oldest are dropped and counted.
+
+    Timestamps are microseconds since the tracer was enabled, taken from time.perf_counter().
+
+    Attributes:
+        __path (str): The file the events are flushed to, or None while disabled.
+        __origin (float): The time the tracer was enabled, in seconds.
+        __events (deque): The events buffered since the last flush.
+        __recorded_count (int): The number of events recorded since the tracer was enabled.
+        __is_file_started (bool): Whether the file was created and opened with the header of the array.
+        is_enabled (bool): Whether events are recorded. A plain attribute, so checking it costs one lookup.
+
+    Methods:
+        enable(path): Starts recording events for a file.
+        disable(): Flushes the buffered events and stops recording.
+        begin(name, category, args): Records the beginning of a span.
+        end(name, category, args): Records the end of the span begun last.
+        complete(name, category, start, duration, args): Records a span timed by the caller.
+        instant(name, category, args): Records an event without duration.
+        flush(): Appends the buffered events to the file.
+    """
+    def __init__(self, max_events=1000000):
+        """
+        Initializes a disabled tracer.
+
+        Parameters:
+        max_events (int, optional): The maximum number of events buffered between two flushes. Defaults to 1000000.
+        """
+        self.__path = None
+        self.__origin = 0.0
+        self.__events = deque(maxlen=max_events)
+        self.__recorded_count = 0
+        self.__is_file_started = False
+        self.is_enabled = False
+
+    @property
+    def path(self):
+        """Get the file the events are flushed to, or None while disabled."""
+        return self.__path
+
+    @property
+    def buffered_count(self):
+        """Get the number of events waiting for the next flush."""
+        return len(self.__events)
+
+    @property
+    def dropped_count(self):
+        """Get the number of events dropped because the buffer was full, reset by every flush."""
+        return max(self.__recorded_count - len(self.__events), 0)
+
+    def enable(self, path):
+        """
+        Starts recording events for a file. The file is replaced on the first flush.
+
+        Parameters:
+        path (str): The file the events are flushed to.
+        """
+        if self.is_enabled:
+            self.disable()
+        self.__path = path
+        self.__origin = time.perf_counter()
+        self.__events.clear()
+        self.__recorded_count = 0
+        self.__is_file_started = False
+        self.is_enabled = True
+        self.__metadata("process_name", {"name": "Space Warriors"})
+        self.__metadata("thread_name", {"name": "game loop"})
+
+    def disable(self):
+        """
+        Flushes the buffered events and stops recording.
+        """
+        if not self.is_enabled:
+            return
+        self.flush()
+        self.is_enabled = False
+        self.__path = None
+
+    def begin(self, name, category, args=None):
+        """
+        Records the beginning of a span. Spans begun later must end first.
+
+        Parameters:
+        name (str): The name of the span, e.g. "load image".
+        category (str): The category of the span, e.g. "assets".
+        args (dict, optional): Values shown with the span, e.g. the path of the image. Defaults to None.
+        """
+        if self.is_enabled:
+            self.__record("B", name, category, time.perf_counter(), None, args)
+
+    def end(self, name, category, args=None):
+        """
+        Records the end of the span begun last.
+
+        Parameters:
+        name (str): The name of the span.
+        category (str): The category of the span.
+        args (dict, optional): Values shown with the span, merged with the ones given to begin(). Defaults to None.
+        """
+        if self.is_enabled:
+            self.__record("E", name, category, time.perf_counter(), None, args)
+
+    def complete(self, name, category, start, duration, args=None):
+        """
+        Records a span timed by the caller, e.g. a phase already timed by a FrameProfiler.
+
+        Parameters:
+        name (str): The name of the span.
+        category (str): The category of the span.
+        start (float): The time the span began, from time.perf_counter().
+        duration (float): The duration of the span in seconds.
+        args (dict, optional): Values shown with the span. Defaults to None.
+        """
+        if self.is_enabled:
+            self.__record("X", name, category, start, duration, args)
+
+    def instant(self, name, category, args=None):
+        """
+        Records an event without duration, e.g. a sound being played.
+
+        Parameters:
+        name (str): The name of the event.
+        category (str): The category of the event.
+        args (dict, optional): Values shown with the event. Defaults to None.
+        """
+        if self.is_enabled:
+            self.__record("i", name, category, time.perf_counter(), None, args)
+
+    def flush(self):
+        """
+        Appends the buffered events to the file and empties the buffer. The first flush after enable() replaces the
+        file. When events were dropped, an instant event reports how many.
+
+        Returns:
+        int: The number of events written.
+        """
+        if self.__path is None:
+            return 0
+        dropped = self.dropped_count
+        if dropped:
+            self.__record("i", "dropped events", "tracer", time.perf_counter(), None, {"count": dropped})
+        events = list(self.__events)
+        self.__events.clear()
+        self.__recorded_count = 0
+
+        mode = "a" if self.__is_file_started else "w"
+        directory = os.path.dirname(self.__path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.__path, mode) as file:
+            if not self.__is_file_started:
+                file.write("[\n")
+                self.__is_file_started = True
+            file.writelines(json.dumps(self.__format(event), separators=(",", ":")) + ",\n" for event in events)
+        return len(events)
+
+    def __record(self, phase, name, category, timestamp, duration, args):
+        """
+        A helper method appending an event to the buffer. The event is only formatted when it is flushed.
+        """
+        self.__events.append((phase, name, category, timestamp, duration, args))
+        self.__recorded_count += 1
+
+    def __metadata(self, name, args):
+        """
+        A helper method recording a metadata event, e.g. the name of the process shown by the viewer.
+        """
+        self.__record("M", name, "__metadata", self.__origin, None, args)
+
+    def __format(self, event):
+        """
+        A helper method converting a buffered event to the trace event format.
+        """
+        phase, name, category, timestamp, duration, args = event
+        formatted = {"name": name, "cat": category, "ph": phase, "ts": round((timestamp - self.__origin) * 1e6, 3),
+                     "pid": 1, "tid": 1}
+        if duration is not None:
+            formatted["dur"] = round(duration * 1e6, 3)
+        if phase == "i":
+            formatted["s"] = "t"
+        if args:
+            formatted["args"] = args
+        return formatted
+
+
+tracer = Tracer()
@@ -0,0 +1,259 @@
+import pygame
+
+
+class Renderer:
+    """
+    The Renderer class draws on the game screen and pushes the frames to the display.
+
+    It works in one of two modes:
+    - "full": the whole screen is cleared and pushed to the display every frame.
+    - "dirty": only the rects drawn in the previous frame are cleared, and only the rects changed in the previous and
+      the current frame are pushed to the display.
+
+    Every draw call made through the renderer records the rect it touched, so the dirty mode knows what to clear and
+    update. The mode can be switched at any time; the next frame is then redrawn in full.
+
+    Static layers, e.g. the bunkers or the HUD widgets, are drawn with draw_static() every frame but stay on the screen
+    in the dirty mode: they are only redrawn when they changed, when the area cleared for the frame or something drawn
+    before them in the frame overlaps them, or in a full redraw. The area of a changed layer, or of one no longer
+    drawn, is cleared and the draws of the frame overlapping it are repeated, so the screen looks as if it was
+    redrawn in full. Surfaces and positions handed to the renderer must therefore not change until the frame ends.
+
+    Attributes:
+        __screen (pygame.Surface): The surface of the game screen.
+        __background_color (tuple): The color used to clear the screen.
+        __mode (str): The current rendering mode, "full" or "dirty".
+        __previous_rects (list): The rects drawn in the previous frame.
+        __current_rects (list): The rects drawn in the current frame.
+        __cleared_rects (list): The rects cleared for the current frame.
+        __static_rects (list): The rects of the static layers redrawn in the current frame.
+        __retained (dict): The rects of the static layers on the screen, keyed by their position and size.
+        __drawn_statics (dict): The rects of the static layers drawn in the current frame, keyed the same way.
+        __frame_draws (list): The (changed rect, source or color, destination) of every draw of the current frame in
+        the dirty mode, repeated when an area is redrawn.
+        __is_full_redraw (bool): Whether the next frame has to be redrawn and pushed in full.
+
+    Methods:
+        begin_frame(): Clears the screen, either in full or only where the previous frame drew.
+        end_frame(): Pushes the changed parts of the screen to the display.
+        invalidate(): Forces the next frame to be redrawn in full.
+        blit(source, dest): Draws a surface on the screen.
+        blits(blit_sequence): Draws many surfaces on the screen in one call.
+        draw_rect(color, rect): Draws a filled rect on the screen.
+        draw_group(group): Draws all sprites of a group on the screen.
+        draw_static(source, dest, is_changed): Draws a static layer on the screen if it has to be redrawn.
+    """
+    FULL = "full"
+    DIRTY = "dirty"
+    MODES = (FULL, DIRTY)
+
+    def __init__(self, screen, background_color=(30, 30, 30), mode=FULL):
+        """
+        Initializes the renderer.
+
+        Args:
+            screen (pygame.Surface): The surface of the game screen.
+            background_color (tuple, optional): The color used to clear the screen. Defaults to (30, 30, 30).
+            mode (str, optional): The rendering mode, "full" or "dirty". Defaults to "full".
+        """
+        self.__screen = screen
+        self.__background_color = background_color
+        self.__mode = self.FULL
+        self.__previous_rects = []
+        self.__current_rects = []
+        self.__cleared_rects = []
+        self.__static_rects = []
+        self.__retained = {}
+        self.__drawn_statics = {}
+        self.__frame_draws = []
+        self.__is_full_redraw = True
+        self.mode = mode
+
+    @property
+    def surface(self):
+        """Get the surface of the game screen."""
+        return self.__screen
+
+    @property
+    def mode(self):
+        """Get the current rendering mode."""
+        return self.__mode
+
+    @mode.setter
+    def mode(self, new_mode):
+        """
+        Set the rendering mode. The next frame is redrawn in full.
+
+        Args:
+            new_mode (str): The new rendering mode, "full" or "dirty".
+        """
+        if new_mode not in self.MODES:
+            raise ValueError(f"Unknown render mode: {new_mode}")
+        self.__mode = new_mode
+        self.invalidate()
+
+    @property
+    def dirty_rect_count(self):
+        """Get the number of rects drawn in the current frame."""
+        return len(self.__current_rects) + len(self.__static_rects)
+
+    def toggle_mode(self):
+        """
+        Switches between the full and the dirty rendering mode.
+        """
+        self.mode = self.DIRTY if self.__mode == self.FULL else self.FULL
+
+    def invalidate(self):
+        """
+        Forces the next frame to be cleared and pushed to the display in full, e.g. after something else drew on
+        the screen.
+        """
+        self.__is_full_redraw = True
+
+    def begin_frame(self):
+        """
+        Clears the screen before drawing a new frame.
+        """
+        if self.__mode == self.FULL or self.__is_full_redraw:
+            self.__screen.fill(self.__background_color)
+            self.__cleared_rects = []
+        else:
+            self.__cleared_rects = self.__previous_rects
+            for rect in self.__cleared_rects:
+                self.__screen.fill(self.__background_color, rect)
+        self.__current_rects = []
+        self.__static_rects = []
+        self.__drawn_statics = {}
+        self.__frame_draws = []
+
+    def end_frame(self):
+        """
+        Pushes the frame to the display. In the dirty mode only the rects drawn in this and the previous frame
+        are updated, after the static layers no longer drawn were cleared.
+        """
+        if self.__mode == self.FULL or self.__is_full_redraw:
+            pygame.display.update()
+            self.__is_full_redraw = False
+        else:
+            for key, rect in self.__retained.items():
+                if key not in self.__drawn_statics:
+                    self.__redraw_area(rect)
+                    self.__static_rects.append(rect)
+            pygame.display.update(self.__cleared_rects + self.__current_rects + self.__static_rects)
+        self.__previous_rects = self.__current_rects
+        self.__retained = self.__drawn_statics
+        self.__frame_draws = []
+
+    def blit(self, source, dest):
+        """
+        Draws a surface on the screen.
+
+        Args:
+            source (pygame.Surface): The surface to draw.
+            dest (pygame.Rect or tuple): The position to draw the surface at.
+
+        Returns:
+            pygame.Rect: The area of the screen that was changed.
+        """
+        rect = self.__screen.blit(source, dest)
+        self.__current_rects.append(rect)
+        if self.__is_logging_draws():
+            self.__frame_draws.append((rect, source, dest))
+        return rect
+
+    def blits(self, blit_sequence):
+        """
+        Draws many surfaces on the screen in one call.
+
+        Args:
+            blit_sequence (iterable): (source, dest) pairs to draw.
+
+        Returns:
+            list: The areas of the screen that were changed.
+        """
+        if self.__is_logging_draws():
+            blit_sequence = list(blit_sequence)
+            rects = self.__screen.blits(blit_sequence)
+            self.__frame_draws.extend((rect, source, dest) for rect, (source, dest) in zip(rects, blit_sequence))
+        else:
+            rects = self.__screen.blits(blit_sequence)
+        self.__current_rects.extend(rects)
+        return rects
+
+    def draw_rect(self, color, rect):
+        """
+        Draws a filled rect on the screen.
+
+        Args:
+            color (tuple): The color of the rect.
+            rect (pygame.Rect): The rect to draw.
+
+        Returns:
+            pygame.Rect: The area of the screen that was changed.
+        """
+        changed_rect = pygame.draw.rect(self.__screen, color, rect)
+        self.__current_rects.append(changed_rect)
+        if self.__is_logging_draws():
+            self.__frame_draws.append((changed_rect, color, rect))
+        return changed_rect
+
+    def draw_group(self, group):
+        """
+        Draws all sprites of a group on the screen.
+
+        Args:
+            group (pygame.sprite.AbstractGroup): The group to draw.
+
+        Returns:
+            list: The areas of the screen that were changed.
+        """
+        return self.blits([(sprite.image, sprite.rect) for sprite in group])
+
+    def draw_static(self, source, dest, is_changed=True):
+        """
+        Draws a static layer, e.g. a bunker or a HUD widget, which has to be drawn every frame. In the dirty mode it
+        is only redrawn if it changed or is new, if the area cleared for the frame or anything drawn before it in the
+        frame overlaps it, or if the frame is redrawn in full. A changed layer is drawn on a cleared area, redrawn
+        with what the frame drew on it before, so parts it lost, e.g. destroyed blocks, disappear.
+
+        Args:
+            source (pygame.Surface): The surface of the layer.
+            dest (pygame.Rect or tuple): The position to draw the layer at.
+            is_changed (bool, optional): Whether the layer changed since it was last drawn. Defaults to True.
+
+        Returns:
+            pygame.Rect: The area of the screen that was changed, or None if the layer was left as it is.
+        """
+        rect = source.get_rect(topleft=dest[:2] if isinstance(dest, tuple) else dest.topleft)
+        key = (rect.x, rect.y, rect.width, rect.height)
+        self.__drawn_statics[key] = rect
+        if self.__mode == self.DIRTY and not self.__is_full_redraw:
+            if (not is_changed and key in self.__retained and rect.collidelist(self.__cleared_rects) == -1
+                    and rect.collidelist(self.__current_rects) == -1):
+                return None
+            if is_changed or key not in self.__retained:
+                self.__redraw_area(rect)
+            self.__frame_draws.append((rect, source, rect))
+        changed_rect = self.__screen.blit(source, rect)
+        self.__static_rects.append(changed_rect)
+        return changed_rect
+
+    def __is_logging_draws(self):
+        """
+        A helper method checking whether the draws of the frame are logged, which only the dirty mode needs.
+        """
+        return self.__mode == self.DIRTY and not self.__is_full_redraw
+
+    def __redraw_area(self, rect):
+        """
+        A helper method clearing an area of the screen and repeating the draws of the frame that overlap it.
+        """
+        self.__screen.set_clip(rect)
+        self.__screen.fill(self.__background_color, rect)
+        for drawn_rect, source, dest in self.__frame_draws:
+            if drawn_rect.colliderect(rect):
+                if isinstance(source, pygame.Surface):
+                    self.__screen.blit(source, dest)
+                else:
+                    pygame.draw.rect(self.__screen, source, dest)
+        self.__screen.set_clip(None)
@@ -0,0 +1,58 @@
+"""
+The inputs of a game as a bitmask of actions, one mask per simulation tick.
+
+The keyboard is mapped to actions by actions_from_keys(); headless games and bots produce the masks directly.
+"""
+import pygame
+
+LEFT = 1
+RIGHT = 2
+CANNON = 4
+RED_LASER = 8
+BLUE_LASER = 16
+
+ACTION_NAMES = {"LEFT": LEFT, "RIGHT": RIGHT, "CANNON": CANNON, "RED_LASER": RED_LASER, "BLUE_LASER": BLUE_LASER}
+
+
+def actions_from_keys(keys):
+    """
+    Maps the pressed keys to actions.
+
+    Parameters:
+    keys (sequence): The state of every key, as returned by pygame.key.get_pressed().
+
+    Returns:
+    int: The bitmask of actions.
+    """
+    actions = 0
+    if keys[pygame.K_a] or keys[pygame.K_LEFT]:
+        actions |= LEFT
+    elif keys[pygame.K_d] or keys[pygame.K_RIGHT]:
+        actions |= RIGHT
+    if keys[pygame.K_SPACE]:
+        actions |= CANNON
+    if keys[pygame.K_q]:
+        actions |= RED_LASER
+    if keys[pygame.K_e]:
+        actions |= BLUE_LASER
+    return actions
+
+
+def parse_actions(text):
+    """
+    Parses actions written as names joined with "+", e.g. "LEFT+CANNON". An empty string or "NONE" means no action.
+
+    Parameters:
+    text (str): The names of the actions.
+
+    Returns:
+    int: The bitmask of actions.
+    """
+    actions = 0
+    for name in text.upper().split("+"):
+        name = name.strip()
+        if name and name != "NONE":
+            if name not in ACTION_NAMES:
+                raise ValueError(f"Unknown action: {name}")
+            actions |= ACTION_NAMES[name]
+    return actions
@@ -0,0 +1,56 @@
+class SimClock:
+    """
+    The clock of a simulated game. Time advances by a fixed step every simulation tick, independently of real time,
+    so cooldowns and timers behave the same whether the game is played in a window or fast-forwarded headless.
+
+    Attributes:
+        __tick_rate (int): The number of ticks per simulated second.
+        __tick_time (float): The simulated time of one tick in milliseconds.
+        __ticks (int): The number of ticks since the clock was started.
+
+    Methods:
+        advance(): Advances the clock by one tick.
+        reset(): Restarts the clock at zero.
+    """
+    def __init__(self, tick_rate=60):
+        """
+        Initializes a clock at zero.
+
+        Parameters:
+        tick_rate (int, optional): The number of ticks per simulated second. Defaults to 60.
+        """
+        self.__tick_rate = tick_rate
+        self.__tick_time = 1000 / tick_rate
+        self.__ticks = 0
+
+    @property
+    def tick_rate(self):
+        """Get the number of ticks per simulated second."""
+        return self.__tick_rate
+
+    @property
+    def tick_time(self):
+        """Get the simulated time of one tick in milliseconds."""
+        return self.__tick_time
+
+    @property
+    def ticks(self):
+        """Get the number of ticks since the clock was started."""
+        return self.__ticks
+
+    @property
+    def time(self):
+        """Get the simulated time since the clock was started in whole milliseconds, like pygame.time.get_ticks()."""
+        return int(self.__ticks * self.__tick_time)
+
+    def advance(self):
+        """
+        Advances the clock by one tick.
+        """
+        self.__ticks += 1
+
+    def reset(self):
+        """
+        Restarts the clock at zero.
+        """
+        self.__ticks = 0
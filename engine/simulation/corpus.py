@@ -0,0 +1,158 @@
+"""
+A regression corpus of replays, verified in parallel over all cores.
+
+A corpus is a directory of replay files (*.swr). Verifying it simulates every replay again and compares its
+checkpoints and final state with the recording, so a change to the simulation, e.g. to speed up collisions,
+movement or bunker damage, can be shown to leave gameplay untouched:
+
+    python main.py --record-corpus replays --games 20 --seed 1
+    python main.py --verify-corpus replays
+
+Workers are reused across replays and load the assets once, when they start. A replay that no longer matches is
+reported with the window of ticks it first went differently in.
+"""
+import glob
+import os
+import random
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from engine.simulation.headless import create_headless_session
+from engine.simulation.policies import SweepPolicy
+from engine.simulation.replay import Replay, format_replay_result, play_replay, record_game
+
+REPLAY_EXTENSION = ".swr"
+
+CorpusResult = namedtuple("CorpusResult", ["path", "result", "error"])
+
+# The state of a worker process, set once by _initialize_worker()
+_worker = {}
+
+
+def replay_paths(directory):
+    """
+    Returns the replay files of a corpus.
+
+    Parameters:
+    directory (str): The directory of the corpus.
+
+    Returns:
+    list of str: The paths of the replay files, sorted by name.
+    """
+    return sorted(glob.glob(os.path.join(directory, "*" + REPLAY_EXTENSION)))
+
+
+def record_corpus(config, directory, games=10, seed=None, level_index=0, create_policy=SweepPolicy, max_ticks=None):
+    """
+    Records games played by a policy into a corpus, one replay file per game named after its seed.
+
+    Parameters:
+    config (dict): The game configuration, as found in config.json.
+    directory (str): The directory of the corpus, created if needed.
+    games (int, optional): The number of games to record. Defaults to 10.
+    seed (int, optional): The seed of the first game; every following game uses the next seed. Defaults to a random
+    seed.
+    level_index (int, optional): The index of the level every game starts on. Defaults to 0.
+    create_policy (callable, optional): Creates the policy of every game. Defaults to SweepPolicy.
+    max_ticks (int, optional): The maximum length of a game in ticks. Defaults to no limit.
+
+    Returns:
+    list of str: The paths of the recorded replays.
+    """
+    if seed is None:
+        seed = random.getrandbits(32)
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for game_seed in range(seed, seed + games):
+        path = os.path.join(directory, f"level{level_index}_seed{game_seed}{REPLAY_EXTENSION}")
+        record_game(config, create_policy(), game_seed, level_index, max_ticks).save(path)
+        paths.append(path)
+    return paths
+
+
+def _initialize_worker(config, projectile_backend):
+    """
+    Prepares a worker process: stores the configuration and creates a headless session once, which loads the images
+    of the game into the worker's asset cache. The mixer is never initialized.
+    """
+    create_headless_session(config, projectile_backend)
+    _worker.update(config=config, projectile_backend=projectile_backend)
+
+
+def _verify_path(path):
+    """
+    Verifies one replay of the corpus in a worker process.
+
+    Parameters:
+    path (str): The path of the replay file.
+
+    Returns:
+    CorpusResult: The outcome of the replay, or the error that kept it from being played.
+    """
+    try:
+        result = play_replay(Replay.load(path), _worker["config"], _worker["projectile_backend"])
+    except (OSError, ValueError, EOFError) as error:
+        return CorpusResult(path, None, str(error))
+    return CorpusResult(path, result, None)
+
+
+def verify_corpus(config, directory, workers=None, projectile_backend=None):
+    """
+    Verifies every replay of a corpus in a process pool and yields the outcomes as the replays finish.
+
+    Parameters:
+    config (dict): The game configuration the corpus was recorded with.
+    directory (str): The directory of the corpus.
+    workers (int, optional): The number of worker processes. Defaults to the number of cores.
+    projectile_backend (str, optional): "sprite" or "array". Defaults to the configured backend.
+
+    Yields:
+    CorpusResult: The outcome of every replay, in the order the replays finish.
+    """
+    paths = replay_paths(directory)
+    if not paths:
+        return
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_initialize_worker,
+                             initargs=(config, projectile_backend)) as executor:
+        futures = [executor.submit(_verify_path, path) for path in paths]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def format_corpus_result(corpus_result):
+    """
+    Formats the outcome of one replay as a line of the corpus report.
+
+    Parameters:
+    corpus_result (CorpusResult): The outcome of the replay.
+
+    Returns:
+    str: The formatted line.
+    """
+    name = os.path.basename(corpus_result.path)
+    if corpus_result.error is not None:
+        return f"{name}: ERROR: {corpus_result.error}"
+    return f"{name}: {format_replay_result(corpus_result.result)}"
+
+
+def format_corpus_report(corpus_results):
+    """
+    Formats a summary of a verified corpus: the number of replays that match, the ones that do not and the ticks
+    simulated per second over all workers.
+
+    Parameters:
+    corpus_results (list of CorpusResult): The outcomes of all replays.
+
+    Returns:
+    str: The formatted summary.
+    """
+    failures = sorted((result for result in corpus_results if result.error or not result.result.matches),
+                      key=lambda result: result.path)
+    played = [result.result for result in corpus_results if result.result is not None]
+    ticks = sum(result.ticks for result in played)
+    seconds = sum(result.seconds for result in played)
+    lines = [f"{len(corpus_results) - len(failures)} of {len(corpus_results)} replays match, {ticks} ticks "
+             f"simulated at {ticks / seconds if seconds else 0:.0f} ticks per second per worker"]
+    lines.extend(f"  {format_corpus_result(result)}" for result in failures)
+    return "\n".join(lines)
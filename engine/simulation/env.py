@@ -0,0 +1,174 @@
+"""
+A Gym-style environment for training bots on the headless simulation.
+
+Actions are the bitmasks of engine.simulation.actions, so there are ACTION_COUNT discrete actions. Observations are a
+dict of NumPy arrays read straight from the simulation state, without rendering anything:
+
+    aliens       uint8 (rows, columns)       1 for every living alien of the formation's grid
+    formation    float32 (3,)                the formation's offset (x, y) and horizontal direction
+    projectiles  float32 (max_projectiles, 4) x, y, speed and owner of every shot, zero padded
+    player       float32 (5,)                the player's center x, health and the reload progress of every weapon
+
+The API follows Gymnasium: reset(seed) returns (observation, info) and step(action) returns
+(observation, reward, terminated, truncated, info). The reward is the score gained during the step. Episodes reset
+with the same seed and stepped with the same actions are identical.
+"""
+import numpy as np
+
+from engine.simulation.actions import LEFT, RIGHT, CANNON, RED_LASER, BLUE_LASER
+from engine.simulation.headless import create_headless_session
+from engine.weapon.projectile import Projectile
+
+ACTION_COUNT = (LEFT | RIGHT | CANNON | RED_LASER | BLUE_LASER) + 1
+
+
+class SpaceWarriorsEnv:
+    """
+    A single game of Space Warriors as an environment with reset() and step().
+
+    The observation arrays are allocated once and overwritten in place by every reset() and step(), so a step costs
+    little more than the simulation itself. Copy them to keep an observation across steps.
+
+    Attributes:
+        __session (GameSession): The headless game.
+        __level_index (int): The index of the level every episode is played on.
+        __max_steps (int): The number of steps after which an episode is truncated, or None.
+        __frame_skip (int): The number of ticks every action is repeated for.
+        __steps (int): The number of steps of the current episode.
+        __score (int): The score of the player after the last step.
+        __observation (dict): The observation arrays.
+
+    Methods:
+        reset(seed, options): Starts a new episode.
+        step(action): Applies an action and advances the game.
+    """
+    def __init__(self, config, level_index=0, max_steps=None, frame_skip=1, max_projectiles=64,
+                 projectile_backend=None):
+        """
+        Creates the environment. No episode is running until reset() is called.
+
+        Parameters:
+        config (dict): The game configuration, as found in config.json.
+        level_index (int, optional): The index of the level every episode is played on. Defaults to 0.
+        max_steps (int, optional): The number of steps after which an episode is truncated. Defaults to no limit.
+        frame_skip (int, optional): The number of ticks every action is repeated for. Defaults to 1.
+        max_projectiles (int, optional): The number of shots the observation holds; further shots are left out.
+        Defaults to 64.
+        projectile_backend (str, optional): "sprite" or "array". Defaults to the configured backend.
+        """
+        self.__session = create_headless_session(config, projectile_backend)
+        self.__level_index = level_index
+        self.__max_steps = max_steps
+        self.__frame_skip = frame_skip
+        self.__steps = 0
+        self.__score = 0
+
+        level = config["levels"][level_index]
+        self.__observation = {
+            "aliens": np.zeros((level["alien_rows"], level["alien_columns"]), dtype=np.uint8),
+            "formation": np.zeros(3, dtype=np.float32),
+            "projectiles": np.zeros((max_projectiles, 4), dtype=np.float32),
+            "player": np.zeros(5, dtype=np.float32),
+        }
+
+    @property
+    def session(self):
+        """Get the headless game."""
+        return self.__session
+
+    @property
+    def observation_shapes(self):
+        """Get the shape of every observation array."""
+        return {name: array.shape for name, array in self.__observation.items()}
+
+    def reset(self, seed=None, options=None):
+        """
+        Starts a new episode.
+
+        Parameters:
+        seed (int, optional): The seed the game's generator is reset with, making the episode reproducible. Defaults
+        to continuing with the generator's current state.
+        options (dict, optional): Unused, accepted like in Gymnasium. Defaults to None.
+
+        Returns:
+        tuple: The first observation and the info dict.
+        """
+        self.__session.new_game(self.__level_index, seed)
+        self.__steps = 0
+        self.__score = 0
+        return self.__observe(), self.__info()
+
+    def step(self, action):
+        """
+        Applies an action for frame_skip ticks, or until the game is over.
+
+        Parameters:
+        action (int): The bitmask of actions, between 0 and ACTION_COUNT - 1.
+
+        Returns:
+        tuple: The observation, the reward, whether the game is over, whether the episode was truncated and the
+        info dict.
+        """
+        session = self.__session
+        for _ in range(self.__frame_skip):
+            session.tick(action)
+            if session.is_game_stopped:
+                break
+        self.__steps += 1
+
+        score = session.player.score
+        reward = score - self.__score
+        self.__score = score
+        terminated = session.is_game_stopped
+        truncated = not terminated and self.__max_steps is not None and self.__steps >= self.__max_steps
+        return self.__observe(), reward, terminated, truncated, self.__info()
+
+    def __observe(self):
+        """
+        Fills the observation arrays from the state of the game.
+
+        Returns:
+        dict: The observation arrays.
+        """
+        session = self.__session
+        level = session.level
+        player = session.player
+        observation = self.__observation
+
+        aliens = observation["aliens"]
+        aliens.fill(0)
+        aliens[level.formation.living_cells()] = 1
+
+        formation = observation["formation"]
+        formation[0], formation[1] = level.formation.offset
+        formation[2] = level.formation.direction
+
+        projectiles = observation["projectiles"]
+        projectiles.fill(0)
+        count = 0
+        groups = [(weapon.weapon_shots, Projectile.PLAYER) for weapon in player.weapons]
+        groups.append((level.alien_weapons, Projectile.ALIEN))
+        for group, owner in groups:
+            if not len(group) or count == len(projectiles):
+                continue
+            shots = np.asarray(group.snapshot(), dtype=np.float32).reshape(-1, 3)[:len(projectiles) - count]
+            projectiles[count:count + len(shots), :3] = shots
+            projectiles[count:count + len(shots), 3] = owner
+            count += len(shots)
+
+        player_state = observation["player"]
+        player_state[0] = player.rect.centerx
+        player_state[1] = player.health
+        for index, weapon in enumerate(player.weapons):
+            player_state[2 + index] = weapon.reload_progress
+        return observation
+
+    def __info(self):
+        """
+        Returns the state of the game not covered by the observation.
+
+        Returns:
+        dict: The score, whether the player won and the number of ticks simulated.
+        """
+        session = self.__session
+        return {"score": session.player.score, "won": session.player_won, "ticks": session.tick_count}
@@ -0,0 +1,118 @@
+"""
+Fast-forwarded games without a window, a mixer or a frame cap.
+
+The levels, the player, the weapons and the collisions run exactly as in the window, but every tick follows the
+previous one immediately and the input comes from a policy. Useful to test balance changes, to measure the cost of
+the simulation alone and to drive bots:
+
+    python main.py --headless --games 10 --policy sweep
+"""
+import os
+import time
+from collections import namedtuple
+
+from engine.simulation.policies import SweepPolicy
+from engine.simulation.session import GameSession
+
+GameResult = namedtuple("GameResult", ["level_name", "won", "score", "health", "ticks"])
+HeadlessReport = namedtuple("HeadlessReport", ["results", "ticks", "seconds", "tick_rate"])
+
+
+def create_headless_session(config, projectile_backend=None, tick_rate=None):
+    """
+    Creates a GameSession without opening a window or initializing the mixer. SDL is pointed to its dummy drivers,
+    so nothing is shown even if pygame is initialized later on.
+
+    Parameters:
+    config (dict): The game configuration, as found in config.json.
+    projectile_backend (str, optional): "sprite" or "array". Defaults to the configured backend.
+    tick_rate (int, optional): The number of ticks per simulated second. Defaults to the configured tick rate.
+
+    Returns:
+    GameSession: The session, with no game started.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    if projectile_backend is None:
+        projectile_backend = config.get("projectile_backend", "sprite")
+    if tick_rate is None:
+        tick_rate = config.get("tick_rate", 60)
+    return GameSession(config["width"], config["height"], config["levels"], None, projectile_backend, tick_rate)
+
+
+def play_game(session, policy, level_index=None, max_ticks=None, seed=None):
+    """
+    Plays one game in the session until the player wins, dies or max_ticks ticks have passed.
+
+    Parameters:
+    session (GameSession): The session playing the game.
+    policy (callable): Returns the actions of every tick, given the session.
+    level_index (int, optional): The index of the level to play. Defaults to the session's current level.
+    max_ticks (int, optional): The maximum length of the game in ticks. Defaults to no limit.
+    seed (int, optional): The seed the session's generator is reset with. Defaults to continuing with its state.
+
+    Returns:
+    GameResult: The outcome of the game.
+    """
+    session.new_game(level_index, seed)
+    level = session.level
+    ticks = 0
+    while not session.is_game_stopped and (max_ticks is None or ticks < max_ticks):
+        session.tick(policy(session))
+        ticks += 1
+    level.game_music.stop()
+    player = session.player
+    return GameResult(level.level_name, session.player_won, player.score, max(player.health, 0), ticks)
+
+
+def run_headless(config, games=1, level_index=0, create_policy=SweepPolicy, max_ticks=None, projectile_backend=None,
+                 tick_rate=None, seed=None, memory_tracker=None):
+    """
+    Plays several games headless, one after another, and measures how fast they were simulated.
+
+    Parameters:
+    config (dict): The game configuration, as found in config.json.
+    games (int, optional): The number of games to play. Defaults to 1.
+    level_index (int, optional): The index of the level every game is played on. Defaults to 0.
+    create_policy (callable, optional): Creates the policy of every game. Defaults to SweepPolicy.
+    max_ticks (int, optional): The maximum length of a game in ticks. Defaults to no limit.
+    projectile_backend (str, optional): "sprite" or "array". Defaults to the configured backend.
+    tick_rate (int, optional): The number of ticks per simulated second. Defaults to the configured tick rate.
+    seed (int, optional): The seed of the first game; every following game uses the next seed. Defaults to
+    unseeded games.
+    memory_tracker (MemoryTracker, optional): Records the memory at the start of every game. Defaults to None.
+
+    Returns:
+    HeadlessReport: The results of all games, the number of ticks simulated and the wall time it took in seconds.
+    """
+    session = create_headless_session(config, projectile_backend, tick_rate)
+    session.memory_tracker = memory_tracker
+    results = []
+    start = time.perf_counter()
+    for game in range(games):
+        game_seed = seed + game if seed is not None else None
+        results.append(play_game(session, create_policy(), level_index, max_ticks, game_seed))
+    seconds = time.perf_counter() - start
+    return HeadlessReport(results, sum(result.ticks for result in results), seconds, session.clock.tick_rate)
+
+
+def format_report(report):
+    """
+    Formats the results of a headless run as a table, followed by the simulated frames per second and the speed-up
+    over real time.
+
+    Parameters:
+    report (HeadlessReport): The report returned by run_headless().
+
+    Returns:
+    str: The formatted report.
+    """
+    lines = [f"{'game':>4} {'level':<30} {'result':<7} {'score':>6} {'health':>6} {'ticks':>7}"]
+    for number, result in enumerate(report.results, 1):
+        outcome = "won" if result.won else "lost" if result.health <= 0 else "timeout"
+        lines.append(f"{number:>4} {result.level_name:<30} {outcome:<7} {result.score:>6} {result.health:>6} "
+                     f"{result.ticks:>7}")
+    fps = report.ticks / report.seconds if report.seconds else 0
+    lines.append(f"{report.ticks} ticks in {report.seconds:.2f} s: {fps:.0f} simulated frames per second, "
+                 f"{fps / report.tick_rate:.1f}x real time")
+    return "\n".join(lines)
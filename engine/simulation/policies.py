@@ -0,0 +1,126 @@
+"""
+Input sources for headless games. A policy is called once per simulation tick with the GameSession and returns the
+bitmask of actions for that tick. A new policy is created for every game, so policies may keep state.
+"""
+from engine.simulation.actions import LEFT, RIGHT, CANNON, RED_LASER, BLUE_LASER, parse_actions
+
+
+class IdlePolicy:
+    """
+    A policy that never moves nor shoots.
+    """
+    def __call__(self, session):
+        """
+        Returns no action.
+
+        Parameters:
+        session (GameSession): The simulated game.
+
+        Returns:
+        int: The bitmask of actions.
+        """
+        return 0
+
+
+class SweepPolicy:
+    """
+    A policy sweeping the player from one edge of the screen to the other while firing every weapon as soon as it is
+    reloaded.
+
+    Attributes:
+        __direction (int): LEFT or RIGHT, the action moving the player.
+        __margin (int): The distance to the screen edge at which the player turns around.
+    """
+    def __init__(self, margin=100):
+        """
+        Initializes the policy moving right.
+
+        Parameters:
+        margin (int, optional): The distance to the screen edge at which the player turns around. Defaults to 100.
+        """
+        self.__direction = RIGHT
+        self.__margin = margin
+
+    def __call__(self, session):
+        """
+        Returns the movement towards the current edge and all weapons.
+
+        Parameters:
+        session (GameSession): The simulated game.
+
+        Returns:
+        int: The bitmask of actions.
+        """
+        rect = session.player.rect
+        if self.__direction == RIGHT and rect.right >= session.width - self.__margin:
+            self.__direction = LEFT
+        elif self.__direction == LEFT and rect.left <= self.__margin:
+            self.__direction = RIGHT
+        return self.__direction | CANNON | RED_LASER | BLUE_LASER
+
+
+class ScriptedPolicy:
+    """
+    A policy replaying a script of actions, each held for a number of ticks. Once the script is over, the policy
+    either starts over or does nothing.
+
+    Attributes:
+        __actions (list of int): The actions of every tick of the script.
+        __loop (bool): Whether the script starts over once it is over.
+        __tick (int): The number of ticks played.
+    """
+    def __init__(self, steps, loop=False):
+        """
+        Initializes the policy at the start of the script.
+
+        Parameters:
+        steps (list of tuple): The steps of the script as (ticks, actions) pairs.
+        loop (bool, optional): Whether the script starts over once it is over. Defaults to False.
+        """
+        self.__actions = [actions for ticks, actions in steps for _ in range(ticks)]
+        self.__loop = loop
+        self.__tick = 0
+
+    def __call__(self, session):
+        """
+        Returns the actions of the current tick of the script.
+
+        Parameters:
+        session (GameSession): The simulated game.
+
+        Returns:
+        int: The bitmask of actions.
+        """
+        tick = self.__tick
+        self.__tick += 1
+        if not self.__actions:
+            return 0
+        if self.__loop:
+            return self.__actions[tick % len(self.__actions)]
+        return self.__actions[tick] if tick < len(self.__actions) else 0
+
+
+def parse_script(text):
+    """
+    Parses a script of actions. Every line holds a number of ticks and the actions held during them, e.g.
+    "30 RIGHT+CANNON". Empty lines and lines starting with "#" are skipped.
+
+    Parameters:
+    text (str): The script.
+
+    Returns:
+    list of tuple: The steps of the script as (ticks, actions) pairs.
+    """
+    steps = []
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        ticks, _, actions = line.partition(" ")
+        if not ticks.isdigit():
+            raise ValueError(f"Line {number}: expected a number of ticks, got {ticks!r}")
+        steps.append((int(ticks), parse_actions(actions)))
+    return steps
+
+
+POLICIES = {"idle": IdlePolicy, "sweep": SweepPolicy}
@@ -0,0 +1,394 @@
+"""
+Recording games as compact binary replays and verifying them by simulating them again.
+
+A game is fully decided by the configuration, the seed of the session's generator, the level it starts on and the
+actions of every tick, so a replay stores only these. The actions are one byte per tick, compressed. The final
+score and a hash of the final state (see GameSession.state_hash()) are stored as well, so playing a replay back
+tells whether the simulation still plays the game out the same. Every checkpoint_interval ticks a shortened state
+hash is stored too, telling when a game that no longer plays out the same first went differently:
+
+    python main.py --headless --seed 7 --record game.swr
+    python main.py --replay game.swr
+
+Layout of version 2, little-endian:
+
+    header       magic "SWRP", version (u8), level index (u8), seed (u64), config hash (16 bytes), ticks (u32),
+                 size of the compressed actions (u32), checkpoint interval (u16), number of checkpoints (u32)
+    body         the compressed actions, one byte per tick
+    checkpoints  the first 8 bytes of the state hash after every checkpoint_interval ticks
+    footer       final score (i32), final state hash (16 bytes)
+
+Version 1 replays have no checkpoints and no checkpoint fields in the header; they are still read.
+"""
+import hashlib
+import json
+import struct
+import time
+import zlib
+from collections import namedtuple
+
+from engine.simulation.headless import create_headless_session
+
+SIMULATION_FIELDS = ("width", "height", "tick_rate", "levels")
+
+ReplayResult = namedtuple("ReplayResult", ["matches", "score", "expected_score", "state_matches", "ticks",
+                                           "seconds", "last_match", "diverged_at"])
+
+
+def config_hash(config):
+    """
+    Returns a digest of the parts of a configuration that change how a game plays out. Settings that only change how
+    it is shown or stored, like the render mode or the projectile backend, are left out.
+
+    Parameters:
+    config (dict): The game configuration, as found in config.json.
+
+    Returns:
+    bytes: The 16-byte digest.
+    """
+    fields = {field: config.get(field) for field in SIMULATION_FIELDS}
+    fields["tick_rate"] = fields["tick_rate"] or 60
+    text = json.dumps(fields, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+class Replay:
+    """
+    The Replay class holds a recorded game: what is needed to simulate it again and what it should end with.
+
+    Attributes:
+        __seed (int): The seed the session's generator was reset with.
+        __level_index (int): The index of the level the game started on.
+        __config_hash (bytes): The digest of the configuration the game was played with, see config_hash().
+        __actions (bytes): The actions of every tick, one byte per tick.
+        __score (int): The score of the player when the recording ended.
+        __state_hash (bytes): The state hash of the session when the recording ended.
+        __checkpoint_interval (int): The number of ticks between two checkpoints, 0 without checkpoints.
+        __checkpoints (list of bytes): The shortened state hash after every checkpoint_interval ticks.
+
+    Methods:
+        to_bytes(): Returns the replay in its binary layout.
+        from_bytes(data): Reads a replay from its binary layout.
+        __unpack(data): Reads a replay from its binary layout without checking for truncation.
+        save(path): Writes the replay to a file.
+        load(path): Reads a replay from a file.
+    """
+    MAGIC = b"SWRP"
+    VERSION = 2
+    HEADER = struct.Struct("<4sBBQ16sII")
+    CHECKPOINT_HEADER = struct.Struct("<HI")
+    CHECKPOINT_SIZE = 8
+    FOOTER = struct.Struct("<i16s")
+
+    def __init__(self, seed, level_index, config_hash, actions, score, state_hash, checkpoint_interval=0,
+                 checkpoints=()):
+        """
+        Creates a replay.
+
+        Parameters:
+        seed (int): The seed the session's generator was reset with.
+        level_index (int): The index of the level the game started on.
+        config_hash (bytes): The digest of the configuration the game was played with.
+        actions (bytes): The actions of every tick, one byte per tick.
+        score (int): The score of the player when the recording ended.
+        state_hash (bytes): The state hash of the session when the recording ended.
+        checkpoint_interval (int, optional): The number of ticks between two checkpoints. Defaults to 0, no
+        checkpoints.
+        checkpoints (list of bytes, optional): The shortened state hash after every checkpoint_interval ticks.
+        Defaults to none.
+        """
+        self.__seed = seed
+        self.__level_index = level_index
+        self.__config_hash = config_hash
+        self.__actions = bytes(actions)
+        self.__score = score
+        self.__state_hash = state_hash
+        self.__checkpoint_interval = checkpoint_interval
+        self.__checkpoints = list(checkpoints)
+
+    @property
+    def seed(self):
+        """Get the seed the session's generator was reset with."""
+        return self.__seed
+
+    @property
+    def level_index(self):
+        """Get the index of the level the game started on."""
+        return self.__level_index
+
+    @property
+    def config_hash(self):
+        """Get the digest of the configuration the game was played with."""
+        return self.__config_hash
+
+    @property
+    def actions(self):
+        """Get the actions of every tick, one byte per tick."""
+        return self.__actions
+
+    @property
+    def score(self):
+        """Get the score of the player when the recording ended."""
+        return self.__score
+
+    @property
+    def state_hash(self):
+        """Get the state hash of the session when the recording ended."""
+        return self.__state_hash
+
+    @property
+    def checkpoint_interval(self):
+        """Get the number of ticks between two checkpoints, 0 without checkpoints."""
+        return self.__checkpoint_interval
+
+    @property
+    def checkpoints(self):
+        """Get the shortened state hash after every checkpoint_interval ticks."""
+        return self.__checkpoints
+
+    def to_bytes(self):
+        """
+        Returns the replay in its binary layout, always the current version.
+
+        Returns:
+        bytes: The header, the compressed actions, the checkpoints and the footer.
+        """
+        body = zlib.compress(self.__actions, 9)
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, self.__level_index, self.__seed, self.__config_hash,
+                                  len(self.__actions), len(body))
+        header += self.CHECKPOINT_HEADER.pack(self.__checkpoint_interval, len(self.__checkpoints))
+        return header + body + b"".join(self.__checkpoints) + self.FOOTER.pack(self.__score, self.__state_hash)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Reads a replay from its binary layout.
+
+        Parameters:
+        data (bytes): The replay, as returned by to_bytes().
+
+        Returns:
+        Replay: The replay.
+        """
+        try:
+            return cls.__unpack(data)
+        except (struct.error, zlib.error) as error:
+            raise ValueError(f"Corrupt replay: {error}") from error
+
+    @classmethod
+    def __unpack(cls, data):
+        """
+        Reads a replay from its binary layout, letting struct and zlib errors of a truncated replay through.
+        """
+        magic, version, level_index, seed, digest, ticks, size = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC:
+            raise ValueError("Not a Space Warriors replay")
+        if version not in (1, 2):
+            raise ValueError(f"Unsupported replay version: {version}")
+        offset = cls.HEADER.size
+        interval, count = 0, 0
+        if version >= 2:
+            interval, count = cls.CHECKPOINT_HEADER.unpack_from(data, offset)
+            offset += cls.CHECKPOINT_HEADER.size
+
+        actions = zlib.decompress(data[offset:offset + size])
+        if len(actions) != ticks:
+            raise ValueError("Corrupt replay: wrong number of ticks")
+        offset += size
+        checkpoints = [data[start:start + cls.CHECKPOINT_SIZE]
+                       for start in range(offset, offset + count * cls.CHECKPOINT_SIZE, cls.CHECKPOINT_SIZE)]
+        score, state_hash = cls.FOOTER.unpack_from(data, offset + count * cls.CHECKPOINT_SIZE)
+        return cls(seed, level_index, digest, actions, score, state_hash, interval, checkpoints)
+
+    def save(self, path):
+        """
+        Writes the replay to a file.
+
+        Parameters:
+        path (str): The path of the file.
+        """
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a replay from a file.
+
+        Parameters:
+        path (str): The path of the file.
+
+        Returns:
+        Replay: The replay.
+        """
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+
+class ReplayRecorder:
+    """
+    The ReplayRecorder class plays a game in a session and records the actions of every tick.
+
+    Attributes:
+        __session (GameSession): The session playing the game.
+        __config_hash (bytes): The digest of the configuration of the session.
+        __seed (int): The seed of the recorded game.
+        __level_index (int): The index of the level the recorded game started on.
+        __actions (bytearray): The actions of every tick so far.
+        __checkpoint_interval (int): The number of ticks between two checkpoints, 0 for no checkpoints.
+        __checkpoints (list of bytes): The shortened state hash after every checkpoint_interval ticks so far.
+
+    Methods:
+        start(): Starts the recorded game in the session.
+        tick(actions): Advances the session by one tick and records its actions.
+        finish(): Returns the replay of the game so far.
+    """
+    CHECKPOINT_INTERVAL = 30
+
+    def __init__(self, session, config, seed, level_index=0, checkpoint_interval=CHECKPOINT_INTERVAL):
+        """
+        Creates a recorder. The game starts with start(). Hashing the state costs about as much as a tick, so
+        checkpoints are only taken every few ticks; an interval of 1 pins a divergence down to the exact tick.
+
+        Parameters:
+        session (GameSession): The session playing the game.
+        config (dict): The game configuration the session was created with.
+        seed (int): The seed of the recorded game.
+        level_index (int, optional): The index of the level the game starts on. Defaults to 0.
+        checkpoint_interval (int, optional): The number of ticks between two checkpoints, 0 for no checkpoints.
+        Defaults to CHECKPOINT_INTERVAL.
+        """
+        self.__session = session
+        self.__config_hash = config_hash(config)
+        self.__seed = seed
+        self.__level_index = level_index
+        self.__actions = bytearray()
+        self.__checkpoint_interval = checkpoint_interval
+        self.__checkpoints = []
+
+    @property
+    def ticks(self):
+        """Get the number of ticks recorded so far."""
+        return len(self.__actions)
+
+    def start(self):
+        """
+        Starts the recorded game in the session, reseeding its generator, and clears the actions recorded so far.
+        """
+        self.__session.new_game(self.__level_index, self.__seed)
+        self.__actions.clear()
+        self.__checkpoints.clear()
+
+    def tick(self, actions=0):
+        """
+        Advances the session by one tick and records its actions.
+
+        Parameters:
+        actions (int, optional): The bitmask of actions of the tick. Defaults to no action.
+        """
+        self.__session.tick(actions)
+        self.__actions.append(actions)
+        if self.__checkpoint_interval and len(self.__actions) % self.__checkpoint_interval == 0:
+            self.__checkpoints.append(self.__session.state_hash()[:Replay.CHECKPOINT_SIZE])
+
+    def finish(self):
+        """
+        Returns the replay of the game so far, ending with the current score and state hash of the session.
+
+        Returns:
+        Replay: The replay.
+        """
+        session = self.__session
+        return Replay(self.__seed, self.__level_index, self.__config_hash, self.__actions, session.player.score,
+                      session.state_hash(), self.__checkpoint_interval, self.__checkpoints)
+
+
+def record_game(config, policy, seed, level_index=0, max_ticks=None, projectile_backend=None):
+    """
+    Plays one game headless with a policy and records it.
+
+    Parameters:
+    config (dict): The game configuration, as found in config.json.
+    policy (callable): Returns the actions of every tick, given the session.
+    seed (int): The seed of the game.
+    level_index (int, optional): The index of the level the game starts on. Defaults to 0.
+    max_ticks (int, optional): The maximum length of the game in ticks. Defaults to no limit.
+    projectile_backend (str, optional): "sprite" or "array". Defaults to the configured backend.
+
+    Returns:
+    Replay: The replay of the game.
+    """
+    session = create_headless_session(config, projectile_backend)
+    recorder = ReplayRecorder(session, config, seed, level_index)
+    recorder.start()
+    level = session.level
+    while not session.is_game_stopped and (max_ticks is None or recorder.ticks < max_ticks):
+        recorder.tick(policy(session))
+    level.game_music.stop()
+    return recorder.finish()
+
+
+def play_replay(replay, config, projectile_backend=None):
+    """
+    Simulates a replay again, headless and as fast as possible, and compares the outcome with the recorded one. The
+    checkpoints are compared on the way, so a replay that went differently tells the first checkpoint that differs.
+
+    Parameters:
+    replay (Replay): The replay to play.
+    config (dict): The game configuration, which must match the one the replay was recorded with.
+    projectile_backend (str, optional): "sprite" or "array". Defaults to the configured backend.
+
+    Returns:
+    ReplayResult: Whether the final score and state match the recording, the scores, the number of ticks simulated,
+    the wall time it took in seconds, the last tick known to match and the first tick known to differ, or None if
+    the replay matches.
+    """
+    if config_hash(config) != replay.config_hash:
+        raise ValueError("The replay was recorded with a different configuration")
+    session = create_headless_session(config, projectile_backend)
+    interval = replay.checkpoint_interval
+    checkpoints = replay.checkpoints
+    last_match, diverged_at = 0, None
+
+    start = time.perf_counter()
+    session.new_game(replay.level_index, replay.seed)
+    level = session.level
+    for tick, actions in enumerate(replay.actions, 1):
+        session.tick(actions)
+        if diverged_at is None and interval and tick % interval == 0 and tick // interval <= len(checkpoints):
+            if session.state_hash()[:Replay.CHECKPOINT_SIZE] == checkpoints[tick // interval - 1]:
+                last_match = tick
+            else:
+                diverged_at = tick
+    seconds = time.perf_counter() - start
+    level.game_music.stop()
+
+    score = session.player.score
+    state_matches = session.state_hash() == replay.state_hash
+    matches = score == replay.score and state_matches and diverged_at is None
+    if matches:
+        last_match = len(replay.actions)
+    elif diverged_at is None:
+        diverged_at = len(replay.actions)
+    return ReplayResult(matches, score, replay.score, state_matches, len(replay.actions),
+                        seconds, last_match, diverged_at)
+
+
+def format_replay_result(result):
+    """
+    Formats the outcome of play_replay() as a line.
+
+    Parameters:
+    result (ReplayResult): The outcome of the replay.
+
+    Returns:
+    str: The formatted line.
+    """
+    verdict = "OK" if result.matches else "MISMATCH"
+    state = "matches" if result.state_matches else "differs"
+    fps = result.ticks / result.seconds if result.seconds else 0
+    line = (f"{verdict}: score {result.score} (recorded {result.expected_score}), final state {state}, "
+            f"{result.ticks} ticks in {result.seconds:.2f} s ({fps:.0f} ticks per second)")
+    if result.diverged_at is not None:
+        line += f", diverged after tick {result.last_match}, by tick {result.diverged_at}"
+    return line
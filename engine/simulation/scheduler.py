@@ -0,0 +1,253 @@
+import heapq
+import math
+
+
+class Timer:
+    """
+    A callback scheduled on a Scheduler. Keep it to cancel the callback before it runs.
+
+    Attributes:
+        __tick (int): The tick of the clock the callback runs on.
+        __callback (callable): The function called without arguments when the timer is due.
+        __is_active (bool): Whether the timer is still waiting to run.
+
+    Methods:
+        cancel(): Keeps the timer from running.
+    """
+    def __init__(self, tick, callback):
+        """
+        Creates a timer. Timers are created by Scheduler.call_at_tick() and the other scheduling methods.
+
+        Parameters:
+        tick (int): The tick of the clock the callback runs on.
+        callback (callable): The function called without arguments when the timer is due.
+        """
+        self.__tick = tick
+        self.__callback = callback
+        self.__is_active = True
+
+    @property
+    def tick(self):
+        """Get the tick of the clock the callback runs on."""
+        return self.__tick
+
+    @tick.setter
+    def tick(self, new_tick):
+        """Set the tick of the clock the callback runs on. Only the scheduler moves its timers."""
+        self.__tick = new_tick
+
+    @property
+    def callback(self):
+        """Get the function called when the timer is due."""
+        return self.__callback
+
+    @property
+    def is_active(self):
+        """Check whether the timer is still waiting to run."""
+        return self.__is_active
+
+    def cancel(self):
+        """
+        Keeps the timer from running. Cancelling a timer that already ran does nothing.
+        """
+        self.__is_active = False
+
+    def _finish(self):
+        """
+        Marks the timer as run.
+        """
+        self.__is_active = False
+
+
+class Scheduler:
+    """
+    Runs callbacks at given ticks of a SimClock: the single place that owns every timer of a game, e.g. the aliens'
+    fire, the weapons' cooldowns and the end of the explosions.
+
+    The timers are kept in a heap ordered by their tick, so checking for due timers costs O(1) when none is due and
+    timers that are not due cost nothing at all. Timers due on the same tick run in the order they were scheduled;
+    a callback may schedule further timers, which run in the same call to run_due() if they are already due.
+    Times in milliseconds are rounded up to the first tick whose SimClock.time reaches them, so a timer due at a time
+    runs on the same tick as a check of clock.time >= time would pass.
+
+    Attributes:
+        __clock (SimClock): The clock the timers run on.
+        __timers (list): The heap of (tick, sequence number, Timer) entries.
+        __sequence (int): The number of timers scheduled so far, breaking ties between timers due on the same tick.
+        __paused_at (int): The tick the scheduler was paused on, or None if it is running.
+
+    Methods:
+        call_at_tick(tick, callback): Runs a callback on a tick.
+        call_after_ticks(ticks, callback): Runs a callback a number of ticks from now.
+        call_at(time, callback): Runs a callback once the clock's time reaches a time in milliseconds.
+        call_later(delay, callback): Runs a callback a number of milliseconds from now.
+        tick_at(time): Returns the first tick whose time reaches a time in milliseconds.
+        run_due(): Runs all timers due on the current tick.
+        pause(): Stops running timers.
+        resume(): Runs timers again, delayed by the ticks spent paused.
+        clear(): Cancels all timers.
+    """
+    def __init__(self, clock):
+        """
+        Creates a scheduler without timers.
+
+        Parameters:
+        clock (SimClock): The clock the timers run on.
+        """
+        self.__clock = clock
+        self.__timers = []
+        self.__sequence = 0
+        self.__paused_at = None
+
+    def __len__(self):
+        """Get the number of timers waiting to run, including cancelled ones not dropped yet."""
+        return len(self.__timers)
+
+    @property
+    def clock(self):
+        """Get the clock the timers run on."""
+        return self.__clock
+
+    @property
+    def is_paused(self):
+        """Check whether the scheduler is paused."""
+        return self.__paused_at is not None
+
+    @property
+    def next_tick(self):
+        """Get the tick the next timer is due on, or None without timers."""
+        self.__drop_cancelled()
+        return self.__timers[0][0] if self.__timers else None
+
+    def call_at_tick(self, tick, callback):
+        """
+        Runs a callback on a tick, or on the next call to run_due() if the tick has passed.
+
+        Parameters:
+        tick (int): The tick of the clock.
+        callback (callable): The function called without arguments.
+
+        Returns:
+        Timer: The timer, which can be cancelled.
+        """
+        timer = Timer(tick, callback)
+        heapq.heappush(self.__timers, (tick, self.__sequence, timer))
+        self.__sequence += 1
+        return timer
+
+    def call_after_ticks(self, ticks, callback):
+        """
+        Runs a callback a number of ticks from the current one.
+
+        Parameters:
+        ticks (int): The number of ticks, 0 for the current one.
+        callback (callable): The function called without arguments.
+
+        Returns:
+        Timer: The timer, which can be cancelled.
+        """
+        return self.call_at_tick(self.__clock.ticks + ticks, callback)
+
+    def call_at(self, time, callback):
+        """
+        Runs a callback on the first tick whose time reaches a time in milliseconds.
+
+        Parameters:
+        time (int): The time in milliseconds since the clock was started.
+        callback (callable): The function called without arguments.
+
+        Returns:
+        Timer: The timer, which can be cancelled.
+        """
+        return self.call_at_tick(self.tick_at(time), callback)
+
+    def call_later(self, delay, callback):
+        """
+        Runs a callback once a number of milliseconds passed from the current time of the clock.
+
+        Parameters:
+        delay (int): The delay in milliseconds.
+        callback (callable): The function called without arguments.
+
+        Returns:
+        Timer: The timer, which can be cancelled.
+        """
+        return self.call_at(self.__clock.time + delay, callback)
+
+    def tick_at(self, time):
+        """
+        Returns the first tick whose time reaches a time in milliseconds.
+
+        Parameters:
+        time (int): The time in milliseconds since the clock was started.
+
+        Returns:
+        int: The tick.
+        """
+        tick_time = self.__clock.tick_time
+        tick = max(math.ceil(time / tick_time), 0)
+        # Correct the float division, matching SimClock.time exactly
+        while int(tick * tick_time) < time:
+            tick += 1
+        while tick > 0 and int((tick - 1) * tick_time) >= time:
+            tick -= 1
+        return tick
+
+    def run_due(self):
+        """
+        Runs all timers due on the current tick of the clock, in the order of their ticks and, on the same tick, in
+        the order they were scheduled. Nothing runs while the scheduler is paused.
+
+        Returns:
+        int: The number of callbacks run.
+        """
+        if self.__paused_at is not None:
+            return 0
+        timers = self.__timers
+        now = self.__clock.ticks
+        count = 0
+        while timers and timers[0][0] <= now:
+            timer = heapq.heappop(timers)[2]
+            if timer.is_active:
+                timer._finish()
+                timer.callback()
+                count += 1
+        return count
+
+    def pause(self):
+        """
+        Stops running timers, e.g. while the menu is shown. The clock may keep running; the time spent paused is
+        added to every timer on resume().
+        """
+        if self.__paused_at is None:
+            self.__paused_at = self.__clock.ticks
+
+    def resume(self):
+        """
+        Runs timers again. Every timer is delayed by the number of ticks the clock advanced while paused.
+        """
+        if self.__paused_at is None:
+            return
+        delay = self.__clock.ticks - self.__paused_at
+        self.__paused_at = None
+        if delay:
+            for _, _, timer in self.__timers:
+                timer.tick += delay
+            self.__timers = [(timer.tick, sequence, timer) for _, sequence, timer in self.__timers]
+            heapq.heapify(self.__timers)
+
+    def clear(self):
+        """
+        Cancels all timers and resumes the scheduler if it was paused.
+        """
+        for _, _, timer in self.__timers:
+            timer.cancel()
+        self.__timers = []
+        self.__paused_at = None
+
+    def __drop_cancelled(self):
+        """
+        Drops the cancelled timers at the top of the heap.
+        """
+        while self.__timers and not self.__timers[0][2].is_active:
+            heapq.heappop(self.__timers)
@@ -0,0 +1,481 @@
+import hashlib
+import pygame
+from random import Random
+
+from engine.assets.asset_cache import asset_cache
+from engine.assets.sound import load_sound
+from engine.level.level import Level
+from engine.player import Player
+from engine.profiling.tracer import tracer
+from engine.simulation.clock import SimClock
+from engine.simulation.scheduler import Scheduler
+from engine.weapon.cannon.cannon import Cannon
+from engine.weapon.explosion_engine import CANNON_EXPLOSION, LASER_EXPLOSION, ExplosionEngine
+from engine.weapon.projectile_pool import pooled_projectiles
+
+
+class GameSession:
+    """
+    The simulation of a game: the levels, the player, the weapons, the explosions and the collisions between them,
+    advanced one fixed tick at a time by a bitmask of actions.
+
+    The session neither reads the keyboard nor draws anything. GameManager feeds it the keys pressed in the window
+    and draws its state, while headless runs feed it actions from a policy and never open a window. All timing,
+    i.e. the weapons' cooldowns, the aliens' fire and the end of the explosions, runs on the session's SimClock
+    through a single Scheduler, so a game plays out the same at any speed and timers cost nothing until they are due.
+    All randomness comes from the session's seeded generator, so a game started with a seed and fed the same actions
+    plays out the same every time. A FrameProfiler set as the session's profiler is lapped after every part of a
+    tick, see PROFILER_PHASES, and a MemoryTracker set as its memory tracker records every level start.
+
+    Attributes:
+        __width (int): width of the game screen.
+        __height (int): height of the game screen.
+        __clock (SimClock): clock advanced by every tick, restarted by every new game.
+        __scheduler (Scheduler): timers of the game on the clock, run at the end of every tick.
+        __rng (random.Random): generator picking the aliens that shoot.
+        __projectiles (PooledProjectiles or BulletEngine): backend storing the shots of the player and the aliens.
+        __levels (list of Level): list of level objects in the game.
+        __previous_level_index (int): index of the previous level.
+        __level_index (int): index of the current level.
+        __is_game_stopped (bool): flag indicating if the game is currently stopped.
+        __player_won (bool): flag indicating if the player has won the game.
+        __player (Player): player object in the game.
+        __player_sprite (pygame.sprite.GroupSingle): group holding the player object.
+        __next_alien_shot (int): simulated time in milliseconds of the aliens' next shot.
+        __explosions (ExplosionEngine): running cannon and laser explosions.
+        __pop_sound (pygame.mixer.Sound or NullSound): sound for pop.
+        __explosions_sound (pygame.mixer.Sound or NullSound): sound for explosions.
+        __profiler (FrameProfiler): profiler lapped by every tick, or None to time nothing.
+        __memory_tracker (MemoryTracker): tracker recording the memory at every level start, or None.
+
+    Methods:
+        new_game(level_index, seed): Starts a new game on the current or the given level.
+        tick(actions): Advances the game by one simulation tick.
+        pause(): Stops the game until resume() is called.
+        resume(): Continues a paused game.
+        object_counts(): Returns the number of live objects of every kind.
+        state_hash(): Returns a digest of the state of the game.
+        __create_projectiles(projectile_backend): Creates the backend storing all shots.
+        __alien_fire(): Lets the aliens shoot and schedules their next shot.
+        __explode(preset, center): Starts an explosion and schedules its removal.
+        __check_collisions(): Checks the collisions between the shots, the player, the aliens and the bunkers.
+        __cannonball_hit(rect): Lets a cannonball of the player hit the level.
+        __player_laser_hit(rect): Lets a laser of the player hit the level.
+        __alien_laser_hit(rect): Lets a laser of the aliens hit the bunkers and the player.
+        __check_victory_condition(): Check if the player has won the game.
+        __check_player_health(): Check the health of the player and stop the game if health is zero.
+    """
+    PROFILER_PHASES = ("player", "collisions", "level", "timers")
+
+    def __init__(self, width, height, levels, renderer=None, projectile_backend="sprite", tick_rate=60, seed=None):
+        """
+        Creates the levels of the game. No game is running until new_game() is called.
+
+        Parameters:
+        width (int): width of the game screen.
+        height (int): height of the game screen.
+        levels (list of dict): the configuration of every level, as found in config.json.
+        renderer (Renderer, optional): renderer the levels draw on, None for headless games. Defaults to None.
+        projectile_backend (str, optional): "sprite" or "array". Defaults to "sprite".
+        tick_rate (int, optional): number of ticks per simulated second. Defaults to 60.
+        seed (int, optional): seed of the generator picking the aliens that shoot. Defaults to a random seed.
+        """
+        self.__width = width
+        self.__height = height
+        self.__clock = SimClock(tick_rate)
+        self.__scheduler = Scheduler(self.__clock)
+        self.__rng = Random(seed)
+        self.__projectiles = self.__create_projectiles(projectile_backend)
+
+        # Create levels
+        self.__levels = []
+        self.__previous_level_index = 0
+        self.__level_index = 0
+        for level in levels:
+            self.__levels.append(Level(renderer, width, height, level["level_name"],
+                                       level["obstacle_amount"], level["alien_rows"], level["alien_columns"],
+                                       level["alien_damage"], level["alien_shooting_time"], level["level_audio_path"],
+                                       level.get("alien_backend", "sprite"), self.__projectiles, self.__rng,
+                                       level.get("alien_shooting_policy", "random")))
+
+        self.__is_game_stopped = True
+        self.__player_won = False
+        self.__player = None
+        self.__player_sprite = pygame.sprite.GroupSingle()
+        self.__next_alien_shot = 0
+
+        # Create the engine running the explosions
+        self.__explosions = ExplosionEngine(self.__clock)
+
+        # Decode explosion frames up front so that the first hits do not stall on disk I/O
+        if renderer is not None:
+            for preset in self.__explosions.presets:
+                asset_cache.load_frames(preset.image_path, preset.frame_count, preset.size)
+
+        # Import sound
+        self.__pop_sound = load_sound("audio/pop.wav", 0.4)
+        self.__explosions_sound = load_sound("audio/explosion.wav", 0.7)
+        self.__profiler = None
+        self.__memory_tracker = None
+
+    @property
+    def width(self):
+        """Get the width of the game screen."""
+        return self.__width
+
+    @property
+    def height(self):
+        """Get the height of the game screen."""
+        return self.__height
+
+    @property
+    def clock(self):
+        """Get the clock advanced by every tick."""
+        return self.__clock
+
+    @property
+    def scheduler(self):
+        """Get the scheduler running the timers of the game, e.g. for level events."""
+        return self.__scheduler
+
+    @property
+    def is_paused(self):
+        """Check whether the game is paused."""
+        return self.__scheduler.is_paused
+
+    @property
+    def tick_count(self):
+        """Get the number of simulation ticks since the current game started."""
+        return self.__clock.ticks
+
+    @property
+    def projectiles(self):
+        """Get the backend storing the shots of the player and the aliens."""
+        return self.__projectiles
+
+    @property
+    def levels(self):
+        """Get the levels of the game."""
+        return self.__levels
+
+    @property
+    def level(self):
+        """Get the current level."""
+        return self.__levels[self.__level_index]
+
+    @property
+    def level_index(self):
+        """Get the index of the current level."""
+        return self.__level_index
+
+    @property
+    def previous_level(self):
+        """Get the level played before the current one."""
+        return self.__levels[self.__previous_level_index]
+
+    @property
+    def player(self):
+        """Get the player, or None before the first game."""
+        return self.__player
+
+    @property
+    def is_game_stopped(self):
+        """Check if the game is stopped, i.e. not started yet, won or lost."""
+        return self.__is_game_stopped
+
+    @property
+    def player_won(self):
+        """Check if the player has won the last game."""
+        return self.__player_won
+
+    @property
+    def explosions(self):
+        """Get the engine running the explosions."""
+        return self.__explosions
+
+    @property
+    def profiler(self):
+        """Get the profiler lapped by every tick, or None."""
+        return self.__profiler
+
+    @profiler.setter
+    def profiler(self, new_profiler):
+        """Set the profiler lapped by every tick, None to time nothing."""
+        self.__profiler = new_profiler
+
+    @property
+    def memory_tracker(self):
+        """Get the tracker recording the memory at every level start, or None."""
+        return self.__memory_tracker
+
+    @memory_tracker.setter
+    def memory_tracker(self, new_memory_tracker):
+        """Set the tracker recording the memory at every level start, None to record nothing."""
+        self.__memory_tracker = new_memory_tracker
+
+    def new_game(self, level_index=None, seed=None):
+        """
+        Starts a new game: restarts the clock, creates the player, resets the aliens and the bunkers and starts the
+        level music.
+
+        Parameters:
+        level_index (int, optional): the index of the level to play. Defaults to the current level.
+        seed (int, optional): seed the generator is reset with, making the game reproducible. Defaults to continuing
+        with the generator's current state.
+        """
+        if level_index is not None:
+            self.__level_index = level_index
+        if seed is not None:
+            self.__rng.seed(seed)
+        self.__clock.reset()
+        self.__scheduler.clear()
+        if self.__player is not None:
+            for weapon in self.__player.weapons:
+                weapon.release_shots()
+        self.__explosions.clear()
+        self.__player = Player((self.__width / 2, self.__height - 80), self.__width, self.__height, 10,
+                               self.__projectiles, self.__scheduler)
+        self.__player_sprite = pygame.sprite.GroupSingle(self.__player)
+
+        level = self.__levels[self.__level_index]
+        level.initialize_aliens()
+        level.game_music.play(loops=-1)
+        self.__is_game_stopped = False
+        self.__player_won = False
+        self.__next_alien_shot = self.__clock.time + level.alien_shooting_time
+        self.__scheduler.call_at(self.__next_alien_shot, self.__alien_fire)
+        if self.__memory_tracker is not None:
+            self.__memory_tracker.record_level_start(level.level_name)
+
+    def tick(self, actions=0):
+        """
+        Advances the game by one simulation tick. The timers due on the tick run after everything else moved. A
+        paused game does not advance.
+
+        Parameters:
+        actions (int, optional): the bitmask of the player's actions for this tick. Defaults to no action.
+        """
+        if self.__scheduler.is_paused:
+            return
+        if not self.__is_game_stopped:
+            level = self.__levels[self.__level_index]
+            profiler = self.__profiler
+            self.__player_sprite.update(actions)
+            if profiler is not None:
+                profiler.lap("player")
+            self.__check_collisions()
+            if profiler is not None:
+                profiler.lap("collisions")
+            level.update()
+            if profiler is not None:
+                profiler.lap("level")
+            self.__scheduler.run_due()
+            if profiler is not None:
+                profiler.lap("timers")
+        if self.__player is not None:
+            self.__check_victory_condition()
+            self.__check_player_health()
+        self.__clock.advance()
+
+    def pause(self):
+        """
+        Stops the game, e.g. while the menu is shown: ticks do nothing and no timer runs until resume() is called.
+        """
+        self.__scheduler.pause()
+
+    def resume(self):
+        """
+        Continues a paused game where it stopped.
+        """
+        self.__scheduler.resume()
+
+    def object_counts(self):
+        """
+        Returns the number of live objects of every kind, e.g. to see what a slow frame was busy with.
+
+        Returns:
+        dict: The number of aliens, bunkers, shots of every weapon and of the aliens, explosions and timers.
+        """
+        level = self.__levels[self.__level_index]
+        counts = {"aliens": level.alien_count, "bunkers": len(level.blocks)}
+        if self.__player is not None:
+            for weapon in self.__player.weapons:
+                counts[f"{weapon.weapon_name.lower()} shots"] = len(weapon.weapon_shots)
+        counts["alien shots"] = len(level.alien_weapons)
+        counts["explosions"] = len(self.__explosions)
+        counts["timers"] = len(self.__scheduler)
+        return counts
+
+    def state_hash(self):
+        """
+        Returns a digest of the state of the game: the clock, the player and its weapons, the aliens, the bunkers and
+        all shots. Two games that played out the same have the same digest, whichever backends they use.
+
+        Returns:
+        bytes: The 16-byte digest.
+        """
+        level = self.__levels[self.__level_index]
+        formation = level.formation
+        player = self.__player
+        rows, columns = formation.living_cells()
+        shot_groups = [weapon.weapon_shots for weapon in player.weapons] + [level.alien_weapons]
+        state = (
+            self.__clock.ticks, self.__level_index, self.__is_game_stopped, self.__player_won,
+            tuple(player.rect), player.health, player.score,
+            tuple((weapon.is_weapon_available, weapon.time) for weapon in player.weapons),
+            formation.offset, formation.direction, sorted(zip(map(int, rows), map(int, columns))),
+            sorted((tuple(bunker.rect), bunker.cells) for bunker in level.blocks),
+            tuple(sorted(tuple(map(int, shot)) for shot in group.snapshot()) for group in shot_groups),
+        )
+        return hashlib.blake2b(repr(state).encode(), digest_size=16).digest()
+
+    def __create_projectiles(self, projectile_backend):
+        """
+        A helper method to create the backend storing all shots. NumPy is only imported for the "array" backend.
+        """
+        if projectile_backend == "sprite":
+            return pooled_projectiles
+        if projectile_backend == "array":
+            from engine.weapon.bullet_engine import BulletEngine
+            return BulletEngine()
+        raise ValueError(f"Unknown projectile backend: {projectile_backend}")
+
+    def __alien_fire(self):
+        """
+        A helper method letting the aliens shoot, run by the scheduler every shooting time. The next shot is scheduled
+        a shooting time after this one was due, so the cadence does not drift with the tick rate.
+        """
+        level = self.__levels[self.__level_index]
+        level.alien_attack(self.__player.rect.centerx)
+        self.__next_alien_shot += level.alien_shooting_time
+        self.__scheduler.call_at(self.__next_alien_shot, self.__alien_fire)
+
+    def __explode(self, preset, center):
+        """
+        A helper method starting an explosion and scheduling the engine to cull it once it ended.
+
+        Returns:
+        pygame.Rect: The area covered by the explosion.
+        """
+        rect = self.__explosions.spawn(preset, center)
+        self.__scheduler.call_after_ticks(self.__explosions.lifetime(preset), self.__explosions.cull)
+        return rect
+
+    def __check_player_health(self):
+        """
+        Check if the player's health is less than or equal to zero, stop the game and set the appropriate flags.
+        """
+        if self.__player.health <= 0:
+            self.__is_game_stopped = True
+
+    def __check_victory_condition(self):
+        """
+        Check if the player has won the current level by destroying all aliens.
+        If either of the conditions is met, stop the game and set the appropriate flags.
+        """
+        if not self.__levels[self.__level_index].alien_count and not self.__player_won:
+            self.__levels[self.__level_index].game_music.stop()
+            self.__is_game_stopped = True
+            self.__previous_level_index = self.__level_index
+            self.__level_index += 1
+            self.__player_won = True
+            if self.__level_index >= len(self.__levels):
+                self.__level_index = 0
+
+    def __check_collisions(self):
+        """
+        This method checks for collisions between the player's weapons, cannon, alien's weapons and aliens.
+        It detects the type of weapon and based on that updates the score and sets explosions for different
+        weapons. If an alien laser collides with the player, the player's health decreases. The shots of every group
+        are tested against the targets in batch by the projectile backend, which kills the ones that hit something
+        once the group is done. Its three passes are traced as spans while the tracer is enabled.
+        """
+        level = self.__levels[self.__level_index]
+        target_rects = level.target_rects
+
+        # Check player lasers and cannon
+        tracer.begin("player shots", "collisions")
+        if self.__player.weapons:
+            for weapon in self.__player.weapons:
+                if isinstance(weapon, Cannon):
+                    weapon.weapon_shots.collide(target_rects, self.__cannonball_hit)
+                else:
+                    weapon.weapon_shots.collide(target_rects, self.__player_laser_hit)
+
+        tracer.end("player shots", "collisions")
+
+        # Check alien lasers
+        tracer.begin("alien shots", "collisions")
+        if level.alien_weapons:
+            level.alien_weapons.collide(target_rects + [self.__player.rect], self.__alien_laser_hit)
+
+        tracer.end("alien shots", "collisions")
+
+        # Check alien collisions
+        tracer.begin("aliens", "collisions")
+        if level.alien_count:
+            level.destroy_blocks_under_aliens()
+
+            if level.colliding_aliens(self.__player.rect):
+                self.__player.health = 0
+        tracer.end("aliens", "collisions")
+
+    def __cannonball_hit(self, rect):
+        """
+        A helper method letting a cannonball of the player hit the aliens and the bunkers. A hit makes an explosion
+        that destroys the blocks and kills the aliens around it.
+
+        Returns:
+        bool: True if the cannonball hit something and is used up, False otherwise.
+        """
+        level = self.__levels[self.__level_index]
+        alien_collisions = level.hit_aliens(rect)
+        block_collisions = level.destroy_blocks(rect)
+        if alien_collisions:
+            self.__player.score += 1
+        if not block_collisions and not alien_collisions:
+            return False
+        explosion_rect = self.__explode(CANNON_EXPLOSION, rect.topleft)
+        self.__explosions_sound.play()
+        level.destroy_blocks(explosion_rect)
+        self.__player.score += len(level.hit_aliens(explosion_rect))
+        return True
+
+    def __player_laser_hit(self, rect):
+        """
+        A helper method letting a laser of the player hit the bunkers and the aliens.
+
+        Returns:
+        bool: True if the laser hit something and is used up, False otherwise.
+        """
+        level = self.__levels[self.__level_index]
+        is_hit = False
+        if level.destroy_blocks(rect):
+            is_hit = True
+            self.__explode(LASER_EXPLOSION, rect.topleft)
+        if level.hit_aliens(rect):
+            is_hit = True
+            self.__player.score += 1
+            self.__pop_sound.play()
+            self.__explode(LASER_EXPLOSION, rect.topleft)
+        return is_hit
+
+    def __alien_laser_hit(self, rect):
+        """
+        A helper method letting a laser of the aliens hit the bunkers and the player.
+
+        Returns:
+        bool: True if the laser hit something and is used up, False otherwise.
+        """
+        level = self.__levels[self.__level_index]
+        is_hit = False
+        if level.destroy_blocks(rect):
+            is_hit = True
+            self.__pop_sound.play()
+            self.__explode(LASER_EXPLOSION, rect.topleft)
+        if self.__player.rect.colliderect(rect):
+            is_hit = True
+            self.__player.health -= level.alien_damage
+            self.__pop_sound.play()
+            self.__explode(LASER_EXPLOSION, rect.topleft)
+        return is_hit
@@ -0,0 +1,145 @@
+"""
+Level balance sweeps: headless games over a grid of level settings, spread over all cores.
+
+A grid maps level fields of config.json to the values to try, e.g.
+
+    {"alien_rows": [4, 6], "alien_shooting_time": [400, 600, 1200]}
+
+Every combination of values is one run of several games, played by a policy in a worker process. Workers are
+reused across runs and load the assets once, when they start. Results are yielded as soon as a run finishes:
+
+    python main.py --sweep grid.json --games 20 --policy sweep
+"""
+import itertools
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from engine.simulation.headless import create_headless_session, play_game
+from engine.simulation.policies import SweepPolicy
+
+SWEEP_FIELDS = ("alien_rows", "alien_columns", "alien_damage", "alien_shooting_time", "alien_shooting_policy",
+                "obstacle_amount")
+
+SweepResult = namedtuple("SweepResult", ["settings", "games", "wins", "win_rate", "clear_time", "damage_taken",
+                                         "score", "ticks"])
+
+# The state of a worker process, set once by _initialize_worker()
+_worker = {}
+
+
+def expand_grid(grid):
+    """
+    Returns every combination of the values of a grid.
+
+    Parameters:
+    grid (dict): The values to try for every level field.
+
+    Returns:
+    list of dict: The settings of every run, in grid order.
+    """
+    for field in grid:
+        if field not in SWEEP_FIELDS:
+            raise ValueError(f"Unknown level field: {field}")
+    fields = list(grid)
+    return [dict(zip(fields, values)) for values in itertools.product(*(grid[field] for field in fields))]
+
+
+def _initialize_worker(config, level_index, create_policy, max_ticks):
+    """
+    Prepares a worker process: stores the sweep's settings and creates a headless session once, which loads the
+    images of the game into the worker's asset cache. The mixer is never initialized.
+    """
+    create_headless_session(config)
+    _worker.update(config=config, level_index=level_index, create_policy=create_policy, max_ticks=max_ticks)
+
+
+def _run_settings(settings, games):
+    """
+    Plays the games of one run in a worker process.
+
+    Parameters:
+    settings (dict): The level fields changed by the run.
+    games (int): The number of games to play.
+
+    Returns:
+    SweepResult: The aggregated results of the games.
+    """
+    config = _worker["config"]
+    level = dict(config["levels"][_worker["level_index"]], **settings)
+    session = create_headless_session(dict(config, levels=[level]))
+    results = [play_game(session, _worker["create_policy"](), 0, _worker["max_ticks"]) for _ in range(games)]
+
+    wins = [result for result in results if result.won]
+    tick_rate = session.clock.tick_rate
+    clear_time = sum(result.ticks for result in wins) / len(wins) / tick_rate if wins else None
+    damage_taken = sum(100 - result.health for result in results) / games
+    score = sum(result.score for result in results) / games
+    return SweepResult(settings, games, len(wins), len(wins) / games, clear_time, damage_taken, score,
+                       sum(result.ticks for result in results))
+
+
+def sweep(config, grid, games=10, level_index=0, create_policy=SweepPolicy, max_ticks=None, workers=None):
+    """
+    Runs every combination of a grid in a process pool and yields the results as the runs finish.
+
+    Parameters:
+    config (dict): The game configuration, as found in config.json.
+    grid (dict): The values to try for every level field, see SWEEP_FIELDS.
+    games (int, optional): The number of games per run. Defaults to 10.
+    level_index (int, optional): The index of the level the grid changes. Defaults to 0.
+    create_policy (callable, optional): Creates the policy of every game. It is sent to the workers, so it must be
+    picklable, e.g. a policy class or a functools.partial. Defaults to SweepPolicy.
+    max_ticks (int, optional): The maximum length of a game in ticks. Defaults to no limit.
+    workers (int, optional): The number of worker processes. Defaults to the number of cores.
+
+    Yields:
+    SweepResult: The results of every run, in the order the runs finish.
+    """
+    runs = expand_grid(grid)
+    workers = min(workers or os.cpu_count() or 1, len(runs))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_initialize_worker,
+                             initargs=(config, level_index, create_policy, max_ticks)) as executor:
+        futures = [executor.submit(_run_settings, settings, games) for settings in runs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def format_result(result):
+    """
+    Formats the results of one run as a line of the sweep report.
+
+    Parameters:
+    result (SweepResult): The results of the run.
+
+    Returns:
+    str: The formatted line.
+    """
+    settings = " ".join(f"{field}={value}" for field, value in result.settings.items())
+    clear_time = f"{result.clear_time:.1f} s" if result.clear_time is not None else "-"
+    return (f"{settings:<50} win rate {result.win_rate:>6.1%}  clear time {clear_time:>8}  "
+            f"damage {result.damage_taken:>5.1f}  score {result.score:>6.1f}")
+
+
+def format_report(results, grid):
+    """
+    Formats the results of a sweep, sorted in grid order, followed by the easiest and the hardest setting.
+
+    Parameters:
+    results (list of SweepResult): The results of all runs.
+    grid (dict): The grid of the sweep.
+
+    Returns:
+    str: The formatted report.
+    """
+    order = [tuple(settings.items()) for settings in expand_grid(grid)]
+    results = sorted(results, key=lambda result: order.index(tuple(result.settings.items())))
+    lines = [format_result(result) for result in results]
+    if results:
+        easiest = max(results, key=lambda result: (result.win_rate, -result.damage_taken))
+        hardest = min(results, key=lambda result: (result.win_rate, -result.damage_taken))
+        lines.append(f"{len(results)} runs, {sum(result.games for result in results)} games, "
+                     f"{sum(result.ticks for result in results)} ticks")
+        lines.append(f"easiest: {format_result(easiest)}")
+        lines.append(f"hardest: {format_result(hardest)}")
+    return "\n".join(lines)
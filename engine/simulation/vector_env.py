@@ -0,0 +1,720 @@
+"""
+Many games of one level simulated in lockstep with NumPy.
+
+BatchGame stacks the state of N independent games along a batch dimension: the alien grids, the formations' offsets,
+the bunkers' block grids, the player, the weapons and a fixed number of shot slots per game. Every tick moves,
+fires and collides all games at once with array operations, so there is no Python loop over the games. VectorEnv
+wraps it in the API of SpaceWarriorsEnv, batched, for training bots at high throughput.
+
+The rules are the ones of GameSession, with two simplifications: shots of the same kind (cannonballs, red lasers,
+blue lasers or alien lasers) hitting the same alien or block in the same tick all count, where GameSession lets the
+first one fired take it, and explosions are not animated since they only matter on the tick of the hit. The
+geometry of the level (the player, the formation and the bunkers) is read from a reference GameSession, so both
+stay in sync.
+"""
+import numpy as np
+
+from engine.assets.asset_cache import asset_cache
+from engine.enemy.formation import Formation
+from engine.simulation.actions import LEFT, RIGHT, CANNON, RED_LASER, BLUE_LASER
+from engine.simulation.headless import create_headless_session
+from engine.weapon.laser.lasersprite import LaserSprite
+from engine.weapon.projectile import Projectile
+
+
+class BatchGame:
+    """
+    N games of the same level, advanced together one tick at a time.
+
+    Shots are stored in SHOT_KINDS slots per game: the cannonballs, the red and blue lasers of the player and the
+    lasers of the aliens. A shot fired while all slots of its game are taken is dropped.
+
+    Attributes:
+        __count (int): The number of games.
+        __width, __height (int): The size of the screen.
+        __tick_rate (int): The number of ticks per simulated second.
+        __rng (numpy.random.Generator): The generator picking the shooting aliens.
+        __player_y, __player_size, __player_start, __player_speed: The geometry of the player.
+        __cooldowns (numpy.ndarray): The cooldown of every weapon of the player in milliseconds.
+        __fire_offsets (numpy.ndarray): The top-left corner of every player shot relative to the player's center.
+        __shot_sizes, __shot_speeds (numpy.ndarray): The size and speed of every shot kind.
+        __formation_start, __spacing, __alien_size, __formation_speed, __descent: The geometry of the formation.
+        __bunker_x, __bunker_y (numpy.ndarray): The top-left corner of every bunker.
+        __block_size (int): The size of a bunker block.
+        __initial_blocks (numpy.ndarray): The block grid of every bunker at the start of a game.
+        __alien_damage (int): The damage an alien laser deals.
+        __shooting_time (int): The time between the aliens' shots in milliseconds.
+        __shooting_policy (str): How the alien that shoots is picked, one of Formation.SHOOTING_POLICIES.
+        __ticks, __running, __won, __score, __health, __player_x, __available, __fired_at, __next_alien_shot: The
+        per-game state of the games and their players, shape (N,) or (N, 3).
+        __alive (numpy.ndarray): The living aliens of every game, shape (N, rows, columns).
+        __offset (numpy.ndarray): The offset of every formation, shape (N, 2).
+        __direction (numpy.ndarray): The horizontal movement of every formation, shape (N,).
+        __blocks (numpy.ndarray): The standing blocks of every game, shape (N, bunkers, rows, columns).
+        __shot_x, __shot_y, __shot_kind, __shot_alive (numpy.ndarray): The shot slots of every game, shape (N, S).
+
+    Methods:
+        reset(games, seed): Starts new games.
+        tick(actions): Advances all running games by one tick.
+        time(): Returns the simulated time of every game.
+    """
+    KIND_CANNONBALL = 0
+    KIND_RED_LASER = 1
+    KIND_BLUE_LASER = 2
+    KIND_ALIEN_LASER = 3
+    SHOT_KINDS = 4
+
+    FIRE_ACTIONS = (CANNON, RED_LASER, BLUE_LASER)
+    FIRE_OFFSETS = ((0, -64), (-51.5, -32), (51.5, -32))
+    SHOT_SPEEDS = (7, 15, 15, Formation.LASER_SPEED)
+    EXPLOSION_SIZE = 150
+
+    def __init__(self, config, count, level_index=0, max_shots=16, seed=None, tick_rate=None):
+        """
+        Creates N games of the given level. All games start right away.
+
+        Parameters:
+        config (dict): The game configuration, as found in config.json.
+        count (int): The number of games.
+        level_index (int, optional): The index of the level all games are played on. Defaults to 0.
+        max_shots (int, optional): The number of shot slots of every game. Defaults to 16.
+        seed (int, optional): The seed of the generator picking the shooting aliens. Defaults to a random seed.
+        tick_rate (int, optional): The number of ticks per simulated second. Defaults to the configured tick rate.
+        """
+        reference = create_headless_session(config, "sprite", tick_rate)
+        reference.new_game(level_index)
+        level = reference.level
+        player = reference.player
+        formation = level.formation
+
+        self.__count = count
+        self.__width = reference.width
+        self.__height = reference.height
+        self.__tick_rate = reference.clock.tick_rate
+        self.__rng = np.random.default_rng(seed)
+
+        # Player and weapons
+        self.__player_y = player.rect.y
+        self.__player_size = player.rect.size
+        self.__player_start = player.rect.x
+        self.__player_speed = player.speed
+        self.__cooldowns = np.array([weapon.cooldown for weapon in player.weapons], dtype=np.int64)
+        cannonball_size = asset_cache.load_image("resources/cannonball.png").get_size()
+        self.__shot_sizes = np.array([cannonball_size, LaserSprite.SIZE, LaserSprite.SIZE, LaserSprite.SIZE],
+                                     dtype=np.int32)
+        self.__shot_speeds = np.array(self.SHOT_SPEEDS, dtype=np.int32)
+        center = player.rect.center
+        fire_offsets = []
+        for kind, (x, y) in enumerate(self.FIRE_OFFSETS):
+            rect = player.rect.copy()
+            rect.size = self.__shot_sizes[kind].tolist()
+            rect.center = (center[0] + x, center[1] + y)
+            fire_offsets.append((rect.x - center[0], rect.y - center[1]))
+        self.__fire_offsets = np.array(fire_offsets, dtype=np.int32)
+
+        # Formation
+        self.__formation_start = formation.start
+        self.__spacing = formation.spacing
+        self.__alien_size = formation.alien_size
+        self.__formation_speed = formation.speed
+        self.__descent = formation.descent
+        rows, columns = formation.shape
+
+        # Bunkers
+        bunkers = level.blocks.sprites()
+        block_rows, block_columns = bunkers[0].shape if bunkers else (0, 0)
+        self.__bunker_x = np.array([bunker.rect.x for bunker in bunkers], dtype=np.int32)
+        self.__bunker_y = np.array([bunker.rect.y for bunker in bunkers], dtype=np.int32)
+        self.__block_size = bunkers[0].block_size if bunkers else 1
+        self.__initial_blocks = np.array([[[bunker.is_block_standing(row, column) for column in range(block_columns)]
+                                           for row in range(block_rows)] for bunker in bunkers],
+                                         dtype=bool).reshape(len(bunkers), block_rows, block_columns)
+
+        self.__alien_damage = level.alien_damage
+        self.__shooting_time = level.alien_shooting_time
+        self.__shooting_policy = level.alien_shooting_policy
+        level.game_music.stop()
+
+        # Per-game state
+        self.__ticks = np.zeros(count, dtype=np.int64)
+        self.__running = np.zeros(count, dtype=bool)
+        self.__won = np.zeros(count, dtype=bool)
+        self.__score = np.zeros(count, dtype=np.int32)
+        self.__health = np.zeros(count, dtype=np.int32)
+        self.__player_x = np.zeros(count, dtype=np.int32)
+        self.__available = np.zeros((count, len(self.FIRE_ACTIONS)), dtype=bool)
+        self.__fired_at = np.zeros((count, len(self.FIRE_ACTIONS)), dtype=np.int64)
+        self.__next_alien_shot = np.zeros(count, dtype=np.int64)
+        self.__alive = np.zeros((count, rows, columns), dtype=bool)
+        self.__offset = np.zeros((count, 2), dtype=np.int32)
+        self.__direction = np.zeros(count, dtype=np.int32)
+        self.__blocks = np.zeros((count,) + self.__initial_blocks.shape, dtype=bool)
+        self.__shot_x = np.zeros((count, max_shots), dtype=np.int32)
+        self.__shot_y = np.zeros((count, max_shots), dtype=np.int32)
+        self.__shot_kind = np.zeros((count, max_shots), dtype=np.int8)
+        self.__shot_alive = np.zeros((count, max_shots), dtype=bool)
+        self.reset()
+
+    def __len__(self):
+        """Get the number of games."""
+        return self.__count
+
+    @property
+    def running(self):
+        """Get the flags of the games still running, shape (N,)."""
+        return self.__running
+
+    @property
+    def won(self):
+        """Get the flags of the games the player won, shape (N,)."""
+        return self.__won
+
+    @property
+    def score(self):
+        """Get the score of every game, shape (N,)."""
+        return self.__score
+
+    @property
+    def health(self):
+        """Get the player's health in every game, shape (N,)."""
+        return self.__health
+
+    @property
+    def ticks(self):
+        """Get the number of ticks every game has been running, shape (N,)."""
+        return self.__ticks
+
+    @property
+    def player_x(self):
+        """Get the left edge of the player in every game, shape (N,)."""
+        return self.__player_x
+
+    @property
+    def player_size(self):
+        """Get the width and height of the player."""
+        return self.__player_size
+
+    @property
+    def alive(self):
+        """Get the living aliens of every game, shape (N, rows, columns)."""
+        return self.__alive
+
+    @property
+    def offset(self):
+        """Get the offset of every formation, shape (N, 2)."""
+        return self.__offset
+
+    @property
+    def direction(self):
+        """Get the horizontal movement of every formation, shape (N,)."""
+        return self.__direction
+
+    @property
+    def blocks(self):
+        """Get the standing bunker blocks of every game, shape (N, bunkers, rows, columns)."""
+        return self.__blocks
+
+    @property
+    def shot_sizes(self):
+        """Get the width and height of every shot kind, shape (SHOT_KINDS, 2)."""
+        return self.__shot_sizes
+
+    @property
+    def shot_speeds(self):
+        """Get the speed of every shot kind, shape (SHOT_KINDS,)."""
+        return self.__shot_speeds
+
+    @property
+    def shots(self):
+        """Get the shot slots of every game as the x, y, kind and alive arrays, each of shape (N, S)."""
+        return self.__shot_x, self.__shot_y, self.__shot_kind, self.__shot_alive
+
+    def time(self):
+        """
+        Returns the simulated time of every game in whole milliseconds, like SimClock.time.
+
+        Returns:
+        numpy.ndarray: The time of every game, shape (N,).
+        """
+        return self.__ticks * 1000 // self.__tick_rate
+
+    def reload_progress(self):
+        """
+        Returns the reload progress of every weapon, between 0 (just fired) and 1 (available), like
+        Weapon.reload_progress.
+
+        Returns:
+        numpy.ndarray: The progress of every weapon of every game, shape (N, 3).
+        """
+        elapsed = self.time()[:, None] - self.__fired_at
+        return np.where(self.__available, 1, np.minimum(elapsed / self.__cooldowns, 1))
+
+    def reset(self, games=None, seed=None):
+        """
+        Starts new games, replacing the given ones.
+
+        Parameters:
+        games (numpy.ndarray, optional): The flags of the games to restart, shape (N,). Defaults to all games.
+        seed (int, optional): The seed the generator picking the shooting aliens is reset with. Defaults to
+        continuing with the generator's current state.
+        """
+        if games is None:
+            games = np.ones(self.__count, dtype=bool)
+        if seed is not None:
+            self.__rng = np.random.default_rng(seed)
+        self.__ticks[games] = 0
+        self.__running[games] = True
+        self.__won[games] = False
+        self.__score[games] = 0
+        self.__health[games] = 100
+        self.__player_x[games] = self.__player_start
+        self.__available[games] = True
+        self.__fired_at[games] = 0
+        self.__next_alien_shot[games] = self.__shooting_time
+        self.__alive[games] = True
+        self.__offset[games] = 0
+        self.__direction[games] = self.__formation_speed
+        self.__blocks[games] = self.__initial_blocks
+        self.__shot_alive[games] = False
+
+    def tick(self, actions):
+        """
+        Advances all running games by one tick, in the order of GameSession.tick().
+
+        Parameters:
+        actions (numpy.ndarray or int): The bitmask of actions of every game, shape (N,), or one bitmask for all.
+        """
+        actions = np.broadcast_to(np.asarray(actions, dtype=np.int32), (self.__count,))
+        running = self.__running
+        now = self.time()
+
+        self.__update_players(actions, running, now)
+        self.__check_collisions(running)
+        self.__move_formations(running)
+        self.__move_shots(running, alien=True)
+        self.__alien_fire(running, now)
+
+        won = running & ~self.__alive.any(axis=(1, 2))
+        self.__won |= won
+        self.__running &= ~won & (self.__health > 0)
+        self.__ticks += 1
+
+    def __update_players(self, actions, running, now):
+        """
+        Moves the players, fires the weapons, keeps the players on the screen, reloads the weapons and moves the
+        players' shots, like Player.update().
+        """
+        left = running & (actions & LEFT != 0)
+        right = running & ~left & (actions & RIGHT != 0)
+        self.__player_x += (right.astype(np.int32) - left) * self.__player_speed
+
+        center_x = self.__player_x + self.__player_size[0] // 2
+        center_y = np.full(self.__count, self.__player_y + self.__player_size[1] // 2)
+        for kind, action in enumerate(self.FIRE_ACTIONS):
+            fired = running & (actions & action != 0) & self.__available[:, kind]
+            if fired.any():
+                self.__spawn(fired, kind, center_x + self.__fire_offsets[kind, 0], center_y + self.__fire_offsets[kind, 1])
+                self.__available[fired, kind] = False
+                self.__fired_at[fired, kind] = now[fired]
+
+        np.clip(self.__player_x, 0, self.__width - self.__player_size[0], out=self.__player_x)
+        self.__available |= running[:, None] & (now[:, None] - self.__fired_at >= self.__cooldowns)
+        self.__move_shots(running, alien=False)
+
+    def __move_shots(self, running, alien):
+        """
+        Moves the shots of the players or of the aliens and culls the ones that left the screen, like
+        Projectile.update().
+        """
+        is_alien = self.__shot_kind == self.KIND_ALIEN_LASER
+        moving = self.__shot_alive & running[:, None] & (is_alien if alien else ~is_alien)
+        self.__shot_y -= np.where(moving, self.__shot_speeds[self.__shot_kind], 0).astype(np.int32)
+        culled = moving & ((self.__shot_y <= -50) | (self.__shot_y >= self.__height + 30))
+        self.__shot_alive &= ~culled
+
+    def __spawn(self, games, kind, x, y):
+        """
+        Puts a new shot into the first free slot of every flagged game.
+
+        Parameters:
+        games (numpy.ndarray): The flags of the games firing, shape (N,).
+        kind (int): The kind of the shots.
+        x, y (numpy.ndarray): The top-left corner of the shot in every game, shape (N,).
+        """
+        indices = np.flatnonzero(games)
+        free = ~self.__shot_alive[indices]
+        slots = free.argmax(axis=1)
+        has_slot = free[np.arange(len(indices)), slots]
+        indices, slots = indices[has_slot], slots[has_slot]
+        self.__shot_x[indices, slots] = x[indices]
+        self.__shot_y[indices, slots] = y[indices]
+        self.__shot_kind[indices, slots] = kind
+        self.__shot_alive[indices, slots] = True
+
+    def __check_collisions(self, running):
+        """
+        Collides the shots, the aliens, the bunkers and the players, like GameSession.__check_collisions(): the
+        cannonballs first, then the red and the blue lasers and finally the aliens' lasers.
+        """
+        for kind in (self.KIND_CANNONBALL, self.KIND_RED_LASER, self.KIND_BLUE_LASER, self.KIND_ALIEN_LASER):
+            games, slots = np.nonzero(self.__shot_alive & running[:, None] & (self.__shot_kind == kind))
+            if not len(games):
+                continue
+            x = self.__shot_x[games, slots]
+            y = self.__shot_y[games, slots]
+            width, height = self.__shot_sizes[kind].tolist()
+
+            if kind == self.KIND_ALIEN_LASER:
+                destroyed = self.__destroy_blocks(games, x, y, width, height)
+                player_x = self.__player_x[games]
+                hit = ((x < player_x + self.__player_size[0]) & (x + width > player_x) &
+                       (y < self.__player_y + self.__player_size[1]) & (y + height > self.__player_y))
+                np.subtract.at(self.__health, games[hit], self.__alien_damage)
+                self.__shot_alive[games[hit | (destroyed > 0)], slots[hit | (destroyed > 0)]] = False
+            elif kind == self.KIND_CANNONBALL:
+                killed = self.__hit_aliens(games, x, y, width, height)
+                destroyed = self.__destroy_blocks(games, x, y, width, height)
+                np.add.at(self.__score, games, killed > 0)
+                exploded = (killed > 0) | (destroyed > 0)
+                self.__shot_alive[games[exploded], slots[exploded]] = False
+                size = self.EXPLOSION_SIZE
+                games, x, y = games[exploded], x[exploded] - size // 2, y[exploded] - size // 2
+                self.__destroy_blocks(games, x, y, size, size)
+                np.add.at(self.__score, games, self.__hit_aliens(games, x, y, size, size))
+            else:
+                destroyed = self.__destroy_blocks(games, x, y, width, height)
+                killed = self.__hit_aliens(games, x, y, width, height)
+                np.add.at(self.__score, games, killed > 0)
+                hit = (destroyed > 0) | (killed > 0)
+                self.__shot_alive[games[hit], slots[hit]] = False
+
+        # Aliens destroy the blocks they overlap and kill the player they touch
+        games = np.flatnonzero(running)
+        start_x, start_y = self.__formation_start
+        x_spacing, y_spacing = self.__spacing
+        alien_width, alien_height = self.__alien_size
+        if len(self.__bunker_y):
+            rows = np.arange(self.__alive.shape[1])
+            row_y = start_y + rows * y_spacing
+            band_top = self.__bunker_y.min()
+            band_bottom = self.__bunker_y.max() + self.__initial_blocks.shape[1] * self.__block_size
+            row_y = row_y[None, :] + self.__offset[games, 1:2]
+            in_band = (row_y < band_bottom) & (row_y + alien_height > band_top)
+            alien_games, alien_rows, alien_columns = np.nonzero(self.__alive[games] & in_band[:, :, None])
+            if len(alien_games):
+                alien_games = games[alien_games]
+                x = start_x + alien_columns * x_spacing + self.__offset[alien_games, 0]
+                y = start_y + alien_rows * y_spacing + self.__offset[alien_games, 1]
+                self.__destroy_blocks(alien_games, x, y, alien_width, alien_height)
+
+        player_width, player_height = self.__player_size
+        touching = self.__hit_aliens(games, self.__player_x[games], np.full(len(games), self.__player_y),
+                                     player_width, player_height, kill=False)
+        self.__health[games[touching > 0]] = 0
+
+    def __hit_aliens(self, games, x, y, width, height, kill=True):
+        """
+        Kills the aliens overlapped by one rect per entry, using the same overlap rule as pygame.Rect.colliderect.
+
+        Parameters:
+        games (numpy.ndarray): The game of every rect, shape (K,).
+        x, y (numpy.ndarray): The top-left corner of every rect, shape (K,).
+        width, height (int): The size of the rects.
+        kill (bool, optional): Whether the aliens are killed or only counted. Defaults to True.
+
+        Returns:
+        numpy.ndarray: The number of aliens every rect overlaps, shape (K,).
+        """
+        if not len(games):
+            return np.zeros(0, dtype=np.int64)
+        start_x, start_y = self.__formation_start
+        x_spacing, y_spacing = self.__spacing
+        alien_width, alien_height = self.__alien_size
+        rows, columns = self.__alive.shape[1:]
+        left = (x - self.__offset[games, 0] - start_x)[:, None]
+        top = (y - self.__offset[games, 1] - start_y)[:, None]
+        column_x = np.arange(columns) * x_spacing
+        row_y = np.arange(rows) * y_spacing
+        overlapped_columns = (column_x < left + width) & (column_x + alien_width > left)
+        overlapped_rows = (row_y < top + height) & (row_y + alien_height > top)
+        overlapped = overlapped_rows[:, :, None] & overlapped_columns[:, None, :] & self.__alive[games]
+        counts = overlapped.sum(axis=(1, 2))
+        if kill:
+            self.__clear(self.__alive, games, overlapped, counts)
+        return counts
+
+    def __destroy_blocks(self, games, x, y, width, height):
+        """
+        Destroys the bunker blocks overlapped by one rect per entry, using the same overlap rule as
+        pygame.Rect.colliderect.
+
+        Parameters:
+        games (numpy.ndarray): The game of every rect, shape (K,).
+        x, y (numpy.ndarray): The top-left corner of every rect, shape (K,).
+        width, height (int): The size of the rects.
+
+        Returns:
+        numpy.ndarray: The number of blocks every rect destroyed, shape (K,).
+        """
+        destroyed = np.zeros(len(games), dtype=np.int64)
+        if not len(games) or not len(self.__bunker_x):
+            return destroyed
+        block_rows, block_columns = self.__initial_blocks.shape[1:]
+        size = self.__block_size
+        near = (y < self.__bunker_y.max() + block_rows * size) & (y + height > self.__bunker_y.min())
+        if not near.any():
+            return destroyed
+        near_games = games[near]
+        left = x[near, None, None]
+        top = y[near, None, None]
+        column_x = self.__bunker_x[:, None] + np.arange(block_columns) * size
+        row_y = self.__bunker_y[:, None] + np.arange(block_rows) * size
+        overlapped_columns = (column_x < left + width) & (column_x + size > left)
+        overlapped_rows = (row_y < top + height) & (row_y + size > top)
+        overlapped = overlapped_rows[:, :, :, None] & overlapped_columns[:, :, None, :] & self.__blocks[near_games]
+        destroyed[near] = overlapped.sum(axis=(1, 2, 3))
+        self.__clear(self.__blocks, near_games, overlapped, destroyed[near])
+        return destroyed
+
+    @staticmethod
+    def __clear(cells, games, overlapped, counts):
+        """
+        Clears the overlapped cells of the given games. Several entries may belong to the same game, so the masks
+        are merged per game before they are applied.
+
+        Parameters:
+        cells (numpy.ndarray): The cells of all games, e.g. the living aliens, shape (N, ...).
+        games (numpy.ndarray): The game of every mask, shape (K,).
+        overlapped (numpy.ndarray): The cells to clear, shape (K, ...).
+        counts (numpy.ndarray): The number of cells set in every mask, shape (K,).
+        """
+        hit = counts > 0
+        if not hit.any():
+            return
+        games, overlapped = games[hit], overlapped[hit]
+        order = np.argsort(games, kind="stable")
+        games, overlapped = games[order], overlapped[order]
+        unique_games, starts = np.unique(games, return_index=True)
+        cells[unique_games] &= ~np.logical_or.reduceat(overlapped, starts, axis=0)
+
+    def __move_formations(self, running):
+        """
+        Moves the formations and bounces them off the screen edges, like Formation.update().
+        """
+        moving = running & self.__alive.any(axis=(1, 2))
+        self.__offset[:, 0] += np.where(moving, self.__direction, 0).astype(np.int32)
+
+        living_columns = self.__alive.any(axis=1)
+        columns = living_columns.shape[1]
+        first_column = living_columns.argmax(axis=1)
+        last_column = columns - 1 - living_columns[:, ::-1].argmax(axis=1)
+        start_x = self.__formation_start[0] + self.__offset[:, 0]
+        left = start_x + first_column * self.__spacing[0]
+        right = start_x + last_column * self.__spacing[0] + self.__alien_size[0]
+
+        bounce_right = moving & (right >= self.__width)
+        bounce_left = moving & ~bounce_right & (left <= 0)
+        self.__direction[bounce_right] = -self.__formation_speed
+        self.__direction[bounce_left] = self.__formation_speed
+        self.__offset[bounce_right | bounce_left, 1] += self.__descent
+
+    def __alien_fire(self, running, now):
+        """
+        Lets the alien picked by the shooting policy of every game shoot once for every shooting time passed, like
+        GameSession.__alien_fire().
+        """
+        while True:
+            due = running & (now >= self.__next_alien_shot)
+            if not due.any():
+                return
+            shooting = due & self.__alive.any(axis=(1, 2))
+            if shooting.any():
+                rows, columns = self.__shooter_cells()
+                width, height = self.__shot_sizes[self.KIND_ALIEN_LASER].tolist()
+                center_x = (self.__formation_start[0] + columns * self.__spacing[0] + self.__offset[:, 0] +
+                            self.__alien_size[0] // 2)
+                center_y = (self.__formation_start[1] + rows * self.__spacing[1] + self.__offset[:, 1] +
+                            self.__alien_size[1] // 2)
+                self.__spawn(shooting, self.KIND_ALIEN_LASER, center_x - width // 2, center_y - height // 2)
+            self.__next_alien_shot[due] += self.__shooting_time
+
+    def __shooter_cells(self):
+        """
+        Picks the alien that shoots next in every game, like Formation.shooter_cell(). The picks of games without
+        living aliens are meaningless.
+
+        Returns:
+        tuple: The rows and columns (numpy.ndarray) of the aliens, shape (N,).
+        """
+        alive = self.__alive
+        rows = alive.shape[1]
+        if self.__shooting_policy == "random":
+            living = alive.reshape(self.__count, -1)
+            picks = (self.__rng.random(self.__count) * living.sum(axis=1)).astype(np.int64)
+            cells = (living.cumsum(axis=1) > picks[:, None]).argmax(axis=1)
+            return np.divmod(cells, alive.shape[2])
+
+        living_columns = alive.any(axis=1)
+        column_indices = np.arange(living_columns.shape[1])
+        if self.__shooting_policy == "front_line":
+            picks = (self.__rng.random(self.__count) * living_columns.sum(axis=1)).astype(np.int64)
+            columns = (living_columns.cumsum(axis=1) > picks[:, None]).argmax(axis=1)
+        else:
+            first_column = living_columns.argmax(axis=1)
+            last_column = living_columns.shape[1] - 1 - living_columns[:, ::-1].argmax(axis=1)
+            player_x = self.__player_x + self.__player_size[0] // 2
+            targets = np.round((player_x - self.__formation_start[0] - self.__offset[:, 0] -
+                                self.__alien_size[0] / 2) / self.__spacing[0])
+            targets = np.clip(targets, first_column, last_column)
+            if self.__shooting_policy == "weighted":
+                targets = np.round(self.__rng.triangular(first_column - 0.5, targets, last_column + 0.5))
+                targets = np.clip(targets, first_column, last_column)
+            # The nearest living column, the left one on a tie
+            distances = np.abs(column_indices - targets[:, None])
+            columns = np.where(living_columns, distances, np.inf).argmin(axis=1)
+
+        front_rows = rows - 1 - alive[np.arange(self.__count), ::-1, columns].argmax(axis=1)
+        return front_rows, columns
+
+
+class VectorEnv:
+    """
+    N games of Space Warriors as one environment, stepped with one action per game.
+
+    The observations are the ones of SpaceWarriorsEnv with a leading batch dimension, including its layout of the
+    projectiles: the living shots come first, the cannonballs, red lasers, blue lasers and alien lasers in turn, and
+    the rest is zero padded. Games that end are restarted within the same step, so the observation of a finished game
+    is the first one of its next game; the outcome of the finished game is reported in the info dict. The observation
+    arrays are overwritten by every step.
+
+    Attributes:
+        __games (BatchGame): The games.
+        __max_steps (int): The number of steps after which a game is truncated, or None.
+        __steps (numpy.ndarray): The number of steps of every game.
+        __observation (dict): The observation arrays.
+
+    Methods:
+        reset(seed, options): Restarts all games.
+        step(actions): Applies one action per game and advances all games.
+    """
+    def __init__(self, config, count, level_index=0, max_steps=None, max_shots=16, seed=None):
+        """
+        Creates the environment.
+
+        Parameters:
+        config (dict): The game configuration, as found in config.json.
+        count (int): The number of games.
+        level_index (int, optional): The index of the level all games are played on. Defaults to 0.
+        max_steps (int, optional): The number of steps after which a game is truncated. Defaults to no limit.
+        max_shots (int, optional): The number of shot slots of every game. Defaults to 16.
+        seed (int, optional): The seed of the generator picking the shooting aliens. Defaults to a random seed.
+        """
+        self.__games = BatchGame(config, count, level_index, max_shots, seed)
+        self.__max_steps = max_steps
+        self.__steps = np.zeros(count, dtype=np.int64)
+        rows, columns = self.__games.alive.shape[1:]
+        self.__observation = {
+            "aliens": np.zeros((count, rows, columns), dtype=np.uint8),
+            "formation": np.zeros((count, 3), dtype=np.float32),
+            "projectiles": np.zeros((count, max_shots, 4), dtype=np.float32),
+            "player": np.zeros((count, 5), dtype=np.float32),
+        }
+
+    def __len__(self):
+        """Get the number of games."""
+        return len(self.__games)
+
+    @property
+    def games(self):
+        """Get the games."""
+        return self.__games
+
+    def reset(self, seed=None, options=None):
+        """
+        Restarts all games.
+
+        Parameters:
+        seed (int, optional): The seed the generator picking the shooting aliens is reset with, making the games
+        reproducible. Defaults to continuing with the generator's current state.
+        options (dict, optional): Unused, accepted like in Gymnasium. Defaults to None.
+
+        Returns:
+        tuple: The first observation and the info dict.
+        """
+        self.__games.reset(seed=seed)
+        self.__steps[:] = 0
+        return self.__observe(), self.__info(np.zeros(len(self), dtype=bool))
+
+    def step(self, actions):
+        """
+        Applies one action per game for one tick.
+
+        Parameters:
+        actions (numpy.ndarray): The bitmask of actions of every game, shape (N,).
+
+        Returns:
+        tuple: The observation, the rewards, the flags of the games that ended, the flags of the games that were
+        truncated and the info dict, which holds the score, outcome and length of the games that ended or were
+        truncated.
+        """
+        games = self.__games
+        score = games.score.copy()
+        games.tick(actions)
+        self.__steps += 1
+
+        rewards = games.score - score
+        terminated = ~games.running
+        truncated = ~terminated & (self.__steps >= self.__max_steps) if self.__max_steps is not None else \
+            np.zeros(len(self), dtype=bool)
+        info = self.__info(terminated | truncated)
+
+        finished = terminated | truncated
+        if finished.any():
+            games.reset(finished)
+            self.__steps[finished] = 0
+        return self.__observe(), rewards, terminated, truncated, info
+
+    def __observe(self):
+        """
+        Fills the observation arrays from the state of the games.
+
+        Returns:
+        dict: The observation arrays.
+        """
+        games = self.__games
+        observation = self.__observation
+        observation["aliens"][:] = games.alive
+        observation["formation"][:, :2] = games.offset
+        observation["formation"][:, 2] = games.direction
+
+        # Pack the living shots first, grouped by kind like the weapons of SpaceWarriorsEnv, and the free slots last
+        x, y, kind, alive = games.shots
+        order = np.argsort(np.where(alive, kind, BatchGame.SHOT_KINDS), axis=1, kind="stable")
+        x, y, kind, alive = (np.take_along_axis(array, order, axis=1) for array in (x, y, kind, alive))
+        sizes = games.shot_sizes[kind]
+        projectiles = observation["projectiles"]
+        projectiles[:, :, 0] = x + sizes[:, :, 0] // 2
+        projectiles[:, :, 1] = y + sizes[:, :, 1] // 2
+        projectiles[:, :, 2] = games.shot_speeds[kind]
+        projectiles[:, :, 3] = np.where(kind == BatchGame.KIND_ALIEN_LASER, Projectile.ALIEN, Projectile.PLAYER)
+        projectiles[~alive] = 0
+
+        player = observation["player"]
+        player[:, 0] = games.player_x + games.player_size[0] // 2
+        player[:, 1] = games.health
+        player[:, 2:] = games.reload_progress()
+        return observation
+
+    def __info(self, finished):
+        """
+        Returns the outcome of the games that ended or were truncated.
+
+        Parameters:
+        finished (numpy.ndarray): The flags of the games that ended or were truncated, shape (N,).
+
+        Returns:
+        dict: The flags of the finished games and their score, outcome and number of ticks.
+        """
+        games = self.__games
+        return {"finished": finished, "score": np.where(finished, games.score, 0),
+                "won": finished & games.won, "ticks": np.where(finished, games.ticks, 0)}
@@ -0,0 +1,607 @@
+import numpy as np
+import pygame
+
+from engine.assets.asset_cache import asset_cache
+from engine.weapon.laser.lasersprite import LaserSprite
+
+
+class Bullet:
+    """
+    A handle to one live bullet of a BulletEngine.
+
+    Handles are created on demand when a group is iterated and behave like projectile sprites for code working on
+    single shots: they have a rect and can be killed. The collision pass of the game uses collide() instead. The
+    rect is a snapshot taken when the handle was created. A handle remembers the generation of its slot, so killing
+    it after the slot was reused by another bullet does nothing.
+
+    Attributes:
+        rect (pygame.Rect): The rect of the bullet.
+        owner (int): Projectile.PLAYER or Projectile.ALIEN.
+        damage (int): The damage the bullet deals.
+        __engine (BulletEngine): The engine storing the bullet.
+        __index (int): The slot of the bullet in the engine's arrays.
+        __generation (int): The generation of the slot when the handle was created.
+    """
+    def __init__(self, engine, index, generation, rect, owner, damage):
+        """
+        Initializes a handle.
+
+        Parameters:
+        engine (BulletEngine): The engine storing the bullet.
+        index (int): The slot of the bullet in the engine's arrays.
+        generation (int): The generation of the slot.
+        rect (pygame.Rect): The rect of the bullet.
+        owner (int): Projectile.PLAYER or Projectile.ALIEN.
+        damage (int): The damage the bullet deals.
+        """
+        self.__engine = engine
+        self.__index = index
+        self.__generation = generation
+        self.rect = rect
+        self.owner = owner
+        self.damage = damage
+
+    def alive(self):
+        """
+        Checks if the bullet is still live.
+
+        Returns:
+        bool: True if the bullet was not killed or culled, False otherwise.
+        """
+        return self.__engine.is_alive(self.__index, self.__generation)
+
+    def kill(self):
+        """
+        Kills the bullet. Killing a bullet that is already dead does nothing.
+        """
+        self.__engine.kill(self.__index, self.__generation)
+
+
+class BulletGroup:
+    """
+    A view of the bullets fired by one weapon or by the aliens of a level, stored in a BulletEngine.
+
+    It is the array counterpart of PooledShotGroup and supports the parts of the pygame.sprite.Group interface the
+    game uses on shots: iteration, len(), truth testing, sprites() and update().
+
+    Attributes:
+        __engine (BulletEngine): The engine storing the bullets.
+        __group_id (int): The id of the group in the engine.
+        __owner (int): Projectile.PLAYER or Projectile.ALIEN.
+    """
+    def __init__(self, engine, group_id, owner):
+        """
+        Initializes a group.
+
+        Parameters:
+        engine (BulletEngine): The engine storing the bullets.
+        group_id (int): The id of the group in the engine.
+        owner (int): Projectile.PLAYER or Projectile.ALIEN.
+        """
+        self.__engine = engine
+        self.__group_id = group_id
+        self.__owner = owner
+
+    def __len__(self):
+        """Get the number of live bullets in the group."""
+        return self.__engine.count(self.__group_id)
+
+    def __iter__(self):
+        """Iterate over handles to the live bullets of the group."""
+        return iter(self.__engine.bullets(self.__group_id))
+
+    def sprites(self):
+        """
+        Returns handles to the live bullets of the group.
+
+        Returns:
+        list of Bullet: The bullets.
+        """
+        return self.__engine.bullets(self.__group_id)
+
+    def spawn_laser(self, position, screen_height, color, speed=15, damage=1):
+        """
+        Fires a laser.
+
+        Parameters:
+        position (tuple): The center of the laser in (x, y) format.
+        screen_height (int): The height of the screen.
+        color (tuple): The RGB color of the laser.
+        speed (int, optional): The distance the laser moves up every update. Defaults to 15.
+        damage (int, optional): The damage the laser deals. Defaults to 1.
+        """
+        self.__engine.spawn(self.__group_id, self.__owner, LaserSprite.get_image(color), position, screen_height,
+                            speed, damage)
+
+    def spawn_cannonball(self, position, screen_height, speed=7, damage=1):
+        """
+        Fires a cannonball.
+
+        Parameters:
+        position (tuple): The center of the cannonball in (x, y) format.
+        screen_height (int): The height of the screen.
+        speed (int, optional): The distance the cannonball moves up every update. Defaults to 7.
+        damage (int, optional): The damage the cannonball deals. Defaults to 1.
+        """
+        self.__engine.spawn(self.__group_id, self.__owner, asset_cache.load_image("resources/cannonball.png"),
+                            position, screen_height, speed, damage)
+
+    def update(self):
+        """
+        Moves all bullets of the group and culls the ones that left the screen.
+        """
+        self.__engine.update(self.__group_id)
+
+    def candidates(self, rects):
+        """
+        Returns the bullets overlapping any of the rects, in the order they were fired.
+
+        Parameters:
+        rects (list of pygame.Rect): The rects to check.
+
+        Returns:
+        list of Bullet: The overlapping bullets.
+        """
+        return self.__engine.candidates(self.__group_id, rects)
+
+    def collide(self, rects, hit):
+        """
+        Hands the rect of every bullet overlapping any of the rects to hit(), in the order they were fired, and kills
+        the bullets it returns True for. No handles are created.
+
+        Parameters:
+        rects (list of pygame.Rect): The rects to check.
+        hit (callable): Called with the rect of every overlapping bullet, returns whether the bullet hit something.
+
+        Returns:
+        int: The number of bullets killed.
+        """
+        return self.__engine.collide(self.__group_id, rects, hit)
+
+    def snapshot(self):
+        """
+        Returns the center and speed of every bullet of the group, without creating handles.
+
+        Returns:
+        numpy.ndarray: The (x, y, speed) of every bullet in the order they were fired, shape (n, 3).
+        """
+        return self.__engine.snapshot(self.__group_id)
+
+    def release(self):
+        """
+        Kills all bullets of the group and frees its id in the engine. The group must not be used anymore.
+        """
+        self.__engine.release_group(self.__group_id)
+
+    def render(self, renderer, alpha=1):
+        """
+        Draws all bullets of the group with one blits call per bullet kind.
+
+        Parameters:
+        renderer (Renderer): The renderer used to draw the bullets.
+        alpha (float, optional): How far the drawing is between the previous update (0) and the last one (1).
+        Defaults to 1.
+        """
+        self.__engine.draw(self.__group_id, renderer, alpha)
+
+
+class BulletEngine:
+    """
+    The array projectile backend. All player and alien shots are stored in typed NumPy arrays, one slot per bullet.
+
+    Bullets are integrated, culled and tested against rects in batch, and drawn with one blits call per kind. A kind
+    is one bullet image, e.g. a laser color or the cannonball. Slots of dead bullets are reused, and the arrays double
+    in size when all slots are taken. The movement and culling rules are the same as Projectile.update().
+
+    Every group keeps the slots of its live bullets in the order they were fired, so working on a group never scans
+    the slots of the others. Bullets killed together, e.g. all bullets of a group that hit something in one collision
+    pass, are freed with one update of the arrays.
+
+    Attributes:
+        __capacity (int): The number of slots.
+        __x, __y (numpy.ndarray): The top-left corner of every bullet.
+        __speed (numpy.ndarray): The distance every bullet moves up per update.
+        __limit (numpy.ndarray): The screen height of every bullet, used for culling.
+        __kind (numpy.ndarray): The kind of every bullet.
+        __owner (numpy.ndarray): Projectile.PLAYER or Projectile.ALIEN for every bullet.
+        __damage (numpy.ndarray): The damage every bullet deals.
+        __group (numpy.ndarray): The group of every bullet.
+        __alive (numpy.ndarray): The alive flag of every slot.
+        __generation (numpy.ndarray): The number of times every slot was reused.
+        __rects (list): The rect of every slot. Bullets only move vertically, so only their y-coordinate is copied
+        from the arrays before drawing.
+        __free (list): The free slots.
+        __kind_images (list): The image of every kind.
+        __kind_sizes (numpy.ndarray): The width and height of every kind.
+        __kinds (dict): The kind of every image, keyed by the image.
+        __group_counts (list): The number of live bullets in every group.
+        __group_slots (list of numpy.ndarray): The slots of the live bullets of every group, in the order they were
+        fired, without the ones spawned since the group was last worked on.
+        __spawned (list of list): The slots of the bullets spawned into every group since it was last worked on.
+        __free_groups (list): The ids of released groups, reused by the next groups created.
+
+    Methods:
+        create_group(owner): Creates an empty group of bullets.
+        release_group(group_id): Kills the bullets of a group and frees its id.
+        spawn(group_id, owner, image, position, screen_height, speed, damage): Adds a bullet.
+        update(group_id): Moves the bullets of a group and culls the ones that left the screen.
+        candidates(group_id, rects): Returns the bullets of a group overlapping any of the rects.
+        collide(group_id, rects, hit): Kills the bullets of a group overlapping any of the rects that hit something.
+        snapshot(group_id): Returns the center and speed of every bullet of a group.
+        draw(group_id, renderer, alpha): Draws the bullets of a group between the last two updates.
+        kill(index, generation): Kills a bullet.
+    """
+    def __init__(self, capacity=1024):
+        """
+        Initializes an empty engine.
+
+        Parameters:
+        capacity (int, optional): The initial number of slots. Defaults to 1024.
+        """
+        self.__capacity = 0
+        self.__x = np.zeros(0, dtype=np.int32)
+        self.__y = np.zeros(0, dtype=np.int32)
+        self.__speed = np.zeros(0, dtype=np.int32)
+        self.__limit = np.zeros(0, dtype=np.int32)
+        self.__kind = np.zeros(0, dtype=np.int16)
+        self.__owner = np.zeros(0, dtype=np.uint8)
+        self.__damage = np.zeros(0, dtype=np.int16)
+        self.__group = np.zeros(0, dtype=np.int32)
+        self.__alive = np.zeros(0, dtype=bool)
+        self.__generation = np.zeros(0, dtype=np.uint32)
+        self.__rects = []
+        self.__free = []
+        self.__kind_images = []
+        self.__kind_sizes = np.zeros((0, 2), dtype=np.int32)
+        self.__kinds = {}
+        self.__group_counts = []
+        self.__group_slots = []
+        self.__spawned = []
+        self.__free_groups = []
+        self.__grow(capacity)
+
+    def __len__(self):
+        """Get the number of live bullets."""
+        return self.__capacity - len(self.__free)
+
+    @property
+    def capacity(self):
+        """Get the number of slots."""
+        return self.__capacity
+
+    @property
+    def group_count(self):
+        """Get the number of groups in use."""
+        return len(self.__group_counts) - len(self.__free_groups)
+
+    def create_group(self, owner):
+        """
+        Creates an empty group of bullets, reusing the id of a released group if there is one.
+
+        Parameters:
+        owner (int): Projectile.PLAYER or Projectile.ALIEN.
+
+        Returns:
+        BulletGroup: The group.
+        """
+        if self.__free_groups:
+            return BulletGroup(self, self.__free_groups.pop(), owner)
+        self.__group_counts.append(0)
+        self.__group_slots.append(np.zeros(0, dtype=np.intp))
+        self.__spawned.append([])
+        return BulletGroup(self, len(self.__group_counts) - 1, owner)
+
+    def release_group(self, group_id):
+        """
+        Kills all bullets of a group and frees its id for the next group created, e.g. when the weapon owning the
+        group is dropped with its player. The released group must not be used anymore.
+
+        Parameters:
+        group_id (int): The group.
+        """
+        if self.__group_counts[group_id]:
+            self.__release(self.__indices(group_id), group_id)
+        self.__free_groups.append(group_id)
+
+    def spawn(self, group_id, owner, image, position, screen_height, speed, damage):
+        """
+        Adds a bullet.
+
+        Parameters:
+        group_id (int): The group of the bullet.
+        owner (int): Projectile.PLAYER or Projectile.ALIEN.
+        image (pygame.Surface): The image of the bullet. Bullets sharing an image are drawn together.
+        position (tuple): The center of the bullet in (x, y) format.
+        screen_height (int): The height of the screen.
+        speed (int): The distance the bullet moves up every update.
+        damage (int): The damage the bullet deals.
+
+        Returns:
+        int: The slot of the bullet.
+        """
+        if not self.__free:
+            self.__grow(self.__capacity * 2)
+        kind = self.__kinds.get(image)
+        if kind is None:
+            kind = self.__add_kind(image)
+        index = self.__free.pop()
+        rect = image.get_rect(center=position)
+        self.__rects[index] = rect
+        self.__x[index] = rect.x
+        self.__y[index] = rect.y
+        self.__speed[index] = speed
+        self.__limit[index] = screen_height
+        self.__kind[index] = kind
+        self.__owner[index] = owner
+        self.__damage[index] = damage
+        self.__group[index] = group_id
+        self.__alive[index] = True
+        self.__group_counts[group_id] += 1
+        self.__spawned[group_id].append(index)
+        return index
+
+    def update(self, group_id):
+        """
+        Moves the bullets of a group and culls the ones that left the screen.
+
+        Parameters:
+        group_id (int): The group to update.
+        """
+        if not self.__group_counts[group_id]:
+            return
+        indices = self.__indices(group_id)
+        y = self.__y[indices] - self.__speed[indices]
+        self.__y[indices] = y
+        culled = indices[(y <= -50) | (y >= self.__limit[indices] + 30)]
+        if len(culled):
+            self.__release(culled, group_id)
+
+    def candidates(self, group_id, rects):
+        """
+        Returns handles to the bullets of a group overlapping any of the rects, using the same overlap rule as
+        pygame.Rect.colliderect.
+
+        Parameters:
+        group_id (int): The group to check.
+        rects (list of pygame.Rect): The rects to check.
+
+        Returns:
+        list of Bullet: The overlapping bullets, in the order they were fired.
+        """
+        return self.__handles(self.__overlapping(group_id, rects))
+
+    def collide(self, group_id, rects, hit):
+        """
+        Tests the bullets of a group against the rects in batch and hands the rect of every overlapping bullet to
+        hit(), which tests it against the targets themselves, e.g. the blocks of a bunker. The bullets hit() returns
+        True for are killed together after the last call, so no handles are created and the arrays are updated once.
+
+        The rect handed to hit() belongs to the engine and is only valid during the call.
+
+        Parameters:
+        group_id (int): The group to check.
+        rects (list of pygame.Rect): The rects to check, e.g. the rects of the bunkers and the aliens.
+        hit (callable): Called with the rect of every overlapping bullet, in the order they were fired. Returns
+        whether the bullet hit something and is killed.
+
+        Returns:
+        int: The number of bullets killed.
+        """
+        indices = self.__overlapping(group_id, rects)
+        if not len(indices):
+            return 0
+        slot_rects = self.__rects
+        hits = []
+        for index, y in zip(indices.tolist(), self.__y[indices].tolist()):
+            rect = slot_rects[index]
+            rect.y = y
+            if hit(rect):
+                hits.append(index)
+        if hits:
+            self.__release(np.array(hits, dtype=np.intp), group_id)
+        return len(hits)
+
+    def bullets(self, group_id):
+        """
+        Returns handles to all live bullets of a group.
+
+        Parameters:
+        group_id (int): The group.
+
+        Returns:
+        list of Bullet: The bullets, in the order they were fired.
+        """
+        if not self.__group_counts[group_id]:
+            return []
+        return self.__handles(self.__indices(group_id))
+
+    def snapshot(self, group_id):
+        """
+        Returns the center and speed of every bullet of a group.
+
+        Parameters:
+        group_id (int): The group.
+
+        Returns:
+        numpy.ndarray: The (x, y, speed) of every bullet in the order they were fired, shape (n, 3).
+        """
+        indices = self.__indices(group_id)
+        sizes = self.__kind_sizes[self.__kind[indices]]
+        return np.column_stack((self.__x[indices] + sizes[:, 0] // 2, self.__y[indices] + sizes[:, 1] // 2,
+                                self.__speed[indices]))
+
+    def count(self, group_id):
+        """
+        Returns the number of live bullets of a group.
+
+        Parameters:
+        group_id (int): The group.
+
+        Returns:
+        int: The number of bullets.
+        """
+        return self.__group_counts[group_id]
+
+    def draw(self, group_id, renderer, alpha=1):
+        """
+        Draws the bullets of a group with one blits call per kind. Bullets move by their speed every update, so
+        they are drawn up to one speed behind their position to appear between the last two updates.
+
+        Parameters:
+        group_id (int): The group to draw.
+        renderer (Renderer): The renderer used to draw the bullets.
+        alpha (float, optional): How far the drawing is between the previous update (0) and the last one (1).
+        Defaults to 1.
+        """
+        if not self.__group_counts[group_id]:
+            return
+        indices = self.__indices(group_id)
+        kinds = self.__kind[indices]
+        drawn_y = self.__y[indices]
+        if alpha < 1:
+            drawn_y = drawn_y + np.rint(self.__speed[indices] * (1 - alpha)).astype(np.int32)
+        for kind in np.unique(kinds).tolist():
+            selected = kinds == kind
+            image = self.__kind_images[kind]
+            rects = [self.__rects[index] for index in indices[selected].tolist()]
+            for rect, y in zip(rects, drawn_y[selected].tolist()):
+                rect.y = y
+            renderer.blits([(image, rect) for rect in rects])
+
+    def is_alive(self, index, generation):
+        """
+        Checks if the bullet in a slot is live and is still the one the generation refers to.
+
+        Parameters:
+        index (int): The slot of the bullet.
+        generation (int): The generation of the slot.
+
+        Returns:
+        bool: True if the bullet is live, False otherwise.
+        """
+        return bool(self.__alive[index]) and int(self.__generation[index]) == generation
+
+    def kill(self, index, generation):
+        """
+        Kills the bullet in a slot if it is still the one the generation refers to.
+
+        Parameters:
+        index (int): The slot of the bullet.
+        generation (int): The generation of the slot.
+        """
+        if self.is_alive(index, generation):
+            self.__release(np.array([index]), int(self.__group[index]))
+
+    def __indices(self, group_id):
+        """
+        Returns the slots of all live bullets of a group, adding the ones spawned since the group was last worked on.
+
+        Parameters:
+        group_id (int): The group.
+
+        Returns:
+        numpy.ndarray: The slots, in the order the bullets were fired.
+        """
+        spawned = self.__spawned[group_id]
+        if spawned:
+            self.__group_slots[group_id] = np.concatenate((self.__group_slots[group_id],
+                                                           np.array(spawned, dtype=np.intp)))
+            spawned.clear()
+        return self.__group_slots[group_id]
+
+    def __overlapping(self, group_id, rects):
+        """
+        Returns the slots of the bullets of a group overlapping any of the rects.
+
+        Parameters:
+        group_id (int): The group to check.
+        rects (list of pygame.Rect): The rects to check.
+
+        Returns:
+        numpy.ndarray: The slots, in the order the bullets were fired.
+        """
+        rects = [rect for rect in rects if rect.width > 0 and rect.height > 0]
+        if not rects or not self.__group_counts[group_id]:
+            return np.zeros(0, dtype=np.intp)
+        indices = self.__indices(group_id)
+        left = self.__x[indices]
+        top = self.__y[indices]
+        sizes = self.__kind_sizes[self.__kind[indices]]
+        right = left + sizes[:, 0]
+        bottom = top + sizes[:, 1]
+        overlapping = np.zeros(len(indices), dtype=bool)
+        for rect in rects:
+            overlapping |= (left < rect.right) & (right > rect.left) & (top < rect.bottom) & (bottom > rect.top)
+        return indices[overlapping]
+
+    def __handles(self, indices):
+        """
+        Creates handles to the bullets in the given slots.
+
+        Parameters:
+        indices (numpy.ndarray): The slots.
+
+        Returns:
+        list of Bullet: The handles.
+        """
+        handles = []
+        for index, generation, y, owner, damage in zip(indices.tolist(), self.__generation[indices].tolist(),
+                                                        self.__y[indices].tolist(), self.__owner[indices].tolist(),
+                                                        self.__damage[indices].tolist()):
+            rect = self.__rects[index]
+            rect.y = y
+            handles.append(Bullet(self, index, generation, rect.copy(), owner, damage))
+        return handles
+
+    def __release(self, indices, group_id):
+        """
+        Frees the slots of dead bullets of a group.
+
+        Parameters:
+        indices (numpy.ndarray): The slots to free.
+        group_id (int): The group of the bullets.
+        """
+        self.__alive[indices] = False
+        self.__generation[indices] += 1
+        self.__free.extend(indices.tolist())
+        self.__group_counts[group_id] -= len(indices)
+        slots = self.__indices(group_id)
+        self.__group_slots[group_id] = slots[self.__alive[slots]]
+
+    def __add_kind(self, image):
+        """
+        Registers a new bullet image.
+
+        Parameters:
+        image (pygame.Surface): The image.
+
+        Returns:
+        int: The kind of the image.
+        """
+        self.__kinds[image] = len(self.__kind_images)
+        self.__kind_images.append(image)
+        self.__kind_sizes = np.vstack((self.__kind_sizes, [image.get_size()])).astype(np.int32)
+        return self.__kinds[image]
+
+    def __grow(self, capacity):
+        """
+        Grows the arrays to the given number of slots.
+
+        Parameters:
+        capacity (int): The new number of slots.
+        """
+        added = capacity - self.__capacity
+        self.__x = np.concatenate((self.__x, np.zeros(added, dtype=np.int32)))
+        self.__y = np.concatenate((self.__y, np.zeros(added, dtype=np.int32)))
+        self.__speed = np.concatenate((self.__speed, np.zeros(added, dtype=np.int32)))
+        self.__limit = np.concatenate((self.__limit, np.zeros(added, dtype=np.int32)))
+        self.__kind = np.concatenate((self.__kind, np.zeros(added, dtype=np.int16)))
+        self.__owner = np.concatenate((self.__owner, np.zeros(added, dtype=np.uint8)))
+        self.__damage = np.concatenate((self.__damage, np.zeros(added, dtype=np.int16)))
+        self.__group = np.concatenate((self.__group, np.zeros(added, dtype=np.int32)))
+        self.__alive = np.concatenate((self.__alive, np.zeros(added, dtype=bool)))
+        self.__generation = np.concatenate((self.__generation, np.zeros(added, dtype=np.uint32)))
+        self.__rects.extend(pygame.Rect(0, 0, 0, 0) for _ in range(added))
+        # Hand out low slots first, so live bullets stay packed at the front of the arrays
+        self.__free = list(range(capacity - 1, self.__capacity - 1, -1)) + self.__free
+        self.__capacity = capacity
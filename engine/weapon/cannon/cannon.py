@@ -1,4 +1,3 @@
-from engine.weapon.cannon.cannonball import CannonBall
 from engine.weapon.weapon import Weapon
 
 
@@ -15,7 +14,7 @@ class Cannon(Weapon):
     shoot_weapon(player_position): This method shoots a CannonBall object from the player's current position.
     """
 
-    def __init__(self, cannon_cooldown, screen_height, weapon_name):
+    def __init__(self, cannon_cooldown, screen_height, weapon_name, projectiles=None, scheduler=None):
         """
         This is the constructor for the Cannon class. It initializes the Cannon object by calling the parent class's constructor and passing the parameters.
 
@@ -23,15 +22,17 @@ class Cannon(Weapon):
         cannon_cooldown (int): Represents the time interval between two consecutive shots from the Cannon.
         screen_height (int): Represents the height of the screen where the game is being played.
         weapon_name (str): Represents the name of the weapon.
+        projectiles (PooledProjectiles or BulletEngine, optional): The projectile backend storing the shots.
+        scheduler (Scheduler, optional): The scheduler reloading the weapon.
         """
-        super().__init__(cannon_cooldown, screen_height, weapon_name)
+        super().__init__(cannon_cooldown, screen_height, weapon_name, projectiles, scheduler)
 
     def shoot_weapon(self, player_position):
         """
-        This method creates and adds a new CannonBall object to the array of weapon_shots.
+        This method fires a CannonBall and adds it to the weapon_shots.
 
         Parameters:
         player_position (tuple): Represents the player's current position (x, y) from where the CannonBall is being shot.
 
         """
-        self._Weapon__weapon_shots.add(CannonBall(player_position, self._Weapon__height))
+        self._Weapon__weapon_shots.spawn_cannonball(player_position, self._Weapon__height)
@@ -1,14 +1,14 @@
-import pygame
+from engine.assets.asset_cache import asset_cache
+from engine.weapon.projectile import Projectile
 
 
-class CannonBall(pygame.sprite.Sprite):
+class CannonBall(Projectile):
     """
     A class representing a CannonBall in a pygame environment.
 
     Attributes:
         image (pygame.Surface): The image of the CannonBall.
         rect (pygame.Rect): The rectangle object that defines the size and position of the CannonBall.
-        __speed (int): The speed at which the CannonBall travels.
         screen_height (int): The height of the screen.
     """
 
@@ -21,22 +21,16 @@ class CannonBall(pygame.sprite.Sprite):
               screen_height (int): The height of the screen.
               speed (int, optional): The speed at which the CannonBall travels. Defaults to 7.
         """
-        super().__init__()
-        self.image = pygame.image.load("resources/cannonball.png").convert_alpha()
-        self.rect = self.image.get_rect(center=cannonball_position)
-        self.__speed = speed
-        self.screen_height = screen_height
+        super().__init__(asset_cache.load_image("resources/cannonball.png"), cannonball_position, screen_height,
+                         speed)
 
-    def __destroy_cannonball(self):
+    def reset(self, cannonball_position, screen_height, speed=7):
         """
-        Destroys the CannonBall if it goes beyond the screen boundaries.
-        """
-        if self.rect.y <= -50 or self.rect.y >= self.screen_height + 30:
-            self.kill()
+        Reuses the CannonBall for a new shot.
 
-    def update(self):
-        """
-        Updates the position of the CannonBall by subtracting its speed from the y-coordinate.
+        Args:
+            cannonball_position (tuple): The initial position of the CannonBall in (x, y) format.
+            screen_height (int): The height of the screen.
+            speed (int, optional): The speed at which the CannonBall travels. Defaults to 7.
         """
-        self.rect.y -= self.__speed
-        self.__destroy_cannonball()
+        super().reset(asset_cache.load_image("resources/cannonball.png"), cannonball_position, screen_height, speed)
@@ -0,0 +1,164 @@
+from array import array
+from collections import namedtuple
+
+import pygame
+
+from engine.assets.asset_cache import asset_cache
+
+ExplosionPreset = namedtuple("ExplosionPreset", ["image_path", "frame_ticks", "size", "frame_count"])
+
+CANNON_EXPLOSION = ExplosionPreset("resources/exp", 7, (150, 150), 5)
+LASER_EXPLOSION = ExplosionPreset("resources/laserexp", 3, (70, 70), 5)
+
+
+class ExplosionEngine:
+    """
+    Stores and draws all running explosions of a game as plain arrays instead of one sprite per explosion.
+
+    An explosion is its top-left corner, its preset and the tick it started on. Its frame is not stored but derived
+    from the clock, (tick - start) // frame_ticks, so nothing has to be advanced while it runs, and it ends after
+    frame_count * frame_ticks ticks. Explosions of one preset all last equally long and therefore end in the order
+    they started: every preset keeps its explosions in a queue of parallel arrays, and culling pops finished ones
+    off its head. The frames of every preset are shared through the asset cache and loaded on the first draw, so
+    headless games never load them.
+
+    Attributes:
+        __clock (SimClock): The clock the explosions are timed by.
+        __presets (tuple of ExplosionPreset): The animations, drawn in this order.
+        __frames (list): The shared frames of every preset, or None until it is first drawn.
+        __x, __y, __start (list of array): The top-left corner and the start tick of the explosions of every preset,
+        oldest first.
+        __heads (list of int): The index of the oldest running explosion of every preset; the ones before it ended.
+
+    Methods:
+        spawn(preset, center): Starts an explosion.
+        lifetime(preset): Returns the number of ticks an explosion of a preset lasts.
+        cull(): Drops the explosions that ended.
+        clear(): Drops all explosions.
+        draw(renderer): Draws the current frame of every running explosion.
+    """
+    def __init__(self, clock, presets=(CANNON_EXPLOSION, LASER_EXPLOSION)):
+        """
+        Initializes an engine without explosions.
+
+        Parameters:
+        clock (SimClock): The clock the explosions are timed by.
+        presets (tuple of ExplosionPreset, optional): The animations explosions can use, drawn in this order.
+        Defaults to the cannon and the laser explosion.
+        """
+        self.__clock = clock
+        self.__presets = tuple(presets)
+        self.__frames = [None] * len(self.__presets)
+        self.__x = [array("i") for _ in self.__presets]
+        self.__y = [array("i") for _ in self.__presets]
+        self.__start = [array("q") for _ in self.__presets]
+        self.__heads = [0] * len(self.__presets)
+
+    def __len__(self):
+        """Get the number of explosions not culled yet."""
+        return sum(len(starts) - head for starts, head in zip(self.__start, self.__heads))
+
+    @property
+    def presets(self):
+        """Get the animations explosions can use."""
+        return self.__presets
+
+    def count(self, preset):
+        """
+        Returns the number of explosions of a preset not culled yet.
+
+        Parameters:
+        preset (ExplosionPreset): The preset.
+
+        Returns:
+        int: The number of explosions.
+        """
+        index = self.__presets.index(preset)
+        return len(self.__start[index]) - self.__heads[index]
+
+    def lifetime(self, preset):
+        """
+        Returns the number of ticks an explosion of a preset lasts.
+
+        Parameters:
+        preset (ExplosionPreset): The preset.
+
+        Returns:
+        int: The number of ticks.
+        """
+        return preset.frame_count * preset.frame_ticks
+
+    def spawn(self, preset, center):
+        """
+        Starts an explosion on the current tick, showing its first frame until frame_ticks ticks have passed.
+
+        Parameters:
+        preset (ExplosionPreset): The animation of the explosion.
+        center (tuple): The center of the explosion in (x, y) format.
+
+        Returns:
+        pygame.Rect: The area covered by the explosion, e.g. to destroy what it overlaps.
+        """
+        index = self.__presets.index(preset)
+        rect = pygame.Rect((0, 0), preset.size)
+        rect.center = center
+        self.__x[index].append(rect.x)
+        self.__y[index].append(rect.y)
+        self.__start[index].append(self.__clock.ticks)
+        return rect
+
+    def cull(self):
+        """
+        Drops the explosions that ended by the current tick and compacts a queue once most of it is dropped.
+        """
+        now = self.__clock.ticks
+        for index, preset in enumerate(self.__presets):
+            starts = self.__start[index]
+            head = self.__heads[index]
+            end = len(starts)
+            last_start = now - self.lifetime(preset)
+            while head < end and starts[head] <= last_start:
+                head += 1
+            if head and head * 2 >= end:
+                del self.__x[index][:head]
+                del self.__y[index][:head]
+                del starts[:head]
+                head = 0
+            self.__heads[index] = head
+
+    def clear(self):
+        """
+        Drops all explosions.
+        """
+        for index in range(len(self.__presets)):
+            del self.__x[index][:]
+            del self.__y[index][:]
+            del self.__start[index][:]
+            self.__heads[index] = 0
+
+    def draw(self, renderer):
+        """
+        Draws the current frame of every running explosion with one blits call per preset. Explosions that ended
+        but were not culled yet are skipped.
+
+        Parameters:
+        renderer (Renderer): The renderer used to draw the explosions.
+        """
+        now = self.__clock.ticks
+        for index, preset in enumerate(self.__presets):
+            head = self.__heads[index]
+            starts = self.__start[index]
+            if head == len(starts):
+                continue
+            frames = self.__frames[index]
+            if frames is None:
+                frames = self.__frames[index] = asset_cache.load_frames(preset.image_path, preset.frame_count,
+                                                                        preset.size)
+            frame_ticks = preset.frame_ticks
+            frame_count = preset.frame_count
+            blits = []
+            for x, y, start in zip(self.__x[index][head:], self.__y[index][head:], starts[head:]):
+                frame = (now - start) // frame_ticks
+                if frame < frame_count:
+                    blits.append((frames[frame], (x, y)))
+            renderer.blits(blits)
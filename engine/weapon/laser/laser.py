@@ -1,4 +1,3 @@
-from engine.weapon.laser.lasersprite import LaserSprite
 from engine.weapon.weapon import Weapon
 
 
@@ -14,7 +13,7 @@ class Laser(Weapon):
         __color (tuple): The color of the laser.
         __speed (int): The speed of the laser.
     """
-    def __init__(self, laser_cooldown, screen_height, weapon_name, color, speed=15):
+    def __init__(self, laser_cooldown, screen_height, weapon_name, color, speed=15, projectiles=None, scheduler=None):
         """
         The constructor for the Laser class.
 
@@ -24,8 +23,10 @@ class Laser(Weapon):
             weapon_name (str): The name of the weapon.
             color (tuple): The color of the laser.
             speed (int, optional): The speed of the laser. Defaults to 15.
+            projectiles (PooledProjectiles or BulletEngine, optional): The projectile backend storing the shots.
+            scheduler (Scheduler, optional): The scheduler reloading the weapon.
         """
-        super().__init__(laser_cooldown, screen_height, weapon_name)
+        super().__init__(laser_cooldown, screen_height, weapon_name, projectiles, scheduler)
         self.__color = color
         self.__speed = speed
 
@@ -39,4 +40,4 @@ class Laser(Weapon):
         Returns:
             None
         """
-        self._Weapon__weapon_shots.add(LaserSprite(position, self._Weapon__height, self.__color, self.__speed))
+        self._Weapon__weapon_shots.spawn_laser(position, self._Weapon__height, self.__color, self.__speed)
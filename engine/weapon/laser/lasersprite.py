@@ -1,17 +1,24 @@
 import pygame
 
+from engine.weapon.projectile import Projectile
 
-class LaserSprite(pygame.sprite.Sprite):
+
+class LaserSprite(Projectile):
     """
     A class to represent a laser sprite in a game. The laser sprite is a rect-shaped object that moves vertically
     on the screen.
 
+    The filled image of every laser color is created once and shared by all lasers of that color.
+
     Attributes:
         image (pygame.Surface): The Surface object representing the laser sprite.
         rect (pygame.Rect): The Rect object representing the bounding box of the laser sprite.
-        __speed (int): The speed at which the laser sprite moves vertically on the screen.
         screen_height (int): The height of the screen on which the laser sprite is displayed.
+        __images (dict): The shared laser images, keyed by color.
     """
+    SIZE = (4, 20)
+    __images = {}
+
     def __init__(self, laser_position, screen_height, color, speed=15):
         """
         The constructor for the LaserSprite class.
@@ -23,25 +30,35 @@ class LaserSprite(pygame.sprite.Sprite):
             speed (int): The speed at which the laser sprite moves vertically on the screen. Defaults to 15.
 
         """
-        super().__init__()
-        self.image = pygame.Surface((4, 20))
-        self.image.fill(color)
-        self.rect = self.image.get_rect(center=laser_position)
-        self.__speed = speed
-        self.screen_height = screen_height
-
-    def __destroy_laser(self):
+        super().__init__(self.get_image(color), laser_position, screen_height, speed)
+
+    @classmethod
+    def get_image(cls, color):
         """
-        A helper method to remove the laser sprite from the game when it goes out of the screen.
+        Get the shared image of a laser of the given color, creating it on first use.
+
+        Args:
+            color (tuple): The RGB color of the laser.
+
+        Returns:
+            pygame.Surface: The filled laser image.
         """
-        if self.rect.y <= -50 or self.rect.y >= self.screen_height + 30:
-            self.kill()
+        color = tuple(color)
+        image = cls.__images.get(color)
+        if image is None:
+            image = pygame.Surface(cls.SIZE)
+            image.fill(color)
+            cls.__images[color] = image
+        return image
 
-    def update(self):
+    def reset(self, laser_position, screen_height, color, speed=15):
         """
-        A method that updates the position of the laser sprite on the screen. The laser sprite moves vertically
-        up at a rate determined by the speed attribute. If the laser sprite goes out of the screen, it is removed
-        from the game using the __destroy_laser() method.
+        Reuses the laser sprite for a new shot.
+
+        Args:
+            laser_position (tuple): A tuple representing the (x, y) position of the laser sprite.
+            screen_height (int): The height of the screen on which the laser sprite is displayed.
+            color (tuple): A tuple representing the RGB color of the laser sprite.
+            speed (int): The speed at which the laser sprite moves vertically on the screen. Defaults to 15.
         """
-        self.rect.y -= self.__speed
-        self.__destroy_laser()
+        super().reset(self.get_image(color), laser_position, screen_height, speed)
@@ -0,0 +1,94 @@
+import pygame
+
+
+class Projectile(pygame.sprite.Sprite):
+    """
+    A base class for the projectiles fired by the player and the aliens. A projectile moves vertically and is killed
+    once it leaves the screen.
+
+    Projectiles can be owned by a ProjectilePool. Killing a pooled projectile hands it back to its pool instead of
+    dropping it, so it can be reset and fired again.
+
+    Attributes:
+        image (pygame.Surface): The image of the projectile.
+        rect (pygame.Rect): The rect representing the position of the projectile.
+        screen_height (int): The height of the screen.
+        __speed (int): The distance the projectile moves up every update. Negative values move it down.
+        __pool (ProjectilePool): The pool the projectile is currently checked out from, or None.
+    """
+    PLAYER = 0
+    ALIEN = 1
+
+    def __init__(self, image, position, screen_height, speed):
+        """
+        Initializes a projectile.
+
+        Args:
+            image (pygame.Surface): The image of the projectile.
+            position (tuple): The center of the projectile in (x, y) format.
+            screen_height (int): The height of the screen.
+            speed (int): The distance the projectile moves up every update.
+        """
+        super().__init__()
+        self.image = image
+        self.rect = image.get_rect(center=position)
+        self.screen_height = screen_height
+        self.__speed = speed
+        self.__pool = None
+
+    @property
+    def speed(self):
+        """
+        Get the distance the projectile moves up every update.
+        """
+        return self.__speed
+
+    @property
+    def pool(self):
+        """
+        Get the pool the projectile is currently checked out from, or None.
+        """
+        return self.__pool
+
+    @pool.setter
+    def pool(self, new_pool):
+        """
+        Set the pool the projectile is checked out from.
+
+        Args:
+            new_pool (ProjectilePool): The pool, or None.
+        """
+        self.__pool = new_pool
+
+    def reset(self, image, position, screen_height, speed):
+        """
+        Reuses the projectile for a new shot.
+
+        Args:
+            image (pygame.Surface): The image of the projectile.
+            position (tuple): The center of the projectile in (x, y) format.
+            screen_height (int): The height of the screen.
+            speed (int): The distance the projectile moves up every update.
+        """
+        self.image = image
+        self.rect.size = image.get_size()
+        self.rect.center = position
+        self.screen_height = screen_height
+        self.__speed = speed
+
+    def kill(self):
+        """
+        Removes the projectile from all groups. A pooled projectile is also returned to its pool.
+        """
+        if self.__pool is not None:
+            self.__pool.release(self)
+        else:
+            super().kill()
+
+    def update(self):
+        """
+        Moves the projectile and kills it once it leaves the screen.
+        """
+        self.rect.y -= self.__speed
+        if self.rect.y <= -50 or self.rect.y >= self.screen_height + 30:
+            self.kill()
@@ -0,0 +1,263 @@
+import pygame
+
+from engine.weapon.cannon.cannonball import CannonBall
+from engine.weapon.laser.lasersprite import LaserSprite
+
+
+class ProjectilePool:
+    """
+    A pool of reusable projectiles.
+
+    Projectiles are preallocated on first use and handed out by acquire(). Killing a projectile returns it to the
+    pool, so sustained fire reuses the same objects instead of allocating a sprite for every shot. When the pool runs
+    dry it grows by one projectile; the high-water mark tells how large it should be preallocated.
+
+    The pool only keeps references to free projectiles. A projectile that is dropped without being killed is simply
+    garbage collected, and stays counted as in use.
+
+    Attributes:
+        __create_projectile (callable): Creates a new, unused projectile.
+        __preallocated (int): The number of projectiles created on first use.
+        __free (list): The projectiles ready to be reused.
+        __size (int): The number of projectiles created by the pool.
+        __in_use (int): The number of projectiles currently checked out.
+        __high_water_mark (int): The highest number of projectiles checked out at the same time.
+
+    Methods:
+        acquire(*args): Returns a projectile reset with the given arguments.
+        release(projectile): Returns a projectile to the pool.
+        reserve(count): Makes sure the pool holds at least the given number of projectiles.
+        reset_counters(): Resets the high-water mark.
+    """
+    def __init__(self, create_projectile, preallocated=0):
+        """
+        Initializes an empty pool.
+
+        Parameters:
+        create_projectile (callable): Creates a new, unused projectile. It is called without arguments.
+        preallocated (int, optional): The number of projectiles created on first use. Defaults to 0.
+        """
+        self.__create_projectile = create_projectile
+        self.__preallocated = preallocated
+        self.__free = []
+        self.__size = 0
+        self.__in_use = 0
+        self.__high_water_mark = 0
+
+    @property
+    def size(self):
+        """Get the number of projectiles created by the pool."""
+        return self.__size
+
+    @property
+    def free_count(self):
+        """Get the number of projectiles ready to be reused."""
+        return len(self.__free)
+
+    @property
+    def in_use(self):
+        """Get the number of projectiles currently checked out."""
+        return self.__in_use
+
+    @property
+    def high_water_mark(self):
+        """Get the highest number of projectiles checked out at the same time."""
+        return self.__high_water_mark
+
+    def acquire(self, *args):
+        """
+        Checks out a projectile and resets it with the given arguments.
+
+        Parameters:
+        *args: The arguments passed to the projectile's reset method.
+
+        Returns:
+        Projectile: The projectile.
+        """
+        if not self.__size:
+            self.reserve(self.__preallocated)
+        if not self.__free:
+            self.reserve(self.__size + 1)
+        projectile = self.__free.pop()
+        projectile.reset(*args)
+        projectile.pool = self
+        self.__in_use += 1
+        self.__high_water_mark = max(self.__high_water_mark, self.__in_use)
+        return projectile
+
+    def release(self, projectile):
+        """
+        Removes the projectile from all groups and returns it to the pool. Releasing a projectile that is not checked
+        out from this pool, e.g. one that was already released, does nothing.
+
+        Parameters:
+        projectile (Projectile): The projectile to release.
+
+        Returns:
+        bool: True if the projectile was returned to the pool, False otherwise.
+        """
+        if projectile.pool is not self:
+            return False
+        projectile.pool = None
+        projectile.kill()
+        self.__free.append(projectile)
+        self.__in_use -= 1
+        return True
+
+    def reserve(self, count):
+        """
+        Creates projectiles until the pool holds at least the given number of them.
+
+        Parameters:
+        count (int): The number of projectiles the pool should hold.
+        """
+        while self.__size < count:
+            self.__free.append(self.__create_projectile())
+            self.__size += 1
+
+    def reset_counters(self):
+        """
+        Resets the high-water mark to the number of projectiles currently in use.
+        """
+        self.__high_water_mark = self.__in_use
+
+
+laser_pool = ProjectilePool(lambda: LaserSprite((0, 0), 0, (255, 255, 255)), 64)
+cannonball_pool = ProjectilePool(lambda: CannonBall((0, 0), 0), 8)
+
+
+class PooledShotGroup(pygame.sprite.Group):
+    """
+    A group of projectile sprites taken from the projectile pools.
+
+    It is the sprite counterpart of BulletGroup: weapons and levels fire and draw their shots through the same
+    spawn_laser(), spawn_cannonball() and render() methods, whichever projectile backend is used.
+
+    Methods:
+        spawn_laser(position, screen_height, color, speed, damage): Fires a laser.
+        spawn_cannonball(position, screen_height, speed, damage): Fires a cannonball.
+        candidates(rects): Returns the shots overlapping any of the rects.
+        collide(rects, hit): Kills the shots overlapping any of the rects that hit something.
+        snapshot(): Returns the center and speed of every shot.
+        render(renderer, alpha): Draws all shots between the last two updates.
+        release(): Returns all shots to their pools.
+    """
+    def spawn_laser(self, position, screen_height, color, speed=15, damage=1):
+        """
+        Takes a laser from the pool and adds it to the group.
+
+        Parameters:
+        position (tuple): The center of the laser in (x, y) format.
+        screen_height (int): The height of the screen.
+        color (tuple): The RGB color of the laser.
+        speed (int, optional): The distance the laser moves up every update. Defaults to 15.
+        damage (int, optional): Only used by the bullet engine. Defaults to 1.
+
+        Returns:
+        LaserSprite: The laser.
+        """
+        laser = laser_pool.acquire(position, screen_height, color, speed)
+        self.add(laser)
+        return laser
+
+    def spawn_cannonball(self, position, screen_height, speed=7, damage=1):
+        """
+        Takes a cannonball from the pool and adds it to the group.
+
+        Parameters:
+        position (tuple): The center of the cannonball in (x, y) format.
+        screen_height (int): The height of the screen.
+        speed (int, optional): The distance the cannonball moves up every update. Defaults to 7.
+        damage (int, optional): Only used by the bullet engine. Defaults to 1.
+
+        Returns:
+        CannonBall: The cannonball.
+        """
+        cannonball = cannonball_pool.acquire(position, screen_height, speed)
+        self.add(cannonball)
+        return cannonball
+
+    def candidates(self, rects):
+        """
+        Returns the shots overlapping any of the rects, in the order they were fired.
+
+        Parameters:
+        rects (list of pygame.Rect): The rects to check.
+
+        Returns:
+        list: The overlapping shots.
+        """
+        return [shot for shot in self if shot.rect.collidelist(rects) != -1]
+
+    def collide(self, rects, hit):
+        """
+        Hands the rect of every shot overlapping any of the rects to hit(), in the order they were fired, and kills
+        the shots it returns True for.
+
+        Parameters:
+        rects (list of pygame.Rect): The rects to check.
+        hit (callable): Called with the rect of every overlapping shot, returns whether the shot hit something.
+
+        Returns:
+        int: The number of shots killed.
+        """
+        killed = 0
+        for shot in self.candidates(rects):
+            if hit(shot.rect):
+                shot.kill()
+                killed += 1
+        return killed
+
+    def snapshot(self):
+        """
+        Returns the center and speed of every shot, e.g. to build observations without touching the sprites.
+
+        Returns:
+        list of tuple: The (x, y, speed) of every shot, in the order they were fired.
+        """
+        return [(*shot.rect.center, shot.speed) for shot in self]
+
+    def render(self, renderer, alpha=1):
+        """
+        Draws all shots.
+
+        Parameters:
+        renderer (Renderer): The renderer used to draw the shots.
+        alpha (float, optional): How far the drawing is between the previous update (0) and the last one (1).
+        Defaults to 1.
+        """
+        if alpha >= 1:
+            renderer.draw_group(self)
+        else:
+            renderer.blits([(shot.image, shot.rect.move(0, round(shot.speed * (1 - alpha)))) for shot in self])
+
+    def release(self):
+        """
+        Kills all shots, returning them to their pools. The counterpart of BulletGroup.release(); sprite groups hold
+        nothing else to free.
+        """
+        for shot in self.sprites():
+            shot.kill()
+
+
+class PooledProjectiles:
+    """
+    The sprite projectile backend. Every shot is a pooled LaserSprite or CannonBall.
+
+    Methods:
+        create_group(owner): Creates an empty group of shots.
+    """
+    def create_group(self, owner):
+        """
+        Creates an empty group of shots.
+
+        Parameters:
+        owner (int): Projectile.PLAYER or Projectile.ALIEN. Sprite groups do not store it.
+
+        Returns:
+        PooledShotGroup: The group.
+        """
+        return PooledShotGroup()
+
+
+pooled_projectiles = PooledProjectiles()
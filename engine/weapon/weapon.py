@@ -1,6 +1,9 @@
 import pygame
 from abc import abstractmethod, ABC
 
+from engine.weapon.projectile import Projectile
+from engine.weapon.projectile_pool import pooled_projectiles
+
 
 class Weapon(ABC):
     """
@@ -12,15 +15,20 @@ class Weapon(ABC):
     __cooldown (int): The time it takes for the weapon to reload after being used.
     __height (int): The height of the weapon.
     __weapon_name (str): The name of the weapon.
-    __weapon_shots (pygame.sprite.Group): A group of shot objects.
+    __weapon_shots (PooledShotGroup or BulletGroup): A group of shot objects, created by the projectile backend.
+    __scheduler (Scheduler): The scheduler reloading the weapon, or None to poll pygame.time.get_ticks().
 
     Methods:
-    __render_loading_bar(percentage_complete, screen, x, y, width, height, bar_color, empty_bar_color): Renders a loading bar on the screen to indicate the reload progress of the weapon.
-    __load_weapon(screen, bar_x, bar_y, bar_color, empty_bar_color): Loads the weapon and updates the reload progress on the screen.
+    __now(): Returns the current time of the weapon's clock.
+    __load_weapon(): Makes the weapon available again once the cooldown has passed.
+    __reload(): Makes the weapon available again, run by the scheduler once the cooldown has passed.
+    start_cooldown(): Makes the weapon unavailable until the cooldown has passed.
     shoot_weapon(player_position): Abstract method to shoot the weapon. Must be implemented by subclasses.
-    refresh_weapon(screen, bar_x, bar_y, bar_color, empty_bar_color): Refreshes the weapon by loading it and updating its shots.
+    refresh_weapon(): Refreshes the weapon by loading it and updating its shots.
+    clear_shots(): Kills all shots of the weapon, returning pooled shots to their pool.
+    release_shots(): Kills all shots and frees the weapon's group in the projectile backend.
     """
-    def __init__(self, cooldown, height, weapon_name):
+    def __init__(self, cooldown, height, weapon_name, projectiles=None, scheduler=None):
         """
         Initialize the Weapon class with the following parameters:
 
@@ -28,6 +36,10 @@ class Weapon(ABC):
         cooldown (int): Time it takes to reload the weapon.
         height (int): The height of the weapon on the screen.
         weapon_name (str): The name of the weapon.
+        projectiles (PooledProjectiles or BulletEngine, optional): The projectile backend storing the shots.
+        Defaults to the pooled sprite backend.
+        scheduler (Scheduler, optional): The scheduler reloading the weapon on its clock, so nothing is checked while
+        the weapon reloads. Defaults to checking pygame.time.get_ticks() on every refresh.
         """
         # Weapon attributes
         self.__is_weapon_available = True
@@ -35,8 +47,11 @@ class Weapon(ABC):
         self.__cooldown = cooldown
         self.__height = height
         self.__weapon_name = weapon_name
+        self.__scheduler = scheduler
 
-        self.__weapon_shots = pygame.sprite.Group()
+        if projectiles is None:
+            projectiles = pooled_projectiles
+        self.__weapon_shots = projectiles.create_group(Projectile.PLAYER)
 
     @property
     def time(self):
@@ -72,6 +87,29 @@ class Weapon(ABC):
         """
         self.__is_weapon_available = new_value
 
+    @property
+    def cooldown(self):
+        """
+        Get the time it takes for the weapon to reload after being used.
+        """
+        return self.__cooldown
+
+    @property
+    def weapon_name(self):
+        """
+        Get the name of the weapon.
+        """
+        return self.__weapon_name
+
+    @property
+    def reload_progress(self):
+        """
+        Get the reload progress of the weapon, between 0 (just fired) and 1 (available).
+        """
+        if self.__is_weapon_available:
+            return 1
+        return min((self.__now() - self.__time) / self.__cooldown, 1)
+
     @property
     def weapon_shots(self):
         """
@@ -79,56 +117,42 @@ class Weapon(ABC):
         """
         return self.__weapon_shots
 
-    def __render_loading_bar(self, percentage_complete, screen, x, y, width, height, bar_color, empty_bar_color):
+    def __now(self):
         """
-        Render the loading bar for the weapon.
+        Returns the current time of the weapon's clock in milliseconds.
+        """
+        if self.__scheduler is not None:
+            return self.__scheduler.clock.time
+        return pygame.time.get_ticks()
 
-        Parameters:
-        percentage_complete (float): The percentage of the reload process completed.
-        screen (pygame.Surface): The screen on which to render the loading bar.
-        x (int): The x-coordinate of the loading bar on the screen.
-        y (int): The y-coordinate of the loading bar on the screen.
-        width (int): The width of the loading bar.
-        height (int): The height of the loading bar.
-        bar_color (tuple): The color of the filled part of the loading bar.
-        empty_bar_color (tuple): The color of the empty part of the loading bar.
-        """
-        # Render loading bar
-        filled_width = int(width * percentage_complete)
-        empty_width = width - filled_width
-        filled_bar = pygame.Rect(x, y, filled_width, height)
-        empty_bar = pygame.Rect(x + filled_width, y, empty_width, height)
-        pygame.draw.rect(screen, bar_color, filled_bar)
-        pygame.draw.rect(screen, empty_bar_color, empty_bar)
-
-        # Render weapon name text
-        font = pygame.font.Font(None, 30)
-        weapon_name_text = font.render(self.__weapon_name, True, (255, 255, 255))
-        text_rect = weapon_name_text.get_rect()
-        text_rect.x = x
-        text_rect.y = y - 25
-        screen.blit(weapon_name_text, text_rect)
-
-    def __load_weapon(self, screen, bar_x, bar_y, bar_color, empty_bar_color):
-        """
-        Load the weapon, updating its availability and rendering the loading bar.
+    def __load_weapon(self):
+        """
+        Load the weapon, making it available again once the cooldown has passed. Weapons reloaded by a scheduler
+        skip the check.
+        """
+        if self.__scheduler is not None or self.__is_weapon_available:
+            return
+        if self.__now() - self.__time >= self.__cooldown:
+            self.__is_weapon_available = True
 
-        Parameters:
-        screen (pygame.Surface): The screen on which to render the loading bar.
-        bar_x (int): The x-coordinate of the loading bar on the screen.
-        bar_y (int): The y-coordinate of the loading bar on the screen.
-        bar_color (tuple): The color of the filled part of the loading bar.
-        empty_bar_color (tuple): The color of the empty part of the loading bar.
+    def __reload(self):
         """
-        if self.__is_weapon_available:
-            self.__render_loading_bar(1, screen, bar_x, bar_y, 100, 20, bar_color, empty_bar_color)
-        else:
-            end_time = pygame.time.get_ticks()
-            elapsed_time = end_time - self.__time
-            percentage_complete = elapsed_time / self.__cooldown
-            self.__render_loading_bar(percentage_complete, screen, bar_x, bar_y, 100, 20, bar_color, empty_bar_color)
-            if elapsed_time >= self.__cooldown:
-                self.__is_weapon_available = True
+        Make the weapon available again. Run by the scheduler once the cooldown has passed.
+        """
+        self.__is_weapon_available = True
+
+    def start_cooldown(self):
+        """
+        Makes the weapon unavailable from now until the cooldown has passed. With a scheduler, the weapon's reload
+        is scheduled right away.
+
+        Returns:
+        None
+        """
+        self.__is_weapon_available = False
+        self.__time = self.__now()
+        if self.__scheduler is not None:
+            self.__scheduler.call_at(self.__time + self.__cooldown, self.__reload)
 
     @abstractmethod
     def shoot_weapon(self, player_position):
@@ -140,19 +164,32 @@ class Weapon(ABC):
         """
         pass
 
-    def refresh_weapon(self, screen, bar_x, bar_y, bar_color, empty_bar_color):
+    def refresh_weapon(self):
         """
         Refreshes the weapon, loading the weapon if necessary and updating the weapon shots.
 
-        Parameters:
-        screen (pygame.Surface): The game screen.
-        bar_x (int): X position of the loading bar on the screen.
-        bar_y (int): Y position of the loading bar on the screen.
-        bar_color (tuple): RGB color code of the filled bar.
-        empty_bar_color (tuple): RGB color code of the empty bar.
-
         Returns:
         None
         """
-        self.__load_weapon(screen, bar_x, bar_y, bar_color, empty_bar_color)
+        self.__load_weapon()
         self.__weapon_shots.update()
+
+    def clear_shots(self):
+        """
+        Kills all shots of the weapon, returning pooled shots to their pool.
+
+        Returns:
+        None
+        """
+        for shot in self.__weapon_shots.sprites():
+            shot.kill()
+
+    def release_shots(self):
+        """
+        Kills all shots of the weapon and frees its group in the projectile backend, so the backend can reuse it for
+        a new weapon. Called when the weapon is dropped; it must not fire anymore.
+
+        Returns:
+        None
+        """
+        self.__weapon_shots.release()
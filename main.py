@@ -1,9 +1,116 @@
+import argparse
 import json
-from engine.game import GameManager
+import sys
+
+
+def parse_arguments():
+    """
+    Parses the command line. Without --headless the game opens its window as usual.
+    """
+    parser = argparse.ArgumentParser(description="Space Warriors")
+    parser.add_argument("--headless", action="store_true",
+                        help="fast-forward games without a window, sound or frame cap and report the simulated fps")
+    parser.add_argument("--games", type=int, default=1, help="number of headless games to play")
+    parser.add_argument("--level", type=int, default=0, help="index of the level the headless games are played on")
+    parser.add_argument("--policy", default="sweep", choices=["idle", "sweep"], help="input of the headless games")
+    parser.add_argument("--script", help="file of '<ticks> <ACTION+ACTION>' lines replacing the policy")
+    parser.add_argument("--max-ticks", type=int, help="maximum length of a headless game in ticks")
+    parser.add_argument("--sweep", help="JSON file mapping level fields to the values to try in a balance sweep")
+    parser.add_argument("--workers", type=int, help="number of worker processes of the sweep, all cores by default")
+    parser.add_argument("--seed", type=int, help="seed of the games, making them reproducible")
+    parser.add_argument("--record", help="file the game is recorded to as a replay")
+    parser.add_argument("--replay", help="replay file to simulate again and verify")
+    parser.add_argument("--record-corpus", help="directory the headless games are recorded to as a replay corpus")
+    parser.add_argument("--verify-corpus", help="directory of replays to simulate again and verify on all cores")
+    parser.add_argument("--memory", action="store_true",
+                        help="record the memory at every level start and report what grows without bound on exit")
+    parser.add_argument("--trace", help="file the game is traced to as a Chrome trace, written on F4 and on exit")
+    return parser.parse_args()
+
 
 if __name__ == '__main__':
+    arguments = parse_arguments()
     with open("config.json") as file:
         config = json.load(file)
 
-    game_manager = GameManager(config["width"], config["height"], config["levels"])
-    game_manager.run()
+    if arguments.trace:
+        import atexit
+        from engine.profiling.tracer import tracer
+
+        tracer.enable(arguments.trace)
+        atexit.register(tracer.disable)
+
+    memory_tracker = None
+    if arguments.memory:
+        import atexit
+        from engine.profiling.memory import MemoryTracker, format_memory_report
+
+        memory_tracker = MemoryTracker()
+        atexit.register(lambda: print(format_memory_report(memory_tracker)))
+
+    if arguments.headless or arguments.sweep or arguments.record_corpus:
+        from functools import partial
+        from engine.simulation.policies import POLICIES, ScriptedPolicy, parse_script
+
+        if arguments.script:
+            with open(arguments.script) as file:
+                create_policy = partial(ScriptedPolicy, parse_script(file.read()))
+        else:
+            create_policy = POLICIES[arguments.policy]
+
+    if arguments.replay:
+        from engine.simulation.replay import Replay, format_replay_result, play_replay
+
+        result = play_replay(Replay.load(arguments.replay), config)
+        print(format_replay_result(result))
+        sys.exit(0 if result.matches else 1)
+    elif arguments.verify_corpus:
+        from engine.simulation.corpus import format_corpus_report, format_corpus_result, verify_corpus
+
+        results = []
+        for result in verify_corpus(config, arguments.verify_corpus, arguments.workers):
+            print(format_corpus_result(result), flush=True)
+            results.append(result)
+        print()
+        print(format_corpus_report(results))
+        sys.exit(0 if all(result.result is not None and result.result.matches for result in results) else 1)
+    elif arguments.record_corpus:
+        from engine.simulation.corpus import record_corpus
+
+        paths = record_corpus(config, arguments.record_corpus, arguments.games, arguments.seed, arguments.level,
+                              create_policy, arguments.max_ticks)
+        print(f"Recorded {len(paths)} replays to {arguments.record_corpus}")
+    elif arguments.sweep:
+        from engine.simulation.sweep import format_report, format_result, sweep
+
+        with open(arguments.sweep) as file:
+            grid = json.load(file)
+        results = []
+        for result in sweep(config, grid, arguments.games, arguments.level, create_policy, arguments.max_ticks,
+                            arguments.workers):
+            print(format_result(result), flush=True)
+            results.append(result)
+        print()
+        print(format_report(results, grid))
+    elif arguments.headless and arguments.record:
+        import random
+        from engine.simulation.replay import record_game
+
+        seed = arguments.seed if arguments.seed is not None else random.getrandbits(32)
+        replay = record_game(config, create_policy(), seed, arguments.level, arguments.max_ticks)
+        replay.save(arguments.record)
+        print(f"Recorded {len(replay.actions)} ticks with seed {seed} and score {replay.score} to {arguments.record}")
+    elif arguments.headless:
+        from engine.simulation.headless import format_report, run_headless
+
+        report = run_headless(config, arguments.games, arguments.level, create_policy, arguments.max_ticks,
+                              seed=arguments.seed, memory_tracker=memory_tracker)
+        print(format_report(report))
+    else:
+        from engine.game import GameManager
+
+        game_manager = GameManager(config["width"], config["height"], config["levels"],
+                                   config.get("render_mode", "full"), config.get("projectile_backend", "sprite"),
+                                   config.get("tick_rate", 60), config.get("max_fps", 60), arguments.seed,
+                                   arguments.record, memory_tracker)
+        game_manager.run()